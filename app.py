@@ -1,22 +1,26 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 from datetime import datetime
 import os
 import sys
-import base64
-from io import BytesIO
-from scipy import stats
+import hashlib
+import logging
+import threading
 
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.collect_tweets import get_sample_data, TwitterDataCollector
+from src.collect_tweets import TwitterDataCollector
 from src.calculate_stats import TweetStatisticsCalculator
+from src.profiling import ReportTrace
+from src.ingest import ingest_tweets
+from src.tweet_index import TweetIndex
+from src.collection_jobs import CollectionJobManager
+from src.dataset_store import DatasetHandle, DatasetStore
+from src.export import EXPORT_FORMATS, cached_export, iter_frame_chunks
+from src.warmup import SAMPLE_KEY, ensure_sample
+from src.cadence import WEEKDAYS
 
 st.set_page_config(
     page_title="Tweet Analyzer",
@@ -454,18 +458,167 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-@st.cache_data(ttl=3600)
+@st.cache_resource
+def get_dataset_store():
+    return DatasetStore()
+
+@st.cache_resource(ttl=3600, on_release=DatasetHandle.release)
+def attach_sample_data():
+    """Attach the sample corpus from the shared store, generating it only if no process has yet"""
+    store = get_dataset_store()
+    ensure_sample(store)
+    return store.attach(SAMPLE_KEY)
+
 def load_sample_data():
-    return get_sample_data()
+    return attach_sample_data().frame
 
 @st.cache_data(ttl=3600)
-def load_uploaded_data(uploaded_file):
+def sample_fingerprint():
+    return dataset_fingerprint(load_sample_data())
+
+def dataset_fingerprint(df):
+    """Content hash of a DataFrame, used to key cached analyses"""
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    digest = hashlib.blake2b(row_hashes.tobytes(), digest_size=16)
+    digest.update(",".join(map(str, df.columns)).encode())
+    return digest.hexdigest()
+
+# Datasets at least this large show sampled estimates first and refine to exact values in the background
+PROGRESSIVE_MIN_ROWS = 500_000
+
+@st.cache_resource(max_entries=16, show_spinner="Computing statistics...")
+def get_analysis(fingerprint, username_filter, with_trace, _df, _cube=None, _text=None):
+    """
+    Build the calculator and the report shared by every tab once per dataset
+    fingerprint and username filter; shared across reruns and sessions.
+    Tab-specific parts are added on first use by analysis_part().
+    """
+    trace = ReportTrace() if with_trace else None
+    calculator = TweetStatisticsCalculator(_df, trace=trace, cube=_cube)
+    cube = calculator.stats_cube()
+    progressive = None
+    if len(_df) >= PROGRESSIVE_MIN_ROWS:
+        progressive = calculator.progressive_report()
+        report = progressive.approximate
+    else:
+        report = calculator.generate_report_sections()
+    return {
+        'calculator': calculator,
+        'report': report,
+        'yearly': report['yearly_stats'],
+        'users': report['user_comparison'],
+        'cube': cube,
+        'progressive': progressive,
+        'text': _text,
+        'trace': trace,
+        'lock': threading.Lock()
+    }
+
+def refresh_analysis(analysis):
+    """Swap a progressive analysis over to the exact report once it is ready"""
+    progressive = analysis['progressive']
+    if progressive is None or 'approximate' not in analysis['report'] or not progressive.done():
+        return
+    report = progressive.current()
+    with analysis['lock']:
+        analysis.update(report=report, yearly=report['yearly_stats'], users=report['user_comparison'])
+
+@st.fragment(run_every=1.0)
+def render_refinement_status(analysis):
+    """Note that the statistics are estimates and rerun the page when the exact ones arrive"""
+    if analysis['progressive'].done():
+        # Finished or failed: the full rerun shows the exact report or the error, and stops polling
+        st.rerun()
+    
+    info = analysis['report']['approximate']
+    st.markdown(
+        f'<span class="status-badge status-badge-warning">Estimated from a stratified sample of '
+        f'{info["sample_rows"]:,} of {info["population_rows"]:,} tweets '
+        f'({info["confidence"]:.0%} confidence intervals) · computing exact values…</span>',
+        unsafe_allow_html=True
+    )
+
+ANALYSIS_PARTS = {
+    'distribution': lambda analysis: analysis['calculator'].distribution_summary(),
+    'index': lambda analysis: TweetIndex(analysis['calculator'].df, analysis['text']),
+    'cadence': lambda analysis: analysis['calculator'].posting_cadence()
+}
+
+def analysis_part(analysis, name):
+    """Build a tab-specific part of a cached analysis the first time its tab is opened"""
+    with analysis['lock']:
+        if name not in analysis:
+            analysis[name] = ANALYSIS_PARTS[name](analysis)
+    return analysis[name]
+
+@st.cache_resource(ttl=3600, max_entries=8, show_spinner=False,
+                   on_release=lambda loaded: loaded[0] is not None and loaded[0].release())
+def attach_uploaded_data(fingerprint, _uploaded_file):
+    """
+    Attach an upload from the shared store, streaming it through chunked,
+    typed ingestion only if no session or process has stored it yet.
+    """
+    store = get_dataset_store()
+    if store.contains(fingerprint):
+        return store.attach(fingerprint), None
+    
+    progress = st.progress(0.0, text="Reading upload...")
+    
+    def on_progress(fraction, rows):
+        progress.progress(fraction, text=f"Read {rows:,} rows")
+    
     try:
-        df = pd.read_csv(uploaded_file)
-        return df
+        _uploaded_file.seek(0)
+        df, cube = ingest_tweets(_uploaded_file, _uploaded_file.name, progress=on_progress)
+        if df.attrs.get('missing_dates'):
+            st.warning(f"{df.attrs['missing_dates']:,} rows have a blank or unreadable date; "
+                       "they are left out of yearly and monthly statistics")
+        return store.put_and_attach(fingerprint, df), cube
     except Exception as e:
         st.error(f"Error loading file: {str(e)}")
-        return None
+        return None, None
+    finally:
+        progress.empty()
+
+def load_uploaded_data(fingerprint, uploaded_file):
+    handle, cube = attach_uploaded_data(fingerprint, uploaded_file)
+    return (handle.frame, cube) if handle is not None else (None, None)
+
+@st.cache_resource
+def get_job_manager():
+    """Background collection jobs shared by every session; sessions keep their job id"""
+    return CollectionJobManager()
+
+@st.fragment(run_every=1.0)
+def render_collection_progress(job):
+    """Poll a running collection and show statistics for the tweets collected so far"""
+    if job.done:
+        st.rerun()
+    
+    safe_user = job.username.replace('<', '&lt;').replace('>', '&gt;')
+    st.progress(job.progress, text=f"Collecting tweets from @{safe_user} · {job.rows:,} so far")
+    
+    cube = job.cube()
+    overall = cube.rollup().iloc[0]
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.markdown(render_metric_card("Collected", format_number(overall['tweet_count'])), unsafe_allow_html=True)
+    with col2:
+        st.markdown(render_metric_card("Mean", format_float(overall['mean'], 1), "words"), unsafe_allow_html=True)
+    with col3:
+        st.markdown(render_metric_card("Median", format_float(overall['median'], 1), "words"), unsafe_allow_html=True)
+    with col4:
+        st.markdown(render_metric_card("Std Dev", format_float(overall['std'], 2), ""), unsafe_allow_html=True)
+    
+    yearly = cube.rollup(['year'])
+    if not yearly.empty:
+        display_df = yearly[['year', 'tweet_count', 'mean', 'median', 'std']].round(2)
+        display_df.columns = ['Year', 'Tweets', 'Mean', 'Median', 'Std Dev']
+        st.dataframe(display_df, use_container_width=True, hide_index=True)
+    
+    if st.button("Cancel collection"):
+        job.cancel()
 
 def format_number(num):
     if pd.isna(num) or num is None:
@@ -477,11 +630,81 @@ def format_float(num, decimals=2):
         return "—"
     return f"{num:.{decimals}f}"
 
-def create_download_link(df, filename="tweet_data.csv"):
-    csv = df.to_csv(index=False)
-    b64 = base64.b64encode(csv.encode()).decode()
-    href = f'<a href="data:file/csv;base64,{b64}" download="{filename}" style="text-decoration: none; color: #000000; font-weight: 500;">📥 Download CSV</a>'
-    return href
+def export_filtered(fingerprint, username_filter, filters, fmt, index, ranks):
+    """
+    Write the filtered rows to disk in chunks and return the file's bytes.
+    The export is keyed by dataset and filter state, so repeated downloads
+    of the same view reuse the file.
+    """
+    key = f"{fingerprint}|{username_filter}|{filters}"
+    path = cached_export(
+        key, fmt,
+        lambda: iter_frame_chunks(lambda start, stop: index.rows(ranks[start:stop]), len(ranks))
+    )
+    with open(path, 'rb') as f:
+        return f.read()
+
+@st.cache_resource(show_spinner=False)
+def start_warm_up():
+    """
+    Build the sample analysis and every tab part in a background thread,
+    started by the first page load of each server process, so they are ready
+    before that visitor (or anyone else) opens another tab. The thread has no
+    script run context: it fills the shared caches without drawing into, or
+    depending on, the session that started it. Opt-in via TWEET_ANALYZER_WARMUP=1.
+    """
+    def warm():
+        df = load_sample_data()
+        analysis = get_analysis(f"sample:{sample_fingerprint()}", "", False, df)
+        for name in ANALYSIS_PARTS:
+            analysis_part(analysis, name)
+        analysis['index'].text_index  # Raw Data content search
+        import plotly.express  # noqa: F401  (Compare Users chart)
+
+    # Cached calls log "missing ScriptRunContext" from a context-free thread; that is intended here
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(
+        lambda record: threading.current_thread().name != "warm-up"
+    )
+    thread = threading.Thread(target=warm, name="warm-up", daemon=True)
+    thread.start()
+    return thread
+
+def warm_up_enabled():
+    return os.environ.get("TWEET_ANALYZER_WARMUP", "").lower() in ("1", "true", "yes", "on")
+
+def diagnostics_enabled():
+    """Diagnostics are opt-in via ?diagnostics=1 or TWEET_ANALYZER_DIAGNOSTICS=1"""
+    flag = st.query_params.get("diagnostics") or os.environ.get("TWEET_ANALYZER_DIAGNOSTICS", "")
+    return str(flag).lower() in ("1", "true", "yes", "on")
+
+def render_diagnostics(trace):
+    """Show per-stage timings recorded while building the report"""
+    with st.expander("Diagnostics", expanded=False):
+        st.markdown(f'<span class="status-badge">Total {trace.total_seconds():.3f}s across {len(trace.stages)} stages</span>', 
+                   unsafe_allow_html=True)
+        
+        trace_df = trace.to_frame()
+        trace_df['stage'] = ['\u00a0\u00a0' * depth + name for name, depth in zip(trace_df['stage'], trace_df['depth'])]
+        
+        st.dataframe(
+            trace_df[['stage', 'seconds', 'rows', 'rows_per_second', 'peak_mb']],
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "stage": st.column_config.TextColumn("Stage"),
+                "seconds": st.column_config.NumberColumn("Seconds", format="%.4f"),
+                "rows": st.column_config.NumberColumn("Rows"),
+                "rows_per_second": st.column_config.NumberColumn("Rows/s", format="%.0f"),
+                "peak_mb": st.column_config.NumberColumn("Peak MB", format="%.2f")
+            }
+        )
+        
+        st.download_button(
+            "Download trace JSON",
+            data=trace.to_json(indent=2),
+            file_name="report_trace.json",
+            mime="application/json"
+        )
 
 def render_metric_card(label, value, unit=""):
     """Render a consistent metric card"""
@@ -493,7 +716,561 @@ def render_metric_card(label, value, unit=""):
     """
 
 
+@st.fragment
+def render_distribution_tab(analysis):
+    """Five-number summary, histogram + KDE and Q-Q plot"""
+    report = analysis['report']
+    overall_stats = report.get('overall_stats', {})
+    
+    col1, col2 = st.columns([1, 1])
+    
+    with col1:
+        st.markdown('<div class="subsection-title">Five-Number Summary</div>', unsafe_allow_html=True)
+        
+        summary_data = {
+            'Statistic': ['Minimum', 'Q1 (25%)', 'Median (Q2)', 'Q3 (75%)', 'Maximum'],
+            'Words': [
+                f"{overall_stats.get('min', 0):.0f}",
+                f"{overall_stats.get('q1', 0):.0f}",
+                f"{overall_stats.get('median', 0):.0f}",
+                f"{overall_stats.get('q3', 0):.0f}",
+                f"{overall_stats.get('max', 0):.0f}"
+            ]
+        }
+        
+        summary_df = pd.DataFrame(summary_data)
+        
+        st.markdown('<div class="dataframe-container">', unsafe_allow_html=True)
+        st.dataframe(summary_df, use_container_width=True, hide_index=True, 
+                    column_config={
+                        "Statistic": st.column_config.TextColumn("Statistic"),
+                        "Words": st.column_config.TextColumn("Words")
+                    })
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown('<div class="subsection-title">Distribution Metrics</div>', unsafe_allow_html=True)
+        
+        dist_stats = report.get('distribution', {})
+        percentiles = dist_stats.get('percentiles', {})
+        
+        metrics_data = {
+            'Metric': ['Skewness', 'Kurtosis', 'Range', 'IQR', '95th Percentile'],
+            'Value': [
+                f"{overall_stats.get('skewness', 0):.3f}",
+                f"{overall_stats.get('kurtosis', 0):.3f}",
+                f"{overall_stats.get('range', 0):.0f}",
+                f"{overall_stats.get('iqr', 0):.0f}",
+                f"{percentiles.get('p95', 0):.0f}"
+            ]
+        }
+        
+        metrics_df = pd.DataFrame(metrics_data)
+        
+        st.markdown('<div class="dataframe-container">', unsafe_allow_html=True)
+        st.dataframe(metrics_df, use_container_width=True, hide_index=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    st.markdown('<div class="subsection-title">Word Count Distribution</div>', unsafe_allow_html=True)
+    
+    distribution = analysis_part(analysis, 'distribution')
+    
+    fig = go.Figure(
+        go.Bar(
+            x=distribution.bin_centers,
+            y=distribution.density,
+            marker_color='#222222',
+            name='Density'
+        )
+    )
+    
+    fig.add_trace(
+        go.Scatter(
+            x=distribution.kde_x,
+            y=distribution.kde_y,
+            mode='lines',
+            name='KDE',
+            line=dict(color='#666666', width=2)
+        )
+    )
+    
+    fig.add_vline(x=overall_stats.get('mean', 0), 
+                 line_dash="dash", 
+                 line_color="#666666",
+                 annotation_text="Mean",
+                 annotation_position="top")
+    
+    fig.add_vline(x=overall_stats.get('median', 0), 
+                 line_dash="dot", 
+                 line_color="#000000",
+                 annotation_text="Median",
+                 annotation_position="bottom")
+    
+    fig.update_layout(
+        showlegend=False,
+        height=400,
+        margin=dict(l=40, r=40, t=20, b=40),
+        bargap=0.08,
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font=dict(family='Inter', size=11),
+        xaxis=dict(
+            title="Words per Tweet",
+            gridcolor='#f0f0f0',
+            title_font=dict(size=12),
+            tickfont=dict(size=11)
+        ),
+        yaxis=dict(
+            title="Density",
+            gridcolor='#f0f0f0',
+            title_font=dict(size=12),
+            tickfont=dict(size=11)
+        )
+    )
+    
+    st.plotly_chart(fig, use_container_width=True)
+    
+    with st.expander("Normality Check (Q-Q Plot)", expanded=False):
+        qq = distribution.qq
+        
+        fig_qq = go.Figure()
+        
+        fig_qq.add_trace(go.Scatter(
+            x=qq['theoretical'],
+            y=qq['sample'],
+            mode='markers',
+            name='Sample',
+            marker=dict(size=6, color='#222222')
+        ))
+        
+        line_x = np.array([qq['theoretical'].min(), qq['theoretical'].max()]) if len(qq['theoretical']) else np.zeros(0)
+        fig_qq.add_trace(go.Scatter(
+            x=line_x,
+            y=qq['intercept'] + qq['slope'] * line_x,
+            mode='lines',
+            name='Normal fit',
+            line=dict(color='#d62728', width=2)
+        ))
+        
+        fig_qq.update_layout(
+            title=dict(text="Q-Q Plot", font=dict(size=13)),
+            showlegend=False,
+            height=350,
+            margin=dict(l=40, r=40, t=40, b=40),
+            plot_bgcolor='white',
+            paper_bgcolor='white',
+            font=dict(family='Inter', size=11),
+            xaxis=dict(title="Theoretical Quantiles", gridcolor='#f0f0f0'),
+            yaxis=dict(title="Sample Quantiles", gridcolor='#f0f0f0')
+        )
+        
+        st.plotly_chart(fig_qq, use_container_width=True)
+        
+        st.markdown(f"""
+        <div class="info-message">
+            <strong>Interpretation:</strong> Points deviate from the red line → data is 
+            <strong>{'not ' if abs(dist_stats.get('skewness', 0)) > 0.5 else ''}normally distributed</strong>.
+            Skewness = {overall_stats.get('skewness', 0):.3f}, Kurtosis = {overall_stats.get('kurtosis', 0):.3f}
+        </div>
+        """, unsafe_allow_html=True)
+
+
+def render_change_points(report):
+    """Monthly mean series with its change points, and the largest per-user shifts"""
+    monthly_df = report.get('monthly_stats', pd.DataFrame())
+    points = report.get('change_points', pd.DataFrame())
+    user_points = report.get('user_change_points', pd.DataFrame())
+    if monthly_df.empty:
+        return
+
+    st.markdown('<div class="subsection-title">Change Points</div>', unsafe_allow_html=True)
+    if points.attrs.get('error'):
+        st.caption(points.attrs['error'])
+
+    fig = go.Figure(go.Scatter(
+        x=monthly_df['year_month'],
+        y=monthly_df['mean'],
+        name='Monthly Mean',
+        line=dict(color='#000000', width=2),
+        mode='lines'
+    ))
+    for point in points.itertuples():
+        fig.add_shape(type='line', xref='x', yref='paper', x0=point.year_month, x1=point.year_month,
+                      y0=0, y1=1, line=dict(color='#999999', width=1.5, dash='dot'))
+    if not points.empty:
+        shifted = monthly_df.set_index('year_month')['mean'].reindex(points['year_month'])
+        fig.add_trace(go.Scatter(
+            x=points['year_month'],
+            y=shifted,
+            name='Change Point',
+            mode='markers',
+            marker=dict(size=10, color='#000000', symbol='diamond'),
+            customdata=points[['mean_before', 'mean_after']],
+            hovertemplate='%{x}: %{customdata[0]} → %{customdata[1]} words<extra></extra>'
+        ))
+
+    fig.update_layout(
+        height=320,
+        margin=dict(l=40, r=40, t=20, b=40),
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font=dict(family='Inter', size=11),
+        showlegend=False,
+        xaxis=dict(title="Month", gridcolor='#f0f0f0', type='category'),
+        yaxis=dict(title="Mean Words", gridcolor='#f0f0f0')
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    if points.empty:
+        st.caption("No change in mean tweet length detected on the monthly series")
+
+    if not user_points.empty:
+        with st.expander(f"User Change Points ({user_points['username'].nunique()} users)", expanded=False):
+            display_df = user_points.reindex(user_points['shift'].abs().sort_values(ascending=False).index)
+            display_df = display_df[['username', 'year_month', 'mean_before', 'mean_after', 'shift',
+                                     'tweets_before', 'tweets_after']]
+            display_df.columns = ['Username', 'Month', 'Mean Before', 'Mean After', 'Shift',
+                                  'Tweets Before', 'Tweets After']
+            st.dataframe(display_df, use_container_width=True, hide_index=True)
+
+
+@st.fragment
+def render_yearly_tab(analysis):
+    """Yearly trend line and box plots"""
+    yearly_df = analysis['yearly']
+    
+    if not yearly_df.empty and len(yearly_df) > 1:
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.markdown(render_metric_card("Years", f"{yearly_df['year'].min()}–{yearly_df['year'].max()}"), 
+                       unsafe_allow_html=True)
+        with col2:
+            change = yearly_df['mean'].iloc[-1] - yearly_df['mean'].iloc[0]
+            direction = "↑" if change > 0 else "↓"
+            st.markdown(render_metric_card("Mean Change", f"{direction} {abs(change):.1f}", "words"), 
+                       unsafe_allow_html=True)
+        with col3:
+            pct_change = ((yearly_df['mean'].iloc[-1] - yearly_df['mean'].iloc[0]) / yearly_df['mean'].iloc[0]) * 100
+            st.markdown(render_metric_card("Percent Change", f"{pct_change:+.1f}", "%"), 
+                       unsafe_allow_html=True)
+        with col4:
+            vol_change = yearly_df['std'].iloc[-1] - yearly_df['std'].iloc[0]
+            st.markdown(render_metric_card("Volatility Δ", f"{vol_change:+.1f}", ""), 
+                       unsafe_allow_html=True)
+        
+        st.markdown('<div class="subsection-title">Trend Analysis</div>', unsafe_allow_html=True)
+        
+        fig = go.Figure()
+        
+        fig.add_trace(go.Scatter(
+            x=yearly_df['year'],
+            y=yearly_df['mean'],
+            name='Mean',
+            line=dict(color='#000000', width=2.5),
+            mode='lines+markers',
+            marker=dict(size=8, color='#000000'),
+            # Sampled estimates carry confidence intervals until the exact report arrives
+            error_y=dict(
+                type='data',
+                symmetric=False,
+                array=yearly_df['mean_ci_high'] - yearly_df['mean'],
+                arrayminus=yearly_df['mean'] - yearly_df['mean_ci_low'],
+                color='#999999'
+            ) if 'mean_ci_low' in yearly_df.columns else None
+        ))
+        
+        fig.add_trace(go.Scatter(
+            x=yearly_df['year'],
+            y=yearly_df['median'],
+            name='Median',
+            line=dict(color='#666666', width=2, dash='dash'),
+            mode='lines+markers',
+            marker=dict(size=8, color='#666666')
+        ))
+        
+        fig.add_trace(go.Scatter(
+            x=yearly_df['year'].tolist() + yearly_df['year'].tolist()[::-1],
+            y=(yearly_df['mean'] + yearly_df['std']).tolist() + (yearly_df['mean'] - yearly_df['std']).tolist()[::-1],
+            fill='toself',
+            fillcolor='rgba(0,0,0,0.05)',
+            line=dict(width=0),
+            showlegend=False,
+            name='±1 Std Dev'
+        ))
+        
+        fig.update_layout(
+            height=400,
+            margin=dict(l=40, r=40, t=20, b=40),
+            hovermode='x unified',
+            plot_bgcolor='white',
+            paper_bgcolor='white',
+            font=dict(family='Inter', size=11),
+            legend=dict(
+                orientation="h",
+                yanchor="bottom",
+                y=1.02,
+                xanchor="right",
+                x=1
+            ),
+            xaxis=dict(
+                title="Year",
+                gridcolor='#f0f0f0',
+                tickmode='array',
+                tickvals=yearly_df['year']
+            ),
+            yaxis=dict(
+                title="Word Count",
+                gridcolor='#f0f0f0'
+            )
+        )
+        
+        st.plotly_chart(fig, use_container_width=True)
+
+        render_change_points(analysis['report'])
+
+        st.markdown('<div class="subsection-title">Distribution by Year</div>', unsafe_allow_html=True)
+        
+        box_stats = analysis['cube'].box_summary('year')
+        
+        fig_box = go.Figure(go.Box(
+            x=box_stats['year'],
+            q1=box_stats['q25'],
+            median=box_stats['median'],
+            q3=box_stats['q75'],
+            lowerfence=box_stats['lowerfence'],
+            upperfence=box_stats['upperfence'],
+            boxpoints=False,
+            marker_color='#222222',
+            line_color='#222222',
+            name='Words per Tweet'
+        ))
+        
+        outlier_x = [year for year, values in zip(box_stats['year'], box_stats['outliers']) for _ in values]
+        outlier_y = [value for values in box_stats['outliers'] for value in values]
+        fig_box.add_trace(go.Scatter(
+            x=outlier_x,
+            y=outlier_y,
+            mode='markers',
+            marker=dict(size=5, color='#222222', opacity=0.6),
+            name='Outliers'
+        ))
+        
+        fig_box.update_layout(
+            showlegend=False,
+            height=450,
+            margin=dict(l=40, r=40, t=20, b=40),
+            plot_bgcolor='white',
+            paper_bgcolor='white',
+            font=dict(family='Inter', size=11),
+            xaxis=dict(title="Year", gridcolor='#f0f0f0'),
+            yaxis=dict(title="Words per Tweet", gridcolor='#f0f0f0')
+        )
+        
+        st.plotly_chart(fig_box, use_container_width=True)
+        
+        with st.expander("View Yearly Statistics", expanded=False):
+            display_df = yearly_df[['year', 'tweet_count', 'mean', 'median', 'std', 'min', 'max']].copy()
+            display_df.columns = ['Year', 'Tweets', 'Mean', 'Median', 'Std Dev', 'Min', 'Max']
+            display_df = display_df.round(2)
+            
+            st.dataframe(display_df, use_container_width=True, hide_index=True)
+    else:
+        st.info("Need at least 2 years of data for yearly analysis")
+
+
+@st.fragment
+def render_users_tab(analysis):
+    """Per-user and per-industry comparison"""
+    user_stats = analysis['users']
+    
+    if not user_stats.empty and len(user_stats) > 1:
+        st.markdown('<div class="subsection-title">Average Word Count by User</div>', unsafe_allow_html=True)
+        
+        import plotly.express as px
+        
+        fig_compare = px.bar(
+            user_stats,
+            x='username',
+            y='mean_words',
+            error_y='std_words',
+            labels={'username': 'User', 'mean_words': 'Average Words'},
+            color_discrete_sequence=['#222222']
+        )
+        
+        fig_compare.update_layout(
+            height=400,
+            margin=dict(l=40, r=40, t=20, b=40),
+            showlegend=False,
+            plot_bgcolor='white',
+            paper_bgcolor='white',
+            font=dict(family='Inter', size=11),
+            xaxis=dict(gridcolor='#f0f0f0'),
+            yaxis=dict(gridcolor='#f0f0f0', title="Average Words")
+        )
+        
+        st.plotly_chart(fig_compare, use_container_width=True)
+        
+        st.markdown('<div class="subsection-title">User Statistics</div>', unsafe_allow_html=True)
+        
+        display_users = user_stats[['username', 'displayname', 'tweet_count', 'mean_words', 'median_words', 'std_words']].copy()
+        display_users.columns = ['Username', 'Name', 'Tweets', 'Mean', 'Median', 'Std Dev']
+        display_users = display_users.round(2)
+        
+        st.dataframe(display_users, use_container_width=True, hide_index=True)
+        
+        if 'industry' in user_stats.columns:
+            st.markdown('<div class="subsection-title">Industry Comparison</div>', unsafe_allow_html=True)
+            
+            cube = analysis['cube']
+            industry_stats = cube.rollup(['industry'])[['industry', 'mean', 'median', 'tweet_count', 'std']]
+            
+            industry_stats.columns = ['Industry', 'Mean Words', 'Median Words', 'Total Tweets', 'Std Dev']
+            industry_stats = industry_stats.round(2)
+            
+            st.dataframe(industry_stats, use_container_width=True, hide_index=True)
+    else:
+        if len(user_stats) == 1:
+            st.info("Only one user in dataset. Add more users for comparison.")
+        else:
+            st.info("No user comparison data available.")
+    
+    cadence = analysis_part(analysis, 'cadence')
+    if len(cadence.per_user):
+        st.markdown('<div class="subsection-title">Posting Cadence</div>', unsafe_allow_html=True)
+        
+        overall = cadence.overall()
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.markdown(render_metric_card("Median Gap", format_float(overall.get('median_gap_hours'), 1), "hours"),
+                       unsafe_allow_html=True)
+        with col2:
+            st.markdown(render_metric_card("Mean Gap", format_float(overall.get('mean_gap_hours'), 1), "hours"),
+                       unsafe_allow_html=True)
+        with col3:
+            st.markdown(render_metric_card("Burstiness", format_float(overall.get('burstiness'), 2), ""),
+                       unsafe_allow_html=True)
+        
+        fig_heat = go.Figure(go.Heatmap(
+            z=cadence.heatmap(),
+            x=[f"{hour:02d}" for hour in range(24)],
+            y=WEEKDAYS,
+            colorscale='Greys',
+            hovertemplate='%{y} %{x}:00 · %{z} tweets<extra></extra>'
+        ))
+        fig_heat.update_layout(
+            height=300,
+            margin=dict(l=40, r=40, t=20, b=40),
+            plot_bgcolor='white',
+            paper_bgcolor='white',
+            font=dict(family='Inter', size=11),
+            xaxis=dict(title="Hour of day"),
+            yaxis=dict(autorange='reversed')
+        )
+        st.plotly_chart(fig_heat, use_container_width=True)
+        
+        display_cadence = cadence.per_user.sort_values('tweets', ascending=False).head(1000)
+        display_cadence.columns = ['Username', 'Tweets', 'Mean Gap (h)', 'Median Gap (h)', 'P90 Gap (h)',
+                                   'Burstiness', 'Peak Hour', 'Active Hours']
+        st.dataframe(display_cadence, use_container_width=True, hide_index=True)
+
+
+@st.fragment
+def render_raw_data_tab(analysis, fingerprint, username_filter):
+    """Filterable, paged tweet table; filter changes rerun only this fragment"""
+    st.markdown('<div class="subsection-title">Tweet Data</div>', unsafe_allow_html=True)
+    
+    index = analysis_part(analysis, 'index')
+    tweets = index.df
+    
+    search = ""
+    if 'content' in tweets.columns:
+        search = st.text_input("Search content", placeholder='Words or "exact phrase"')
+    
+    col1, col2, col3 = st.columns(3)
+    
+    selected_year = 'All'
+    selected_user = 'All'
+    
+    with col1:
+        if index.year_ranks:
+            years = ['All'] + sorted(index.year_ranks)
+            selected_year = st.selectbox("Year", years, index=0)
+    
+    with col2:
+        if index.user_ranks:
+            users = ['All'] + sorted(index.user_ranks)
+            selected_user = st.selectbox("User", users, index=0)
+    
+    with col3:
+        word_count_slider = st.slider(
+            "Word count",
+            min_value=int(tweets['word_count'].min()),
+            max_value=int(tweets['word_count'].max()),
+            value=(int(tweets['word_count'].min()), int(tweets['word_count'].max()))
+        )
+    
+    ranks = index.query(
+        year=None if selected_year == 'All' else selected_year,
+        username=None if selected_user == 'All' else selected_user,
+        word_range=word_count_slider,
+        text=search
+    )
+    
+    page_size = 100
+    n_pages = max((len(ranks) + page_size - 1) // page_size, 1)
+    
+    col1, col2 = st.columns([3, 1])
+    with col2:
+        page = st.number_input("Page", min_value=1, max_value=n_pages, value=1, step=1)
+    with col1:
+        st.markdown(f'<span class="status-badge">Showing {len(ranks):,} of {len(tweets):,} tweets · page {page} of {n_pages}</span>', 
+                   unsafe_allow_html=True)
+    
+    display_cols = ['date', 'username', 'content', 'word_count', 'like_count', 'retweet_count']
+    display_cols = [col for col in display_cols if col in tweets.columns]
+    
+    page_df = index.page(ranks, page, page_size)[display_cols]
+    
+    if 'content' in page_df.columns:
+        page_df = page_df.assign(content=page_df['content'].str[:50] + '...')
+        page_df = page_df.rename(columns={'content': 'content_short'})
+    
+    st.dataframe(
+        page_df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "date": st.column_config.DatetimeColumn("Date"),
+            "username": st.column_config.TextColumn("User"),
+            "content_short": st.column_config.TextColumn("Content"),
+            "word_count": st.column_config.NumberColumn("Words"),
+            "like_count": st.column_config.NumberColumn("Likes"),
+            "retweet_count": st.column_config.NumberColumn("Retweets")
+        }
+    )
+    
+    col1, col2, col3 = st.columns([1, 1, 1])
+    export_labels = {'csv': "CSV", 'csv.gz': "CSV (gzip)", 'parquet': "Parquet"}
+    with col1:
+        export_fmt = st.selectbox("Export format", list(export_labels), format_func=export_labels.get,
+                                  label_visibility="collapsed")
+    with col2:
+        filters = (selected_year, selected_user, tuple(word_count_slider), search)
+        st.download_button(
+            f"Download {export_labels[export_fmt]}",
+            data=lambda: export_filtered(fingerprint, username_filter, filters, export_fmt, index, ranks),
+            file_name=f"tweets_{datetime.now().strftime('%Y%m%d')}.{EXPORT_FORMATS[export_fmt]['extension']}",
+            mime=EXPORT_FORMATS[export_fmt]['mime'],
+            use_container_width=True,
+            type="secondary"
+        )
+
+
 def main():
+    if warm_up_enabled():
+        start_warm_up()
+
     st.markdown('<div class="main-container">', unsafe_allow_html=True)
     
     st.markdown('<h1 class="main-header">Tweet Analyzer</h1>', unsafe_allow_html=True)
@@ -521,10 +1298,14 @@ def main():
     
     df = None
     username_filter = ""
+    fingerprint = None
+    cube = None
+    text_index = None
     
     if data_source == "Sample Data":
         with st.spinner("Loading sample data..."):
             df = load_sample_data()
+            fingerprint = f"sample:{sample_fingerprint()}"
             st.markdown(f'<span class="status-badge status-badge-success">Loaded {len(df):,} tweets from 4 celebrities (2018-2024)</span>', 
                        unsafe_allow_html=True)
         
@@ -537,15 +1318,20 @@ def main():
                            unsafe_allow_html=True)
     
     elif data_source == "Upload CSV":
-        uploaded_file = st.file_uploader("Upload CSV", type=['csv'], label_visibility="collapsed")
+        uploaded_file = st.file_uploader(
+            "Upload CSV",
+            type=['csv', 'gz', 'zst', 'parquet'],
+            label_visibility="collapsed"
+        )
         
         if uploaded_file is not None:
-            df = load_uploaded_data(uploaded_file)
+            fingerprint = f"upload:{hashlib.blake2b(uploaded_file.getvalue(), digest_size=16).hexdigest()}"
+            df, cube = load_uploaded_data(fingerprint, uploaded_file)
             if df is not None:
                 st.markdown(f'<span class="status-badge status-badge-success">Loaded {len(df):,} tweets</span>', 
                            unsafe_allow_html=True)
         else:
-            st.info("Upload a CSV file with tweet data")
+            st.info("Upload a CSV (optionally .gz / .zst compressed) or Parquet file with tweet data")
             st.stop()
         st.markdown('</div>', unsafe_allow_html=True)
     
@@ -586,35 +1372,64 @@ def main():
         with col2:
             collect_button = st.button("Collect Tweets", use_container_width=True)
         
+        manager = get_job_manager()
         if collect_button:
-            with st.spinner(f"Collecting tweets from @{username}..."):
-                collector = TwitterDataCollector()
-                years = list(range(start_year, end_year + 1))
-                df = collector.collect_celebrity_tweets(username, years)
-                
-                if not df.empty:
-                    safe_user = username.replace('<', '&lt;').replace('>', '&gt;')
-                    st.markdown(
-                        f'<span class="status-badge status-badge-success">✓ Collected {len(df):,} tweets from @{safe_user}</span>',
-                        unsafe_allow_html=True
-                    )
-                else:
-                    st.error("No tweets collected. Using sample data instead.")
-                    df = load_sample_data()
-        else:
+            previous = manager.get(st.session_state.get('collection_job'))
+            if previous is not None and not previous.done:
+                previous.cancel()
+            st.session_state['collection_job'] = manager.submit(username, list(range(start_year, end_year + 1)))
+        
+        job = manager.get(st.session_state.get('collection_job'))
+        if job is None:
             st.info("Enter a username and click 'Collect Tweets'")
             st.stop()
         
+        if not job.done:
+            render_collection_progress(job)
+            st.stop()
+        
+        safe_user = job.username.replace('<', '&lt;').replace('>', '&gt;')
+        if job.status == 'failed':
+            st.error(f"Collection failed: {job.error}")
+            st.stop()
+        
+        df = job.frame()
+        if not df.empty:
+            fingerprint = f"live:{job.job_id}"
+            cube = job.cube()
+            text_index = job.text_index()
+            st.markdown(
+                f'<span class="status-badge status-badge-success">✓ Collected {len(df):,} tweets from @{safe_user}</span>',
+                unsafe_allow_html=True
+            )
+        else:
+            st.error("No tweets collected. Using sample data instead.")
+            df = load_sample_data()
+            fingerprint = f"sample:{sample_fingerprint()}"
+        
         st.markdown('</div>', unsafe_allow_html=True)
     
     if df is None or df.empty:
         st.error("No data available")
         st.stop()
     
-    calculator = TweetStatisticsCalculator(df)
-    report = calculator.generate_full_report()
+    if fingerprint is None:
+        fingerprint = f"data:{dataset_fingerprint(df)}"
+    
+    analysis = get_analysis(fingerprint, username_filter, diagnostics_enabled(), df, cube, text_index)
+    refresh_analysis(analysis)
+    report = analysis['report']
+    trace = analysis['trace']
     overall_stats = report.get('overall_stats', {})
     
+    if 'approximate' in report:
+        failure = analysis['progressive'].error()
+        if failure is not None:
+            st.warning(f"Exact statistics failed ({failure!r}); showing estimates.")
+        else:
+            render_refinement_status(analysis)
+    mean_ci = overall_stats.get('mean_ci')
+    
     st.markdown('<div class="metrics-row">', unsafe_allow_html=True)
     
     col1, col2, col3, col4 = st.columns(4)
@@ -623,7 +1438,8 @@ def main():
         st.markdown(render_metric_card("Total Tweets", format_number(report['dataset_info']['total_tweets'])), 
                    unsafe_allow_html=True)
     with col2:
-        st.markdown(render_metric_card("Mean", format_float(overall_stats.get('mean', 0), 1), "words"), 
+        st.markdown(render_metric_card("Mean", format_float(overall_stats.get('mean', 0), 1),
+                                       f"words ±{(mean_ci[1] - mean_ci[0]) / 2:.2f}" if mean_ci else "words"), 
                    unsafe_allow_html=True)
     with col3:
         st.markdown(render_metric_card("Median", format_float(overall_stats.get('median', 0), 1), "words"), 
@@ -663,373 +1479,25 @@ def main():
     """
     st.markdown(insight_html, unsafe_allow_html=True)
     
-    tab1, tab2, tab3, tab4 = st.tabs(
-        ["Distribution", "Year-over-Year", "Compare Users", "Raw Data"]
-    )
-    
-    with tab1:
-        col1, col2 = st.columns([1, 1])
-        
-        with col1:
-            st.markdown('<div class="subsection-title">Five-Number Summary</div>', unsafe_allow_html=True)
-            
-            summary_data = {
-                'Statistic': ['Minimum', 'Q1 (25%)', 'Median (Q2)', 'Q3 (75%)', 'Maximum'],
-                'Words': [
-                    f"{overall_stats.get('min', 0):.0f}",
-                    f"{overall_stats.get('q1', 0):.0f}",
-                    f"{overall_stats.get('median', 0):.0f}",
-                    f"{overall_stats.get('q3', 0):.0f}",
-                    f"{overall_stats.get('max', 0):.0f}"
-                ]
-            }
-            
-            summary_df = pd.DataFrame(summary_data)
-            
-            st.markdown('<div class="dataframe-container">', unsafe_allow_html=True)
-            st.dataframe(summary_df, use_container_width=True, hide_index=True, 
-                        column_config={
-                            "Statistic": st.column_config.TextColumn("Statistic"),
-                            "Words": st.column_config.TextColumn("Words")
-                        })
-            st.markdown('</div>', unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown('<div class="subsection-title">Distribution Metrics</div>', unsafe_allow_html=True)
-            
-            dist_stats = report.get('distribution', {})
-            percentiles = dist_stats.get('percentiles', {})
-            
-            metrics_data = {
-                'Metric': ['Skewness', 'Kurtosis', 'Range', 'IQR', '95th Percentile'],
-                'Value': [
-                    f"{overall_stats.get('skewness', 0):.3f}",
-                    f"{overall_stats.get('kurtosis', 0):.3f}",
-                    f"{overall_stats.get('range', 0):.0f}",
-                    f"{overall_stats.get('iqr', 0):.0f}",
-                    f"{percentiles.get('p95', 0):.0f}"
-                ]
-            }
-            
-            metrics_df = pd.DataFrame(metrics_data)
-            
-            st.markdown('<div class="dataframe-container">', unsafe_allow_html=True)
-            st.dataframe(metrics_df, use_container_width=True, hide_index=True)
-            st.markdown('</div>', unsafe_allow_html=True)
-        
-        st.markdown('<div class="subsection-title">Word Count Distribution</div>', unsafe_allow_html=True)
-        
-        fig = px.histogram(
-            df,
-            x='word_count',
-            nbins=30,
-            histnorm='probability density',
-            labels={'word_count': 'Words per Tweet', 'density': 'Density'},
-            color_discrete_sequence=['#222222']
-        )
-        
-        kde_x = np.linspace(df['word_count'].min(), df['word_count'].max(), 200)
-        kde_y = stats.gaussian_kde(df['word_count'])(kde_x)
-        
-        fig.add_trace(
-            go.Scatter(
-                x=kde_x,
-                y=kde_y,
-                mode='lines',
-                name='KDE',
-                line=dict(color='#666666', width=2)
-            )
-        )
-        
-        fig.add_vline(x=overall_stats.get('mean', 0), 
-                     line_dash="dash", 
-                     line_color="#666666",
-                     annotation_text="Mean",
-                     annotation_position="top")
-        
-        fig.add_vline(x=overall_stats.get('median', 0), 
-                     line_dash="dot", 
-                     line_color="#000000",
-                     annotation_text="Median",
-                     annotation_position="bottom")
-        
-        fig.update_layout(
-            showlegend=False,
-            height=400,
-            margin=dict(l=40, r=40, t=20, b=40),
-            bargap=0.08,
-            plot_bgcolor='white',
-            paper_bgcolor='white',
-            font=dict(family='Inter', size=11),
-            xaxis=dict(
-                gridcolor='#f0f0f0',
-                title_font=dict(size=12),
-                tickfont=dict(size=11)
-            ),
-            yaxis=dict(
-                gridcolor='#f0f0f0',
-                title_font=dict(size=12),
-                tickfont=dict(size=11)
-            )
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
-        
-        with st.expander("Normality Check (Q-Q Plot)", expanded=False):
-            fig_qq = plt.figure(figsize=(10, 4))
-            ax = fig_qq.add_subplot(111)
-            
-            stats.probplot(df['word_count'], dist="norm", plot=ax)
-            ax.set_title("Q-Q Plot", fontsize=13, fontweight='bold')
-            ax.set_xlabel("Theoretical Quantiles", fontsize=11)
-            ax.set_ylabel("Sample Quantiles", fontsize=11)
-            ax.grid(True, alpha=0.3)
-            
-            st.pyplot(fig_qq)
-            
-            st.markdown(f"""
-            <div class="info-message">
-                <strong>Interpretation:</strong> Points deviate from the red line → data is 
-                <strong>{'not ' if abs(dist_stats.get('skewness', 0)) > 0.5 else ''}normally distributed</strong>.
-                Skewness = {overall_stats.get('skewness', 0):.3f}, Kurtosis = {overall_stats.get('kurtosis', 0):.3f}
-            </div>
-            """, unsafe_allow_html=True)
-    
-    with tab2:
-        yearly_df = calculator.yearly_summary_stats()
-        
-        if not yearly_df.empty and len(yearly_df) > 1:
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.markdown(render_metric_card("Years", f"{yearly_df['year'].min()}–{yearly_df['year'].max()}"), 
-                           unsafe_allow_html=True)
-            with col2:
-                change = yearly_df['mean'].iloc[-1] - yearly_df['mean'].iloc[0]
-                direction = "↑" if change > 0 else "↓"
-                st.markdown(render_metric_card("Mean Change", f"{direction} {abs(change):.1f}", "words"), 
-                           unsafe_allow_html=True)
-            with col3:
-                pct_change = ((yearly_df['mean'].iloc[-1] - yearly_df['mean'].iloc[0]) / yearly_df['mean'].iloc[0]) * 100
-                st.markdown(render_metric_card("Percent Change", f"{pct_change:+.1f}", "%"), 
-                           unsafe_allow_html=True)
-            with col4:
-                vol_change = yearly_df['std'].iloc[-1] - yearly_df['std'].iloc[0]
-                st.markdown(render_metric_card("Volatility Δ", f"{vol_change:+.1f}", ""), 
-                           unsafe_allow_html=True)
-            
-            st.markdown('<div class="subsection-title">Trend Analysis</div>', unsafe_allow_html=True)
-            
-            fig = go.Figure()
-            
-            fig.add_trace(go.Scatter(
-                x=yearly_df['year'],
-                y=yearly_df['mean'],
-                name='Mean',
-                line=dict(color='#000000', width=2.5),
-                mode='lines+markers',
-                marker=dict(size=8, color='#000000')
-            ))
-            
-            fig.add_trace(go.Scatter(
-                x=yearly_df['year'],
-                y=yearly_df['median'],
-                name='Median',
-                line=dict(color='#666666', width=2, dash='dash'),
-                mode='lines+markers',
-                marker=dict(size=8, color='#666666')
-            ))
-            
-            fig.add_trace(go.Scatter(
-                x=yearly_df['year'].tolist() + yearly_df['year'].tolist()[::-1],
-                y=(yearly_df['mean'] + yearly_df['std']).tolist() + (yearly_df['mean'] - yearly_df['std']).tolist()[::-1],
-                fill='toself',
-                fillcolor='rgba(0,0,0,0.05)',
-                line=dict(width=0),
-                showlegend=False,
-                name='±1 Std Dev'
-            ))
-            
-            fig.update_layout(
-                height=400,
-                margin=dict(l=40, r=40, t=20, b=40),
-                hovermode='x unified',
-                plot_bgcolor='white',
-                paper_bgcolor='white',
-                font=dict(family='Inter', size=11),
-                legend=dict(
-                    orientation="h",
-                    yanchor="bottom",
-                    y=1.02,
-                    xanchor="right",
-                    x=1
-                ),
-                xaxis=dict(
-                    title="Year",
-                    gridcolor='#f0f0f0',
-                    tickmode='array',
-                    tickvals=yearly_df['year']
-                ),
-                yaxis=dict(
-                    title="Word Count",
-                    gridcolor='#f0f0f0'
-                )
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
-            
-            st.markdown('<div class="subsection-title">Distribution by Year</div>', unsafe_allow_html=True)
-            
-            fig_box = px.box(
-                df,
-                x='year',
-                y='word_count',
-                labels={'year': 'Year', 'word_count': 'Words per Tweet'},
-                color_discrete_sequence=['#222222']
-            )
-            
-            fig_box.update_layout(
-                showlegend=False,
-                height=450,
-                margin=dict(l=40, r=40, t=20, b=40),
-                plot_bgcolor='white',
-                paper_bgcolor='white',
-                font=dict(family='Inter', size=11),
-                xaxis=dict(gridcolor='#f0f0f0'),
-                yaxis=dict(gridcolor='#f0f0f0')
-            )
-            
-            st.plotly_chart(fig_box, use_container_width=True)
-            
-            with st.expander("View Yearly Statistics", expanded=False):
-                display_df = yearly_df[['year', 'tweet_count', 'mean', 'median', 'std', 'min', 'max']].copy()
-                display_df.columns = ['Year', 'Tweets', 'Mean', 'Median', 'Std Dev', 'Min', 'Max']
-                display_df = display_df.round(2)
-                
-                st.dataframe(display_df, use_container_width=True, hide_index=True)
-        else:
-            st.info("Need at least 2 years of data for yearly analysis")
-    
-    with tab3:
-        user_stats = calculator.user_comparison_stats()
-        
-        if not user_stats.empty and len(user_stats) > 1:
-            st.markdown('<div class="subsection-title">Average Word Count by User</div>', unsafe_allow_html=True)
-            
-            fig_compare = px.bar(
-                user_stats,
-                x='username',
-                y='mean_words',
-                error_y='std_words',
-                labels={'username': 'User', 'mean_words': 'Average Words'},
-                color_discrete_sequence=['#222222']
-            )
-            
-            fig_compare.update_layout(
-                height=400,
-                margin=dict(l=40, r=40, t=20, b=40),
-                showlegend=False,
-                plot_bgcolor='white',
-                paper_bgcolor='white',
-                font=dict(family='Inter', size=11),
-                xaxis=dict(gridcolor='#f0f0f0'),
-                yaxis=dict(gridcolor='#f0f0f0', title="Average Words")
-            )
-            
-            st.plotly_chart(fig_compare, use_container_width=True)
-            
-            st.markdown('<div class="subsection-title">User Statistics</div>', unsafe_allow_html=True)
-            
-            display_users = user_stats[['username', 'displayname', 'tweet_count', 'mean_words', 'median_words', 'std_words']].copy()
-            display_users.columns = ['Username', 'Name', 'Tweets', 'Mean', 'Median', 'Std Dev']
-            display_users = display_users.round(2)
-            
-            st.dataframe(display_users, use_container_width=True, hide_index=True)
-            
-            if 'industry' in user_stats.columns:
-                st.markdown('<div class="subsection-title">Industry Comparison</div>', unsafe_allow_html=True)
-                
-                industry_stats = user_stats.groupby('industry').agg({
-                    'mean_words': 'mean',
-                    'tweet_count': 'sum',
-                    'std_words': 'mean'
-                }).reset_index()
-                
-                industry_stats.columns = ['Industry', 'Avg Words', 'Total Tweets', 'Avg Variability']
-                industry_stats = industry_stats.round(2)
-                
-                st.dataframe(industry_stats, use_container_width=True, hide_index=True)
-        else:
-            if len(user_stats) == 1:
-                st.info("Only one user in dataset. Add more users for comparison.")
-            else:
-                st.info("No user comparison data available.")
-    
-    with tab4:
-        st.markdown('<div class="subsection-title">Tweet Data</div>', unsafe_allow_html=True)
-        
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            if 'year' in df.columns:
-                years = ['All'] + sorted(df['year'].unique().tolist())
-                selected_year = st.selectbox("Year", years, index=0)
-        
-        with col2:
-            if 'username' in df.columns:
-                users = ['All'] + sorted(df['username'].unique().tolist())
-                selected_user = st.selectbox("User", users, index=0)
-        
-        with col3:
-            word_count_slider = st.slider(
-                "Word count",
-                min_value=int(df['word_count'].min()),
-                max_value=int(df['word_count'].max()),
-                value=(int(df['word_count'].min()), int(df['word_count'].max()))
-            )
-        
-        filtered_df = df.copy()
-        
-        if selected_year != 'All':
-            filtered_df = filtered_df[filtered_df['year'] == selected_year]
-        
-        if selected_user != 'All':
-            filtered_df = filtered_df[filtered_df['username'] == selected_user]
-        
-        filtered_df = filtered_df[
-            (filtered_df['word_count'] >= word_count_slider[0]) & 
-            (filtered_df['word_count'] <= word_count_slider[1])
-        ]
-        
-        st.markdown(f'<span class="status-badge">Showing {len(filtered_df):,} of {len(df):,} tweets</span>', 
-                   unsafe_allow_html=True)
-        
-        display_cols = ['date', 'username', 'content', 'word_count', 'like_count', 'retweet_count']
-        display_cols = [col for col in display_cols if col in filtered_df.columns]
-        
-        if 'content' in filtered_df.columns:
-            filtered_df['content_short'] = filtered_df['content'].str[:50] + '...'
-            display_cols = ['date', 'username', 'content_short', 'word_count', 'like_count', 'retweet_count']
-        
-        st.dataframe(
-            filtered_df[display_cols].sort_values('date', ascending=False).head(100),
-            use_container_width=True,
-            hide_index=True,
-            column_config={
-                "date": st.column_config.DatetimeColumn("Date"),
-                "username": st.column_config.TextColumn("User"),
-                "content_short": st.column_config.TextColumn("Content"),
-                "word_count": st.column_config.NumberColumn("Words"),
-                "like_count": st.column_config.NumberColumn("Likes"),
-                "retweet_count": st.column_config.NumberColumn("Retweets")
-            }
-        )
-        
-        col1, col2, col3 = st.columns([1, 1, 1])
-        with col2:
-            if st.button("Download CSV", use_container_width=True, type="secondary"):
-                csv_link = create_download_link(filtered_df, f"tweets_{datetime.now().strftime('%Y%m%d')}.csv")
-                st.markdown(csv_link, unsafe_allow_html=True)
+    tab_labels = ["Distribution", "Year-over-Year", "Compare Users", "Raw Data"]
+    tabs = st.tabs(tab_labels, key="active_tab", on_change="rerun")
+    
+    # Only the selected tab is computed and rendered
+    if tabs[0].open:
+        with tabs[0]:
+            render_distribution_tab(analysis)
+    if tabs[1].open:
+        with tabs[1]:
+            render_yearly_tab(analysis)
+    if tabs[2].open:
+        with tabs[2]:
+            render_users_tab(analysis)
+    if tabs[3].open:
+        with tabs[3]:
+            render_raw_data_tab(analysis, fingerprint, username_filter)
+    
+    if trace is not None:
+        render_diagnostics(trace)
     
     st.markdown("""
     <div class="footer">
@@ -0,0 +1,283 @@
+"""
+Rerun-latency harness for the Streamlit dashboard.
+
+Drives app.py headlessly with streamlit.testing's AppTest against synthetic
+datasets, replays a script of common interactions (open each tab, filter by
+user, change the Raw Data filters and page, switch data source) and reports
+p50/p95 rerun latency and peak traced memory per interaction. The synthetic
+corpus is served to the app as its sample data through a private dataset store.
+
+    python benchmarks/bench_app.py --scales 10k 1m
+    python benchmarks/bench_app.py --scales 10k --sessions 4 --repeat 5
+    python benchmarks/bench_app.py --scales 10k --baseline benchmarks/app_baseline.json
+"""
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.bench_stats import SCALES, compare_to_baseline, synthesize_tweets
+from src.dataset_store import STORE_DIR_ENV, DatasetStore
+from src.warmup import SAMPLE_KEY
+
+APP_PATH = os.path.join(os.path.dirname(__file__), '..', 'app.py')
+
+
+def _widget(elements, label: str):
+    for element in elements:
+        if element.label == label:
+            return element
+    raise LookupError(f"No widget labelled {label!r} on the page")
+
+
+def _open_tab(label: str) -> Callable:
+    def step(at):
+        at.session_state['active_tab'] = label
+    return step
+
+
+def _select_user(at):
+    # Options are displayed as "@username"; set_value takes the raw option
+    box = _widget(at.selectbox, "Select user")
+    box.set_value(box.options[1].lstrip('@'))
+
+
+def _clear_user(at):
+    _widget(at.selectbox, "Select user").set_value("")
+
+
+def _raw_year(at):
+    box = _widget(at.selectbox, "Year")
+    box.select_index(len(box.options) - 1)
+
+
+def _raw_slider(at):
+    slider = _widget(at.slider, "Word count")
+    low, high = slider.min, slider.max
+    slider.set_range(low + 2, max(low + 3, high - 5))
+
+
+def _raw_page(at):
+    page = _widget(at.number_input, "Page")
+    page.set_value(min(2, int(page.proto.max)) if page.proto.has_max else 2)
+
+
+def _source(label: str) -> Callable:
+    def step(at):
+        _widget(at.radio, "Data Source").set_value(label)
+    return step
+
+
+INTERACTIONS: List[Tuple[str, Callable]] = [
+    ('tab_year_over_year', _open_tab("Year-over-Year")),
+    ('tab_compare_users', _open_tab("Compare Users")),
+    ('tab_raw_data', _open_tab("Raw Data")),
+    ('raw_filter_year', _raw_year),
+    ('raw_word_slider', _raw_slider),
+    ('raw_next_page', _raw_page),
+    ('tab_distribution', _open_tab("Distribution")),
+    ('filter_user', _select_user),
+    ('clear_user_filter', _clear_user),
+    ('source_live_collection', _source("Live Collection")),
+    ('source_sample_data', _source("Sample Data")),
+]
+
+
+def _clear_app_caches() -> None:
+    import streamlit as st
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+
+def _timed_run(at, timeout: float, track_memory: bool) -> Dict:
+    if track_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    at.run(timeout=timeout)
+    seconds = time.perf_counter() - start
+    peak = None
+    if track_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    if at.exception:
+        raise RuntimeError(f"App raised: {at.exception[0].value}")
+    return {'seconds': seconds, 'peak_mb': peak / 1024 ** 2 if peak is not None else None}
+
+
+def cold_start(timeout: float, track_memory: bool = False) -> Dict:
+    """First page load with empty caches, so every shared artifact is built"""
+    from streamlit.testing.v1 import AppTest
+
+    _clear_app_caches()
+    gc.collect()
+    return _timed_run(AppTest.from_file(APP_PATH, default_timeout=timeout), timeout, track_memory)
+
+
+def run_session(timeout: float, track_memory: bool = False) -> Dict[str, Dict]:
+    """One browser session: load the page, then replay every interaction once"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    samples = {'session_start': _timed_run(at, timeout, track_memory)}
+    for name, step in INTERACTIONS:
+        step(at)
+        samples[name] = _timed_run(at, timeout, track_memory)
+    return samples
+
+
+def _session_worker(store_dir: str, repeat: int, timeout: float) -> List[Dict[str, Dict]]:
+    """Replay the interaction script `repeat` times in a fresh process after one warm-up session"""
+    os.environ[STORE_DIR_ENV] = store_dir
+    run_session(timeout)
+    return [run_session(timeout) for _ in range(repeat)]
+
+
+def _summarize(name: str, samples: List[Dict], peaks: List[float]) -> Dict:
+    seconds = np.array([s['seconds'] for s in samples])
+    return {
+        'interaction': name,
+        'runs': len(seconds),
+        'p50_seconds': round(float(np.percentile(seconds, 50)), 6),
+        'p95_seconds': round(float(np.percentile(seconds, 95)), 6),
+        'max_seconds': round(float(seconds.max()), 6),
+        'peak_mb': round(max(peaks), 3) if peaks else None
+    }
+
+
+def bench_scale(label: str, df: pd.DataFrame, repeat: int, sessions: int,
+                track_memory: bool, timeout: float) -> Dict[str, Dict]:
+    """Serve `df` as the app's sample data and time cold start plus every interaction"""
+    results: Dict[str, Dict] = {}
+    with tempfile.TemporaryDirectory() as store_dir:
+        os.environ[STORE_DIR_ENV] = store_dir
+        DatasetStore(store_dir).put(SAMPLE_KEY, df)
+
+        cold = cold_start(timeout)
+        cold_peak = [cold_start(timeout, track_memory=True)['peak_mb']] if track_memory else []
+        results[f"{label}/cold_start"] = _summarize('cold_start', [cold], cold_peak)
+
+        samples: Dict[str, List[Dict]] = {}
+        if sessions > 1:
+            # AppTest is not thread-safe, so concurrent sessions run as separate
+            # processes (one warm replica each) contending for the same machine
+            from benchmarks.bench_app import _session_worker as worker  # picklable when run as a script
+
+            with ProcessPoolExecutor(max_workers=sessions, mp_context=multiprocessing.get_context('spawn')) as pool:
+                futures = [pool.submit(worker, store_dir, repeat, timeout) for _ in range(sessions)]
+                runs = [sample for future in futures for sample in future.result()]
+        else:
+            runs = [run_session(timeout) for _ in range(repeat)]
+        for session in runs:
+            for name, sample in session.items():
+                samples.setdefault(name, []).append(sample)
+
+        peaks: Dict[str, List[float]] = {}
+        if track_memory:
+            for name, sample in run_session(timeout, track_memory=True).items():
+                peaks[name] = [sample['peak_mb']]
+
+        for name, runs in samples.items():
+            results[f"{label}/{name}"] = _summarize(name, runs, peaks.get(name, []))
+
+        _clear_app_caches()
+        os.environ.pop(STORE_DIR_ENV, None)
+    return results
+
+
+def run_app_benchmarks(scales: List[str], repeat: int = 3, sessions: int = 1,
+                       track_memory: bool = True, seed: int = 42, timeout: float = 600) -> Dict:
+    results = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+            'repeat': repeat,
+            'sessions': sessions,
+            'seed': seed
+        },
+        'stages': {}
+    }
+
+    for scale in scales:
+        config = SCALES[scale]
+        df = synthesize_tweets(config['rows'], config['users'], config['years'], seed=seed)
+        label = f"app-{scale}-s{sessions}"
+        for name, entry in bench_scale(label, df, repeat, sessions, track_memory, timeout).items():
+            entry.update(config)
+            results['stages'][name] = entry
+            peak = f"{entry['peak_mb']:>9.1f}MB" if entry['peak_mb'] is not None else ''
+            print(f"{name:<45} p50 {entry['p50_seconds'] * 1000:>9.1f}ms  "
+                  f"p95 {entry['p95_seconds'] * 1000:>9.1f}ms {peak}", flush=True)
+        del df
+        gc.collect()
+
+    results['meta']['max_rss_mb'] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    if sessions > 1:
+        results['meta']['max_session_rss_mb'] = round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure dashboard rerun latency with Streamlit AppTest")
+    parser.add_argument('--scales', nargs='+', default=['10k'], choices=sorted(SCALES))
+    parser.add_argument('--repeat', type=int, default=3, help="Replays of the interaction script per session")
+    parser.add_argument('--sessions', type=int, default=1,
+                        help="Concurrent sessions replaying the script (each in its own process)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--timeout', type=float, default=600, help="Per-rerun timeout in seconds")
+    parser.add_argument('--no-memory', action='store_true', help="Skip the tracemalloc pass")
+    parser.add_argument('--output', default='bench_app_results.json', help="Where to write results")
+    parser.add_argument('--baseline', default=None, help="Baseline JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="Allowed relative slowdown before an interaction counts as a regression")
+    parser.add_argument('--save-baseline', default=None, help="Also write results to this baseline path")
+    args = parser.parse_args(argv)
+
+    results = run_app_benchmarks(args.scales, repeat=args.repeat, sessions=args.sessions,
+                                 track_memory=not args.no_memory, seed=args.seed, timeout=args.timeout)
+    print(f"\nPeak RSS: {results['meta']['max_rss_mb']:,.1f} MB"
+          + (f" (largest session process: {results['meta']['max_session_rss_mb']:,.1f} MB)" if args.sessions > 1 else ""))
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.threshold,
+                                          metrics=('p50_seconds', 'p95_seconds', 'peak_mb'))
+        results['regressions'] = regressions
+        if regressions:
+            exit_code = 1
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for reg in regressions:
+                print(f"  - {reg['stage']} [{reg['metric']}]: {reg['baseline']} -> {reg['current']} "
+                      f"(+{reg['change_pct']}%)")
+        else:
+            print(f"\nNo regressions beyond {args.threshold:.0%}")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+"""
+Benchmark harness for the tweet collector and statistics calculator.
+
+Synthesizes datasets at several scales, times and memory-profiles each
+stage, writes the results as JSON and optionally compares them against a
+stored baseline.
+
+    python benchmarks/bench_stats.py --scales 10k 1m
+    python benchmarks/bench_stats.py --scales 10k --save-baseline benchmarks/baseline.json
+    python benchmarks/bench_stats.py --scales 10k --baseline benchmarks/baseline.json --threshold 0.25
+    python benchmarks/bench_stats.py --scales 1m --backends pandas arrow
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime
+from io import StringIO
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.collect_tweets import TwitterDataCollector
+from src.calculate_stats import TweetStatisticsCalculator
+from src.backends import BACKENDS, compare_reports
+from src.near_duplicates import find_near_duplicates
+
+SCALES = {
+    '10k': {'rows': 10_000, 'users': 50, 'years': 3},
+    '1m': {'rows': 1_000_000, 'users': 5_000, 'years': 7},
+    '10m': {'rows': 10_000_000, 'users': 100_000, 'years': 12},
+}
+
+INDUSTRIES = np.array(['Tech', 'Music', 'Science', 'Politics', 'Sports', 'Film'], dtype=object)
+
+CONTENT_TEMPLATES = np.array([
+    "Great day!",
+    "Excited to share our latest project. More soon!",
+    "Great conversation today about innovation and the future.",
+    "This is a detailed tweet about the industry. " * 2,
+    "This is a detailed tweet about the industry. " * 4,
+], dtype=object)
+
+
+def synthesize_tweets(rows: int, users: int, years: int, seed: int = 42,
+                      start_year: int = 2024) -> pd.DataFrame:
+    """Generate a synthetic tweet dataset with the collector's column layout"""
+    rng = np.random.default_rng(seed)
+    first_year = start_year - years + 1
+
+    user_idx = rng.integers(0, users, rows)
+    usernames = np.array([f"user{i}" for i in range(users)], dtype=object)
+    displaynames = np.array([f"User {i}" for i in range(users)], dtype=object)
+    user_industry = INDUSTRIES[rng.integers(0, len(INDUSTRIES), users)]
+    user_mean = rng.uniform(8, 28, users)
+
+    start = np.datetime64(f"{first_year}-01-01T00:00", 'm')
+    span = (np.datetime64(f"{start_year + 1}-01-01T00:00", 'm') - start).astype(np.int64)
+    dates = start + rng.integers(0, span, rows).astype('timedelta64[m]')
+
+    word_count = rng.lognormal(np.log(user_mean[user_idx]), 0.4).astype(np.int64)
+    word_count = np.clip(word_count, 1, 60)
+
+    like_count = np.minimum((word_count * rng.lognormal(5, 0.5, rows)).astype(np.int64), 999999)
+    retweet_count = np.minimum((like_count * rng.uniform(0.1, 0.3, rows)).astype(np.int64), 99999)
+    reply_count = np.minimum((like_count * rng.uniform(0.02, 0.08, rows)).astype(np.int64), 49999)
+
+    template_idx = np.searchsorted([5, 15, 25, 40], word_count, side='right')
+
+    return pd.DataFrame({
+        'id': np.arange(rows, dtype=np.int64),
+        'date': dates.astype('datetime64[ns]'),
+        'content': CONTENT_TEMPLATES[template_idx],
+        'username': usernames[user_idx],
+        'displayname': displaynames[user_idx],
+        'retweet_count': retweet_count,
+        'like_count': like_count,
+        'reply_count': reply_count,
+        'word_count': word_count,
+        'industry': user_industry[user_idx],
+    })
+
+
+def measure(fn: Callable, rows: int, track_memory: bool = True, repeat: int = 1) -> Dict:
+    """Time a callable (best of `repeat`) and record its peak traced allocation"""
+    timings = []
+    peak = None
+    result = None
+
+    for i in range(repeat):
+        gc.collect()
+        trace = track_memory and i == 0
+        if trace:
+            tracemalloc.start()
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+        if trace:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+    best = min(timings)
+    return {
+        'seconds': round(best, 6),
+        'rows': int(rows),
+        'rows_per_second': round(rows / best, 1) if best > 0 else None,
+        'peak_mb': round(peak / 1024 ** 2, 3) if peak is not None else None,
+        'result': result
+    }
+
+
+def calculator_stages(df: pd.DataFrame, backend: str = 'pandas') -> List[tuple]:
+    """Stages timed for each synthesized dataset, in execution order"""
+    holder = {}
+
+    def prepare():
+        holder['calc'] = TweetStatisticsCalculator(df, backend=backend)
+
+    return [
+        ('prepare_data', prepare),
+        ('calculate_basic_stats', lambda: holder['calc'].calculate_basic_stats(holder['calc'].df_clean['word_count'])),
+        ('yearly_summary_stats', lambda: holder['calc'].yearly_summary_stats()),
+        ('user_comparison_stats', lambda: holder['calc'].user_comparison_stats()),
+        ('generate_full_report', lambda: holder['calc'].generate_full_report()),
+    ]
+
+
+def bench_load_sample_data(track_memory: bool, repeat: int) -> Dict:
+    """Benchmark the collector's sample generator (fixed size)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        collector = TwitterDataCollector(data_dir=tmp)
+        with redirect_stdout(StringIO()):
+            probe = measure(collector.load_sample_data, 0, track_memory, repeat)
+    probe['rows'] = int(len(probe['result']))
+    probe['rows_per_second'] = round(probe['rows'] / probe['seconds'], 1) if probe['seconds'] > 0 else None
+    return probe
+
+
+def check_backend_parity(df: pd.DataFrame, backends: Sequence[str]) -> Dict[str, List[str]]:
+    """Differences between each backend's report and the first backend's, from raw content"""
+    raw = df.drop(columns=['word_count'])
+    reports = {name: TweetStatisticsCalculator(raw, backend=name).generate_report_sections() for name in backends}
+    reference = reports[backends[0]]
+    return {name: compare_reports(reference, report, atol=0.01) for name, report in reports.items()
+            if name != backends[0]}
+
+
+def run_benchmarks(scales: List[str], track_memory: bool = True, repeat: int = 1,
+                   users: Optional[int] = None, years: Optional[int] = None,
+                   seed: int = 42, backends: Sequence[str] = ('pandas',), dedupe_workers: int = 1) -> Dict:
+    """Run every stage at every requested scale and collect the results"""
+    results = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'repeat': repeat,
+            'seed': seed
+        },
+        'stages': {},
+        'parity': {}
+    }
+
+    sample = bench_load_sample_data(track_memory, repeat)
+    sample.pop('result')
+    results['stages']['sample/load_sample_data'] = sample
+    print(f"{'sample/load_sample_data':<40} {sample['seconds']:>10.4f}s")
+
+    for scale in scales:
+        config = dict(SCALES[scale])
+        if users is not None:
+            config['users'] = users
+        if years is not None:
+            config['years'] = years
+
+        df = synthesize_tweets(config['rows'], config['users'], config['years'], seed=seed)
+        label = f"{scale}-u{config['users']}-y{config['years']}"
+
+        for backend in backends:
+            # pandas keeps the unsuffixed labels so existing baselines still line up
+            backend_label = label if backend == 'pandas' else f"{label}-{backend}"
+            for stage, fn in calculator_stages(df, backend):
+                entry = measure(fn, len(df), track_memory, repeat)
+                entry.pop('result')
+                entry.update(config, backend=backend)
+                results['stages'][f"{backend_label}/{stage}"] = entry
+                peak = f"{entry['peak_mb']:>10.1f}MB" if entry['peak_mb'] is not None else ''
+                print(f"{backend_label + '/' + stage:<40} {entry['seconds']:>10.4f}s {peak}")
+
+        # Near-duplicate detection is backend-independent, so it is timed once per scale
+        entry = measure(lambda: find_near_duplicates(df['content'], workers=dedupe_workers),
+                        len(df), track_memory, repeat)
+        found = entry.pop('result')
+        entry.update(config, workers=dedupe_workers, distinct_texts=found.stats['distinct_texts'],
+                     duplicate_rows=found.duplicate_rows)
+        results['stages'][f"{label}/near_duplicates"] = entry
+        peak = f"{entry['peak_mb']:>10.1f}MB" if entry['peak_mb'] is not None else ''
+        print(f"{label + '/near_duplicates':<40} {entry['seconds']:>10.4f}s {peak} "
+              f"{entry['rows_per_second']:,.0f} rows/s, {found.duplicate_rows:,} duplicates")
+
+        if len(backends) > 1:
+            for backend, diffs in check_backend_parity(df, backends).items():
+                results['parity'][f"{label}/{backend}"] = diffs
+                status = 'matches' if not diffs else f"{len(diffs)} difference(s), e.g. {diffs[0]}"
+                print(f"{label + '/parity-' + backend:<40} {status} {backends[0]}")
+
+        del df
+        gc.collect()
+
+    return results
+
+
+def compare_to_baseline(results: Dict, baseline: Dict, threshold: float,
+                        metrics: Sequence[str] = ('seconds', 'peak_mb')) -> List[Dict]:
+    """Return stages whose time or peak memory regressed beyond the threshold"""
+    regressions = []
+    for name, current in results['stages'].items():
+        previous = baseline.get('stages', {}).get(name)
+        if previous is None:
+            continue
+        for metric in metrics:
+            old, new = previous.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            ratio = new / old
+            if ratio > 1 + threshold:
+                regressions.append({
+                    'stage': name,
+                    'metric': metric,
+                    'baseline': old,
+                    'current': new,
+                    'change_pct': round((ratio - 1) * 100, 1)
+                })
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark tweet statistics stages")
+    parser.add_argument('--scales', nargs='+', default=['10k'], choices=sorted(SCALES))
+    parser.add_argument('--users', type=int, default=None, help="Override user cardinality")
+    parser.add_argument('--years', type=int, default=None, help="Override year cardinality")
+    parser.add_argument('--repeat', type=int, default=1, help="Timing repetitions (best is kept)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-memory', action='store_true', help="Skip tracemalloc profiling")
+    parser.add_argument('--output', default='bench_results.json', help="Where to write results")
+    parser.add_argument('--baseline', default=None, help="Baseline JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="Allowed relative slowdown before a stage counts as a regression")
+    parser.add_argument('--save-baseline', default=None, help="Also write results to this baseline path")
+    parser.add_argument('--backends', nargs='+', default=['pandas'], choices=sorted(BACKENDS),
+                        help="Compute backends to time; with several, reports are also checked for parity")
+    parser.add_argument('--dedupe-workers', type=int, default=1,
+                        help="Processes used for MinHash signatures in the near-duplicate stage")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.scales, track_memory=not args.no_memory, repeat=args.repeat,
+                             users=args.users, years=args.years, seed=args.seed, backends=args.backends,
+                             dedupe_workers=args.dedupe_workers)
+
+    exit_code = 0
+    mismatched = [name for name, diffs in results['parity'].items() if diffs]
+    if mismatched:
+        exit_code = 1
+        print(f"\nBackend parity failed for: {', '.join(mismatched)}")
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.threshold)
+        results['regressions'] = regressions
+        if regressions:
+            exit_code = 1
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for reg in regressions:
+                print(f"  - {reg['stage']} [{reg['metric']}]: {reg['baseline']} -> {reg['current']} "
+                      f"(+{reg['change_pct']}%)")
+        else:
+            print(f"\nNo regressions beyond {args.threshold:.0%}")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+Load test for the statistics HTTP service (src/stats_api.py).
+
+Fires concurrent GET requests at report-section endpoints and reports
+throughput, latency percentiles, errors and the server's cache/coalescing
+counters. Either point it at a running server or let it start one in-process
+on synthetic data.
+
+    python -m src.stats_api --sample &
+    python benchmarks/load_test_api.py --url http://127.0.0.1:8765 --dataset sample
+
+    python benchmarks/load_test_api.py --spawn --rows 1000000 --requests 2000 --concurrency 32
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from urllib.error import HTTPError, URLError
+from urllib.request import urlopen
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+DEFAULT_SECTIONS = ['report', 'overall', 'yearly', 'monthly', 'users', 'trends', 'distribution', 'histogram']
+
+
+def fetch_json(url: str, timeout: float = 60) -> Dict:
+    with urlopen(url, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+def build_paths(base_url: str, dataset: str, sections: List[str], filters: List[str]) -> List[str]:
+    """Every section unfiltered plus every section under each filter query string"""
+    queries = [''] + [f"?{query}" for query in filters]
+    return [f"{base_url}/datasets/{dataset}/{section}{query}" for query in queries for section in sections]
+
+
+def run_load(paths: List[str], requests: int, concurrency: int, timeout: float = 60,
+             seed: int = 42) -> Dict:
+    """Issue `requests` GETs drawn from `paths` with `concurrency` clients"""
+    rng = np.random.default_rng(seed)
+    urls = [paths[i] for i in rng.integers(0, len(paths), requests)]
+    latencies = np.zeros(requests)
+    errors: List[str] = []
+    lock = threading.Lock()
+
+    def one(i: int) -> None:
+        start = time.perf_counter()
+        try:
+            with urlopen(urls[i], timeout=timeout) as response:
+                response.read()
+        except (HTTPError, URLError, OSError) as e:
+            with lock:
+                errors.append(f"{urls[i]}: {e}")
+        latencies[i] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(requests)))
+    elapsed = time.perf_counter() - start
+
+    ms = latencies * 1000
+    return {
+        'requests': requests,
+        'concurrency': concurrency,
+        'distinct_paths': len(paths),
+        'seconds': round(elapsed, 3),
+        'requests_per_second': round(requests / elapsed, 1) if elapsed > 0 else None,
+        'latency_ms': {
+            'p50': round(float(np.percentile(ms, 50)), 2),
+            'p95': round(float(np.percentile(ms, 95)), 2),
+            'p99': round(float(np.percentile(ms, 99)), 2),
+            'max': round(float(ms.max()), 2)
+        },
+        'errors': len(errors),
+        'error_samples': errors[:5]
+    }
+
+
+def spawn_server(rows: int, users: int, years: int, workers: int, seed: int):
+    """Start the service in a background thread on synthetic data; returns (server, base_url)"""
+    from benchmarks.bench_stats import synthesize_tweets
+    from src.stats_api import StatsService, make_server
+
+    service = StatsService(workers=workers)
+    service.register('synthetic', synthesize_tweets(rows, users, years, seed))
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the statistics HTTP service")
+    parser.add_argument('--url', default='http://127.0.0.1:8765', help="Base URL of a running server")
+    parser.add_argument('--dataset', default=None, help="Dataset name (default: 'synthetic' with --spawn)")
+    parser.add_argument('--spawn', action='store_true', help="Start an in-process server on synthetic data")
+    parser.add_argument('--rows', type=int, default=100_000, help="Synthetic rows for --spawn")
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=4, help="Server worker threads for --spawn")
+    parser.add_argument('--sections', nargs='+', default=DEFAULT_SECTIONS)
+    parser.add_argument('--filter', action='append', default=[], dest='filters',
+                        help="Extra query string to exercise, e.g. 'year=2022' (repeatable)")
+    parser.add_argument('--requests', '-n', type=int, default=1000)
+    parser.add_argument('--concurrency', '-c', type=int, default=16)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default=None, help="Also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    server = None
+    base_url = args.url.rstrip('/')
+    dataset = args.dataset
+    if args.spawn:
+        server, base_url = spawn_server(args.rows, args.users, args.years, args.workers, args.seed)
+        dataset = dataset or 'synthetic'
+        if not args.filters:
+            args.filters = ['year=2020', 'industry=Tech']
+    if dataset is None:
+        parser.error("--dataset is required unless --spawn is given")
+
+    try:
+        fetch_json(f"{base_url}/health")
+        paths = build_paths(base_url, dataset, args.sections, args.filters)
+
+        # Cold: every path requested at once, so identical requests coalesce
+        cold = run_load(paths, len(paths) * args.concurrency, args.concurrency, seed=args.seed)
+        cold_metrics = fetch_json(f"{base_url}/metrics")
+        warm = run_load(paths, args.requests, args.concurrency, seed=args.seed + 1)
+        results = {'cold': cold, 'warm': warm, 'server': fetch_json(f"{base_url}/metrics"),
+                   'server_after_cold': cold_metrics}
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    for phase in ('cold', 'warm'):
+        r = results[phase]
+        print(f"{phase:>5}: {r['requests']:,} requests · {r['requests_per_second']:,} req/s · "
+              f"p50 {r['latency_ms']['p50']} ms · p95 {r['latency_ms']['p95']} ms · "
+              f"p99 {r['latency_ms']['p99']} ms · {r['errors']} errors")
+    server_metrics = results['server']
+    print(f"server: computed {server_metrics['computed']}, coalesced {server_metrics['coalesced']}, "
+          f"cache hits {server_metrics['cache_hits']}, errors {server_metrics['errors']}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    return 1 if results['cold']['errors'] or results['warm']['errors'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
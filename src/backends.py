@@ -0,0 +1,358 @@
+"""
+Compute backends for TweetStatisticsCalculator.
+
+The calculator shapes reports; a backend does the row-level work: word
+counts, date parts, basic statistics and per-group statistics. `pandas` is
+the reference implementation; `arrow` runs the same computations with
+pyarrow.compute kernels (multithreaded hash grouping, sorting and string
+splitting) on columnar buffers. Select one with the calculator's `backend`
+argument or the TWEET_ANALYZER_BACKEND environment variable.
+"""
+import os
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+BACKEND_ENV = "TWEET_ANALYZER_BACKEND"
+DEFAULT_BACKEND = "pandas"
+
+DATE_PARTS = ['year', 'month', 'quarter', 'weekday', 'hour']
+
+BASIC_STATS = ['count', 'mean', 'median', 'mode', 'std', 'var', 'min', 'max', 'range',
+               'q1', 'q3', 'iqr', 'skewness', 'kurtosis', 'cv']
+
+
+def _round(values: np.ndarray, digits: int) -> np.ndarray:
+    """Python's round() elementwise; np.round differs on ties such as 19.925"""
+    return np.array([round(float(value), digits) for value in values], dtype=np.float64)
+
+
+class PandasBackend:
+    """Reference backend: pandas Series methods, one group at a time"""
+
+    name = 'pandas'
+
+    def word_counts(self, content: pd.Series) -> pd.Series:
+        return content.apply(lambda x: len(str(x).split()) if pd.notna(x) else 0)
+
+    def date_parts(self, dates: pd.Series) -> Dict[str, pd.Series]:
+        return {
+            'year': dates.dt.year,
+            'month': dates.dt.month,
+            'quarter': dates.dt.quarter,
+            'weekday': dates.dt.dayofweek,
+            'hour': dates.dt.hour
+        }
+
+    def basic_stats(self, data: pd.Series) -> Dict:
+        """Summary statistics for a numeric series"""
+        return {
+            'count': int(len(data)),
+            'mean': round(float(data.mean()), 2),
+            'median': float(data.median()),
+            'mode': data.mode()[0] if not data.mode().empty else None,
+            'std': round(float(data.std()), 2),
+            'var': round(float(data.var()), 2),
+            'min': float(data.min()),
+            'max': float(data.max()),
+            'range': float(data.max() - data.min()),
+            'q1': float(data.quantile(0.25)),
+            'q3': float(data.quantile(0.75)),
+            'iqr': float(data.quantile(0.75) - data.quantile(0.25)),
+            'skewness': round(float(data.skew()), 3),
+            'kurtosis': round(float(data.kurtosis()), 3),
+            'cv': round(float(data.std() / data.mean() * 100), 2) if data.mean() != 0 else 0
+        }
+
+    def grouped_stats(self, values: pd.Series, keys: pd.Series) -> pd.DataFrame:
+        """basic_stats() per group, one row per key in sorted key order"""
+        rows, index = [], []
+        for key, group in values.groupby(keys, sort=True):
+            rows.append(self.basic_stats(group))
+            index.append(key)
+        return pd.DataFrame(rows, index=pd.Index(index, name=keys.name), columns=BASIC_STATS)
+
+    def grouped_summary(self, df: pd.DataFrame, key: str, value: str,
+                        first: Sequence[str] = (), sums: Sequence[str] = ()) -> pd.DataFrame:
+        """
+        Per-group count, mean, median, std, min and max of `value`, the first
+        row's `first` columns and the totals of `sums` columns, in key order
+        """
+        rows = []
+        for name, group in df.groupby(key):
+            values = group[value]
+            row = {
+                key: name,
+                'count': len(group),
+                'mean': values.mean(),
+                'median': values.median(),
+                'std': values.std(),
+                'min': values.min(),
+                'max': values.max()
+            }
+            for column in first:
+                row[column] = group[column].iloc[0]
+            for column in sums:
+                row[column] = group[column].sum()
+            rows.append(row)
+        return pd.DataFrame(rows, columns=[key, 'count', 'mean', 'median', 'std', 'min', 'max',
+                                           *first, *sums])
+
+    def quantiles(self, values: pd.Series, qs: Sequence[float]) -> List[float]:
+        return [float(values.quantile(q)) for q in qs]
+
+    def shape(self, values: pd.Series) -> tuple:
+        """Sample skewness and excess kurtosis (bias-corrected)"""
+        return values.skew(), values.kurtosis()
+
+
+class ArrowBackend(PandasBackend):
+    """
+    pyarrow.compute backend. Grouped aggregates run as multithreaded Arrow hash
+    aggregations over integer group codes; exact quantiles come from one Arrow
+    sort by (group, value) plus vectorized position lookups, and modes from a
+    (group, value) count aggregation. Results match PandasBackend.
+    """
+
+    name = 'arrow'
+
+    def __init__(self, use_threads: bool = True):
+        import pyarrow  # noqa: F401  (fail when the backend is selected, not mid-report)
+
+        self.use_threads = use_threads
+
+    def word_counts(self, content: pd.Series) -> pd.Series:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        trimmed = pc.utf8_trim_whitespace(pa.array(content.astype('str')))
+        counts = pc.list_value_length(pc.utf8_split_whitespace(trimmed))
+        counts = pc.if_else(pc.equal(trimmed, ''), 0, counts).fill_null(0)
+        return pd.Series(counts.to_numpy(zero_copy_only=False).astype(np.int64), index=content.index)
+
+    def date_parts(self, dates: pd.Series) -> Dict[str, pd.Series]:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        arr = pa.array(dates)
+        dtype = np.float64 if dates.hasnans else np.int32
+        kernels = {'year': pc.year, 'month': pc.month, 'quarter': pc.quarter,
+                   'weekday': pc.day_of_week, 'hour': pc.hour}
+        return {name: pd.Series(kernel(arr).to_numpy(zero_copy_only=False).astype(dtype), index=dates.index)
+                for name, kernel in kernels.items()}
+
+    def _table(self, keys: pd.Series, values: pd.Series):
+        """Arrow table of (group code, value) with missing keys and values dropped, plus the sorted unique keys"""
+        import pyarrow as pa
+
+        codes, uniques = pd.factorize(keys, sort=True)
+        keep = (codes >= 0) & values.notna().to_numpy()
+        return pa.table({'key': codes[keep].astype(np.int32), 'value': values.to_numpy()[keep]}), np.asarray(uniques)
+
+    def _aggregate(self, table, aggregations: List[tuple]) -> Dict[str, np.ndarray]:
+        result = table.group_by('key', use_threads=self.use_threads).aggregate(aggregations).sort_by('key')
+        return {name: result.column(name).to_numpy(zero_copy_only=False) for name in result.column_names}
+
+    def _quantiles(self, table, counts: np.ndarray, qs: Sequence[float]) -> List[np.ndarray]:
+        """pandas 'linear' quantiles of every group from one (group, value) sort"""
+        import pyarrow.compute as pc
+
+        order = pc.sort_indices(table, sort_keys=[('key', 'ascending'), ('value', 'ascending')])
+        ordered = table.column('value').take(order).to_numpy(zero_copy_only=False).astype(np.float64)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        out = []
+        for q in qs:
+            pos = q * (counts - 1)
+            lo = np.floor(pos).astype(np.int64)
+            lo_val = ordered[starts + lo]
+            hi_val = ordered[starts + np.ceil(pos).astype(np.int64)]
+            out.append(lo_val + (hi_val - lo_val) * (pos - lo))
+        return out
+
+    def _modes(self, table) -> np.ndarray:
+        """Most frequent value of every group, smallest on ties (pandas mode()[0])"""
+        import pyarrow.compute as pc
+
+        pairs = table.group_by(['key', 'value'], use_threads=self.use_threads).aggregate([('value', 'count')])
+        pairs = pairs.take(pc.sort_indices(pairs, sort_keys=[
+            ('key', 'ascending'), ('value_count', 'descending'), ('value', 'ascending')]))
+        keys = pairs.column('key').to_numpy()
+        if len(keys) == 0:
+            return pairs.column('value').to_numpy(zero_copy_only=False)
+        first = np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]]))
+        return pairs.column('value').to_numpy(zero_copy_only=False)[first]
+
+    def _moments(self, table) -> Dict[str, np.ndarray]:
+        """Unrounded per-group statistics in group-code order"""
+        import pyarrow.compute as pc
+
+        variance = pc.VarianceOptions(ddof=1)
+        shape = pc.SkewOptions(biased=False)
+        agg = self._aggregate(table, [
+            ('value', 'count'), ('value', 'mean'), ('value', 'stddev', variance),
+            ('value', 'variance', variance), ('value', 'min'), ('value', 'max'),
+            ('value', 'skew', shape), ('value', 'kurtosis', shape)
+        ])
+        stats = {name[len('value_'):]: values.astype(np.float64)
+                 for name, values in agg.items() if name.startswith('value_')}
+        stats['key'] = agg['key']
+        stats['count'] = agg['value_count'].astype(np.int64)
+        # pandas reports zero skewness / kurtosis for constant groups where Arrow gives NaN
+        constant = stats['variance'] == 0
+        stats['skew'] = np.where(constant & (stats['count'] >= 3), 0.0, stats['skew'])
+        stats['kurtosis'] = np.where(constant & (stats['count'] >= 4), 0.0, stats['kurtosis'])
+        return stats
+
+    def _stats_frame(self, keys: pd.Series, values: pd.Series) -> pd.DataFrame:
+        table, uniques = self._table(keys, values)
+        m = self._moments(table)
+        q1, median, q3 = self._quantiles(table, m['count'], [0.25, 0.5, 0.75])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cv = np.where(m['mean'] != 0, _round(m['stddev'] / m['mean'] * 100, 2), 0)
+        return pd.DataFrame({
+            'count': m['count'],
+            'mean': _round(m['mean'], 2),
+            'median': median,
+            'mode': self._modes(table),
+            'std': _round(m['stddev'], 2),
+            'var': _round(m['variance'], 2),
+            'min': m['min'],
+            'max': m['max'],
+            'range': m['max'] - m['min'],
+            'q1': q1,
+            'q3': q3,
+            'iqr': q3 - q1,
+            'skewness': _round(m['skew'], 3),
+            'kurtosis': _round(m['kurtosis'], 3),
+            'cv': cv
+        }, index=pd.Index(uniques[m['key']], name=keys.name))
+
+    def basic_stats(self, data: pd.Series) -> Dict:
+        if data.dropna().empty:
+            return super().basic_stats(data)
+        row = self._stats_frame(pd.Series(np.zeros(len(data), dtype=np.int8), index=data.index), data).iloc[0]
+        stats = {name: float(row[name]) for name in BASIC_STATS}
+        stats['count'] = int(len(data))
+        stats['mode'] = data.dtype.type(row['mode']) if data.dtype.kind in 'iuf' else row['mode']
+        return stats
+
+    def grouped_stats(self, values: pd.Series, keys: pd.Series) -> pd.DataFrame:
+        if values.empty:
+            return super().grouped_stats(values, keys)
+        return self._stats_frame(keys, values)
+
+    def grouped_summary(self, df: pd.DataFrame, key: str, value: str,
+                        first: Sequence[str] = (), sums: Sequence[str] = ()) -> pd.DataFrame:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        if df.empty:
+            return super().grouped_summary(df, key, value, first, sums)
+        table, uniques = self._table(df[key], df[value])
+        agg = self._aggregate(table, [
+            ('value', 'count'), ('value', 'mean'), ('value', 'stddev', pc.VarianceOptions(ddof=1)),
+            ('value', 'min'), ('value', 'max')
+        ])
+        counts = agg['value_count'].astype(np.int64)
+        out = pd.DataFrame({
+            key: uniques[agg['key']],
+            'count': counts,
+            'mean': agg['value_mean'],
+            'median': self._quantiles(table, counts, [0.5])[0],
+            'std': agg['value_stddev'],
+            'min': agg['value_min'],
+            'max': agg['value_max']
+        })
+
+        codes = pd.factorize(df[key], sort=True)[0]
+        keep = codes >= 0
+        if first:
+            # "first" is the first row's value even when missing (pandas iloc[0]), and depends
+            # on row order, which only single-threaded grouping preserves. Arrow has no "first"
+            # kernel for all-null columns, whose first values are all missing anyway.
+            columns = {column: pa.array(df[column][keep], from_pandas=True) for column in first}
+            typed = [column for column in first if columns[column].type != pa.null()]
+            firsts = pa.table({'key': codes[keep], **{column: columns[column] for column in typed}})
+            firsts = firsts.group_by('key', use_threads=False).aggregate(
+                [(column, 'first', pc.ScalarAggregateOptions(skip_nulls=False)) for column in typed]).sort_by('key')
+            for column in first:
+                out[column] = firsts.column(f"{column}_first").to_numpy(zero_copy_only=False) \
+                    if column in typed else None
+        if sums:
+            totals = pa.table({'key': codes[keep],
+                               **{column: pa.array(df[column][keep], from_pandas=True) for column in sums}})
+            totals = self._aggregate(totals, [(column, 'sum', pc.ScalarAggregateOptions(min_count=0))
+                                              for column in sums])
+            for column in sums:
+                out[column] = totals[f"{column}_sum"]
+        return out
+
+    def quantiles(self, values: pd.Series, qs: Sequence[float]) -> List[float]:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        result = pc.quantile(pa.array(values.dropna().to_numpy()), q=list(qs), interpolation='linear')
+        return [float('nan') if q is None else float(q) for q in result.to_pylist()]
+
+    def shape(self, values: pd.Series) -> tuple:
+        table, _ = self._table(pd.Series(np.zeros(len(values), dtype=np.int8), index=values.index), values)
+        moments = self._moments(table)
+        if len(moments['skew']) == 0:
+            return float('nan'), float('nan')
+        return float(moments['skew'][0]), float(moments['kurtosis'][0])
+
+
+BACKENDS = {
+    'pandas': PandasBackend,
+    'arrow': ArrowBackend
+}
+
+
+def get_backend(backend=None):
+    """Backend instance from a name, an instance or TWEET_ANALYZER_BACKEND (default pandas)"""
+    if backend is None:
+        backend = os.environ.get(BACKEND_ENV) or DEFAULT_BACKEND
+    if not isinstance(backend, str):
+        return backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown compute backend {backend!r}; choose from {sorted(BACKENDS)}")
+    return BACKENDS[backend]()
+
+
+def compare_reports(expected: Dict, actual: Dict, rtol: float = 1e-9, atol: float = 0.0,
+                    path: str = '') -> List[str]:
+    """
+    Differences between two report dicts (nested dicts, lists, DataFrames and
+    scalars); numbers compare with tolerances `rtol` / `atol`. Empty when equal.
+    Rounded report fields can legitimately differ by one unit in the last
+    decimal when backends sum in a different order, so parity checks pass
+    atol=0.01.
+    """
+    if isinstance(expected, pd.DataFrame) or isinstance(actual, pd.DataFrame):
+        if not isinstance(expected, pd.DataFrame) or not isinstance(actual, pd.DataFrame):
+            return [f"{path}: type {type(expected).__name__} != {type(actual).__name__}"]
+        if list(expected.columns) != list(actual.columns) or len(expected) != len(actual):
+            return [f"{path}: shape/columns {list(expected.columns)}x{len(expected)} != "
+                    f"{list(actual.columns)}x{len(actual)}"]
+        return compare_reports(expected.to_dict('list'), actual.to_dict('list'), rtol, atol, path)
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        if set(expected) != set(actual):
+            return [f"{path}: keys {sorted(map(str, set(expected) ^ set(actual)))} differ"]
+        return [diff for key in expected
+                for diff in compare_reports(expected[key], actual[key], rtol, atol,
+                                             f"{path}.{key}" if path else str(key))]
+    if isinstance(expected, (list, tuple)) and isinstance(actual, (list, tuple)):
+        if len(expected) != len(actual):
+            return [f"{path}: length {len(expected)} != {len(actual)}"]
+        return [diff for i, (a, b) in enumerate(zip(expected, actual))
+                for diff in compare_reports(a, b, rtol, atol, f"{path}[{i}]")]
+    if isinstance(expected, (int, float, np.number)) and isinstance(actual, (int, float, np.number)) \
+            and not isinstance(expected, bool) and not isinstance(actual, bool):
+        a, b = float(expected), float(actual)
+        if (np.isnan(a) and np.isnan(b)) or np.isclose(a, b, rtol=rtol, atol=atol):
+            return []
+        return [f"{path}: {expected!r} != {actual!r}"]
+    if pd.isna(expected) is True and pd.isna(actual) is True:
+        return []
+    return [] if expected == actual else [f"{path}: {expected!r} != {actual!r}"]
@@ -0,0 +1,236 @@
+"""
+Headless batch analysis of many tweet files.
+
+    python -m src.batch_cli data/ --output reports/
+    python -m src.batch_cli "exports/**/*.csv.gz" "archive/*.parquet" --workers 8 --format npz
+
+Each input file gets its own report; a combined summary is written to
+summary.json / summary.csv in the output directory. Files whose fingerprint
+has not changed since the previous run are skipped.
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+try:
+    from .calculate_stats import TweetStatisticsCalculator
+    from .ingest import ingest_tweets
+    from .report_io import dumps_report, write_report_binary, write_report_json
+except ImportError:
+    from calculate_stats import TweetStatisticsCalculator
+    from ingest import ingest_tweets
+    from report_io import dumps_report, write_report_binary, write_report_json
+
+SUPPORTED_SUFFIXES = ('.csv', '.csv.gz', '.csv.zst', '.parquet', '.pq')
+MANIFEST_NAME = ".batch_manifest.json"
+
+
+def discover_files(inputs: List[str], exclude: Optional[str] = None) -> List[str]:
+    """
+    Expand directories and glob patterns into a sorted list of tweet files,
+    skipping anything under the `exclude` directory (the batch's own output)
+    """
+    excluded = os.path.realpath(exclude) + os.sep if exclude else None
+    found = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            candidates = glob.glob(os.path.join(item, '**', '*'), recursive=True)
+        else:
+            candidates = glob.glob(item, recursive=True)
+        for path in candidates:
+            if not os.path.isfile(path) or not path.lower().endswith(SUPPORTED_SUFFIXES):
+                continue
+            if excluded and os.path.realpath(path).startswith(excluded):
+                continue
+            found.add(os.path.abspath(path))
+    return sorted(found)
+
+
+def content_hash(path: str, block_size: int = 1 << 20) -> str:
+    """Hash file contents in blocks"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_fingerprint(path: str, previous: Optional[Dict] = None) -> Dict:
+    """
+    Fingerprint a file by size and mtime, falling back to a content hash
+    only when the cheap check differs from the previous fingerprint.
+    """
+    st = os.stat(path)
+    fingerprint = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+    if previous and previous.get('size') == st.st_size and previous.get('mtime_ns') == st.st_mtime_ns:
+        fingerprint['hash'] = previous.get('hash')
+    else:
+        fingerprint['hash'] = content_hash(path)
+    return fingerprint
+
+
+def report_path_for(path: str, output_dir: str, fmt: str) -> str:
+    """Stable per-file report location inside the output directory"""
+    stem = os.path.basename(path).split('.')[0]
+    tag = hashlib.blake2b(path.encode('utf-8'), digest_size=4).hexdigest()
+    return os.path.join(output_dir, f"{stem}.{tag}.report.{fmt}")
+
+
+def analyze_file(path: str, report_path: str, fmt: str) -> Dict:
+    """Build and write the full report for one file; runs inside a worker process"""
+    start = time.perf_counter()
+    df, cube = ingest_tweets(path)
+    calculator = TweetStatisticsCalculator(df, cube=cube)
+    report = calculator.generate_report_sections()
+
+    if fmt == 'npz':
+        write_report_binary(report, report_path)
+    else:
+        write_report_json(report, report_path)
+
+    info = report['dataset_info']
+    overall = report['overall_stats']
+    return {
+        'file': path,
+        'report': report_path,
+        'rows': int(info['total_tweets']),
+        'clean_tweets': int(info['clean_tweets']),
+        'unique_users': int(info['unique_users']),
+        'missing_dates': int(df.attrs.get('missing_dates', 0)),
+        'start': info['date_range']['start'],
+        'end': info['date_range']['end'],
+        'mean': overall.get('mean'),
+        'median': overall.get('median'),
+        'std': overall.get('std'),
+        'seconds': round(time.perf_counter() - start, 4)
+    }
+
+
+def load_manifest(output_dir: str) -> Dict:
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(output_dir: str, manifest: Dict) -> None:
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    tmp = path + ".tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, path)
+
+
+def run_batch(inputs: List[str], output_dir: str, workers: Optional[int] = None,
+              fmt: str = 'json', force: bool = False, quiet: bool = False) -> pd.DataFrame:
+    """Analyze every discovered file, reusing unchanged results, and write the summary"""
+    os.makedirs(output_dir, exist_ok=True)
+    files = discover_files(inputs, exclude=output_dir)
+    manifest = load_manifest(output_dir)
+
+    def log(message):
+        if not quiet:
+            print(message, flush=True)
+
+    pending = []
+    rows = []
+    fingerprints = {}
+    for path in files:
+        previous = manifest.get(path, {})
+        fingerprint = file_fingerprint(path, previous.get('fingerprint'))
+        fingerprints[path] = fingerprint
+        report_path = report_path_for(path, output_dir, fmt)
+        unchanged = (
+            not force
+            and previous.get('fingerprint', {}).get('hash') == fingerprint['hash']
+            and previous.get('summary', {}).get('report') == report_path
+            and os.path.exists(report_path)
+        )
+        if unchanged:
+            rows.append(dict(previous['summary'], status='skipped', error=None))
+            manifest[path]['fingerprint'] = fingerprint
+        else:
+            pending.append((path, report_path))
+
+    log(f"Found {len(files)} file(s): {len(pending)} to analyze, {len(files) - len(pending)} unchanged")
+
+    batch_start = time.perf_counter()
+    processed_rows = 0
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(analyze_file, path, report_path, fmt): path for path, report_path in pending}
+            for done, future in enumerate(as_completed(futures), start=1):
+                path = futures[future]
+                try:
+                    summary = future.result()
+                except Exception as e:
+                    rows.append({'file': path, 'status': 'error', 'error': str(e)})
+                    manifest.pop(path, None)
+                    log(f"[{done}/{len(pending)}] {os.path.basename(path)} failed: {e}")
+                    continue
+
+                rows.append(dict(summary, status='analyzed', error=None))
+                manifest[path] = {'fingerprint': fingerprints[path], 'summary': summary}
+                processed_rows += summary['rows']
+
+                elapsed = time.perf_counter() - batch_start
+                log(f"[{done}/{len(pending)}] {os.path.basename(path)}: {summary['rows']:,} rows "
+                    f"in {summary['seconds']:.2f}s · {processed_rows / elapsed:,.0f} rows/s overall")
+
+    elapsed = time.perf_counter() - batch_start
+    for stale in set(manifest) - set(files):
+        manifest.pop(stale)
+    save_manifest(output_dir, manifest)
+
+    summary_df = pd.DataFrame(rows)
+    if not summary_df.empty:
+        summary_df = summary_df.sort_values('file').reset_index(drop=True)
+
+    totals = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'files': len(files),
+        'analyzed': int((summary_df.get('status') == 'analyzed').sum()) if not summary_df.empty else 0,
+        'skipped': int((summary_df.get('status') == 'skipped').sum()) if not summary_df.empty else 0,
+        'failed': int((summary_df.get('status') == 'error').sum()) if not summary_df.empty else 0,
+        'rows_analyzed': int(processed_rows),
+        'seconds': round(elapsed, 3),
+        'rows_per_second': round(processed_rows / elapsed, 1) if elapsed > 0 and processed_rows else None
+    }
+
+    with open(os.path.join(output_dir, 'summary.json'), 'w', encoding='utf-8') as f:
+        f.write(dumps_report({'batch': totals, 'files': summary_df}))
+    summary_df.to_csv(os.path.join(output_dir, 'summary.csv'), index=False)
+
+    log(f"Done: {totals['analyzed']} analyzed, {totals['skipped']} skipped, {totals['failed']} failed "
+        f"in {elapsed:.2f}s ({processed_rows:,} rows)")
+    return summary_df
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate tweet statistics reports for many files")
+    parser.add_argument('inputs', nargs='+', help="Directories or glob patterns of CSV/Parquet files")
+    parser.add_argument('--output', '-o', default='reports', help="Directory for reports and summary")
+    parser.add_argument('--workers', '-w', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--format', choices=['json', 'npz'], default='json', help="Per-file report format")
+    parser.add_argument('--force', action='store_true', help="Re-analyze files even if unchanged")
+    parser.add_argument('--quiet', '-q', action='store_true')
+    args = parser.parse_args(argv)
+
+    summary = run_batch(args.inputs, args.output, workers=args.workers, fmt=args.format,
+                        force=args.force, quiet=args.quiet)
+    failed = (summary['status'] == 'error').any() if not summary.empty else False
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+WEEKDAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+HOURS_PER_WEEK = 7 * 24
+
+# Log-spaced gap bins from one minute to one year, in hours
+GAP_BIN_EDGES_HOURS = np.logspace(np.log10(1 / 60), np.log10(24 * 365), 31)
+
+ACTIVE_SHARE = 0.8
+
+
+def _sorted_quantile(values: np.ndarray, starts: np.ndarray, counts: np.ndarray, q: float) -> np.ndarray:
+    """Linear-interpolated quantile of each group in a group-then-value sorted array"""
+    out = np.full(len(counts), np.nan)
+    has = counts > 0
+    pos = q * (counts[has] - 1)
+    lo = np.floor(pos).astype(np.int64)
+    hi = np.ceil(pos).astype(np.int64)
+    lo_val = values[starts[has] + lo]
+    out[has] = lo_val + (values[starts[has] + hi] - lo_val) * (pos - lo)
+    return out
+
+
+class PostingCadence:
+    """
+    Per-user posting cadence from one sort of tweets by (user, time): inter-tweet
+    gap distribution, burstiness B = (sigma - mu) / (sigma + mu) of the gaps
+    (-1 periodic, 0 Poisson-like, towards 1 bursty), peak hour, the number of
+    hours of the day holding ACTIVE_SHARE of a user's tweets, and weekday x hour
+    heatmaps. Sorted per-user slices are kept so a user's heatmap or gap
+    histogram costs only that user's rows.
+    """
+
+    def __init__(self, users: np.ndarray, offsets: np.ndarray, slots: np.ndarray,
+                 gap_offsets: np.ndarray, gaps_hours: np.ndarray, per_user: pd.DataFrame):
+        self.users = users
+        self.offsets = offsets
+        self.slots = slots
+        self.gap_offsets = gap_offsets
+        self.gaps_hours = gaps_hours
+        self.per_user = per_user
+        self._positions = {user: i for i, user in enumerate(users)}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'PostingCadence':
+        """Build from tweet rows with username and date (weekday / hour are derived if absent)"""
+        if df.empty or 'date' not in df.columns:
+            return cls.empty()
+
+        dates = pd.to_datetime(df['date'])
+        if 'username' in df.columns:
+            codes, users = pd.factorize(df['username'], sort=True)
+        else:
+            codes, users = np.zeros(len(df), dtype=np.int64), np.array([''], dtype=object)
+        weekday = df['weekday'].to_numpy() if 'weekday' in df.columns else dates.dt.dayofweek.to_numpy()
+        hour = df['hour'].to_numpy() if 'hour' in df.columns else dates.dt.hour.to_numpy()
+        if dates.dt.tz is not None:
+            dates = dates.dt.tz_convert('UTC').dt.tz_localize(None)
+
+        keep = (codes >= 0) & dates.notna().to_numpy()
+        codes = codes[keep].astype(np.int64)
+        ticks = dates.to_numpy('datetime64[ns]')[keep].astype(np.int64)
+        slots = (weekday[keep].astype(np.int64) * 24 + hour[keep].astype(np.int64))
+        users = np.asarray(users)
+        n_users = len(users)
+
+        order = np.lexsort((ticks, codes))
+        codes, ticks, slots = codes[order], ticks[order], slots[order].astype(np.int16)
+        counts = np.bincount(codes, minlength=n_users)
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+
+        # Gaps between consecutive tweets of the same user; already grouped by user
+        same = codes[1:] == codes[:-1]
+        gaps = (np.diff(ticks)[same] / 3.6e12).astype(np.float64)
+        gap_codes = codes[1:][same]
+        gap_counts = np.bincount(gap_codes, minlength=n_users)
+        gap_offsets = np.concatenate([[0], np.cumsum(gap_counts)])
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = np.bincount(gap_codes, gaps, minlength=n_users) / gap_counts
+            meansq = np.bincount(gap_codes, gaps ** 2, minlength=n_users) / gap_counts
+            std = np.sqrt(np.clip(meansq - mean ** 2, 0, None))
+            burstiness = np.where(gap_counts >= 2, (std - mean) / (std + mean), np.nan)
+
+        # Gaps sorted within each user for medians / percentiles
+        gap_sorted = gaps[np.lexsort((gaps, gap_codes))]
+        median = _sorted_quantile(gap_sorted, gap_offsets[:-1], gap_counts, 0.5)
+        p90 = _sorted_quantile(gap_sorted, gap_offsets[:-1], gap_counts, 0.9)
+
+        hour_counts = np.bincount(codes * 24 + slots % 24, minlength=n_users * 24).reshape(n_users, 24)
+        ranked = -np.sort(-hour_counts, axis=1)
+        covered = np.cumsum(ranked, axis=1) < ACTIVE_SHARE * counts[:, None]
+        active_hours = np.where(counts > 0, covered.sum(axis=1) + 1, 0)
+
+        per_user = pd.DataFrame({
+            'username': users,
+            'tweets': counts,
+            'mean_gap_hours': np.round(mean, 3),
+            'median_gap_hours': np.round(median, 3),
+            'p90_gap_hours': np.round(p90, 3),
+            'burstiness': np.round(burstiness, 3),
+            'peak_hour': hour_counts.argmax(axis=1),
+            'active_hours': active_hours
+        })
+        return cls(users, offsets, slots, gap_offsets, gaps, per_user)
+
+    @classmethod
+    def empty(cls) -> 'PostingCadence':
+        zeros = np.zeros(1, dtype=np.int64)
+        per_user = pd.DataFrame(columns=['username', 'tweets', 'mean_gap_hours', 'median_gap_hours',
+                                         'p90_gap_hours', 'burstiness', 'peak_hour', 'active_hours'])
+        return cls(np.array([], dtype=object), zeros, np.zeros(0, dtype=np.int16), zeros,
+                   np.zeros(0), per_user)
+
+    def _slice(self, offsets: np.ndarray, username: Optional[str]) -> slice:
+        if username is None:
+            return slice(0, offsets[-1])
+        i = self._positions.get(username)
+        return slice(0, 0) if i is None else slice(offsets[i], offsets[i + 1])
+
+    def heatmap(self, username: Optional[str] = None) -> np.ndarray:
+        """Tweet counts by weekday (rows, Monday first) and hour (columns)"""
+        slots = self.slots[self._slice(self.offsets, username)]
+        return np.bincount(slots, minlength=HOURS_PER_WEEK).reshape(7, 24)
+
+    def gap_histogram(self, username: Optional[str] = None,
+                      edges: np.ndarray = GAP_BIN_EDGES_HOURS) -> np.ndarray:
+        """Counts of inter-tweet gaps (hours) in log-spaced bins; gaps beyond the edges are clipped in"""
+        gaps = self.gaps_hours[self._slice(self.gap_offsets, username)]
+        return np.histogram(np.clip(gaps, edges[0], edges[-1]), bins=edges)[0]
+
+    def overall(self) -> Dict:
+        """Cadence statistics pooled over every user's gaps"""
+        gaps = self.gaps_hours
+        if len(gaps) < 2:
+            return {'tweets': int(self.offsets[-1]), 'gaps': int(len(gaps))}
+        mean, std = float(gaps.mean()), float(gaps.std())
+        return {
+            'tweets': int(self.offsets[-1]),
+            'gaps': int(len(gaps)),
+            'mean_gap_hours': round(mean, 3),
+            'median_gap_hours': round(float(np.median(gaps)), 3),
+            'burstiness': round((std - mean) / (std + mean), 3) if std + mean > 0 else None
+        }
+
+    def to_dict(self) -> Dict:
+        """JSON-ready summary: per-user table (column-wise), overall stats, heatmap and gap histogram"""
+        return {
+            'overall': self.overall(),
+            'users': {column: self.per_user[column].tolist() for column in self.per_user.columns},
+            'heatmap': self.heatmap().tolist(),
+            'gap_histogram': {
+                'edges_hours': GAP_BIN_EDGES_HOURS.round(4).tolist(),
+                'counts': self.gap_histogram().tolist()
+            }
+        }
@@ -1,124 +1,205 @@
 import pandas as pd
 import numpy as np
-from scipy import stats
+from concurrent.futures import Executor
 from typing import Dict, List, Tuple, Optional
 import json
 
+try:
+    from .profiling import NULL_TRACE, ReportTrace, traced
+    from .stats_cube import StatsCube
+    from .distribution import DistributionSummary
+    from .sampling import STRATA, ProgressiveReport, StratifiedSample
+    from .backends import DATE_PARTS, get_backend
+    from .cadence import PostingCadence
+    from .changepoints import monthly_changepoints
+    from .vocabulary import Vocabulary
+    from .near_duplicates import NearDuplicates, find_near_duplicates
+except ImportError:
+    from profiling import NULL_TRACE, ReportTrace, traced
+    from stats_cube import StatsCube
+    from distribution import DistributionSummary
+    from sampling import STRATA, ProgressiveReport, StratifiedSample
+    from backends import DATE_PARTS, get_backend
+    from cadence import PostingCadence
+    from changepoints import monthly_changepoints
+    from vocabulary import Vocabulary
+    from near_duplicates import NearDuplicates, find_near_duplicates
+
+
+def _clean_rows(calc) -> int:
+    return len(calc.df_clean)
+
+
+def pooled_t_test(a: np.ndarray, b: np.ndarray) -> Tuple[float, float]:
+    """
+    Two-sample Student t-test with pooled variance (scipy.stats.ttest_ind).
+    Only scipy.special is needed, which imports far faster than scipy.stats.
+    """
+    from scipy.special import stdtr
+
+    n1, n2 = len(a), len(b)
+    dof = n1 + n2 - 2
+    pooled = ((n1 - 1) * np.var(a, ddof=1) + (n2 - 1) * np.var(b, ddof=1)) / dof
+    denom = np.sqrt(pooled * (1.0 / n1 + 1.0 / n2))
+    if denom == 0:
+        return float('nan'), float('nan')
+    t_stat = (np.mean(a) - np.mean(b)) / denom
+    return float(t_stat), float(2 * stdtr(dof, -abs(t_stat)))
+
+
 class TweetStatisticsCalculator:
     """Calculate comprehensive summary statistics for tweet data"""
     
-    def __init__(self, df: pd.DataFrame):
-        self.df = df.copy()
+    def __init__(self, df: pd.DataFrame, trace: Optional[ReportTrace] = None,
+                 cube: Optional[StatsCube] = None, backend=None, dedupe_threshold: Optional[float] = None):
+        self.trace = trace if trace is not None else NULL_TRACE
+        # A prebuilt cube describes the rows before near-duplicates are collapsed
+        self._cube = cube if dedupe_threshold is None else None
+        self.dedupe_threshold = dedupe_threshold
+        self.near_duplicates: Optional[NearDuplicates] = None
+        self._cadence: Optional[PostingCadence] = None
+        self._vocabulary: Optional[Vocabulary] = None
+        self.backend = get_backend(backend)
+        # Shallow: _prepare_data only adds or replaces whole columns, so the caller's frame (often a
+        # memory-mapped one from DatasetStore) is never modified or materialized
+        self.df = df.copy(deep=False)
         self._prepare_data()
     
+    @traced('prepare_data', rows=lambda calc: len(calc.df))
     def _prepare_data(self):
         """Prepare data for analysis"""
+        rows = len(self.df)
+        
+        if self.dedupe_threshold is not None and 'content' in self.df.columns:
+            with self.trace.stage('near_duplicates', rows):
+                self.near_duplicates = find_near_duplicates(self.df['content'], self.dedupe_threshold)
+                self.df = self.df[self.near_duplicates.keep_mask]
+        
         if 'date' in self.df.columns and not pd.api.types.is_datetime64_any_dtype(self.df['date']):
-            self.df['date'] = pd.to_datetime(self.df['date'])
+            with self.trace.stage('parse_dates', rows):
+                self.df['date'] = pd.to_datetime(self.df['date'])
         
         if 'word_count' not in self.df.columns and 'content' in self.df.columns:
-            self.df['word_count'] = self.df['content'].apply(
-                lambda x: len(str(x).split()) if pd.notna(x) else 0
-            )
+            with self.trace.stage('tokenize', rows):
+                self.df['word_count'] = self.backend.word_counts(self.df['content'])
         
         if 'date' in self.df.columns:
-            self.df['year'] = self.df['date'].dt.year
-            self.df['month'] = self.df['date'].dt.month
-            self.df['quarter'] = self.df['date'].dt.quarter
-            self.df['weekday'] = self.df['date'].dt.dayofweek
-            self.df['hour'] = self.df['date'].dt.hour
-        
-        if 'word_count' in self.df.columns:
-            self.df_clean = self.df[self.df['word_count'] <= 100].copy()
-        else:
-            self.df_clean = self.df.copy()
+            with self.trace.stage('derive_date_parts', rows):
+                parts = self.backend.date_parts(self.df['date'])
+                for name in DATE_PARTS:
+                    self.df[name] = parts[name]
+        
+        with self.trace.stage('filter_clean', rows):
+            # Nothing modifies df_clean in place, so it shares columns with df when no row is dropped
+            if 'word_count' in self.df.columns:
+                clean = (self.df['word_count'] <= 100).to_numpy()
+                self.df_clean = self.df if clean.all() else self.df[clean]
+            else:
+                self.df_clean = self.df
     
     def calculate_basic_stats(self, data: pd.Series) -> Dict:
         """Calculate basic summary statistics for a numeric series"""
-        stats_dict = {
-            'count': int(len(data)),
-            'mean': round(float(data.mean()), 2),
-            'median': float(data.median()),
-            'mode': data.mode()[0] if not data.mode().empty else None,
-            'std': round(float(data.std()), 2),
-            'var': round(float(data.var()), 2),
-            'min': float(data.min()),
-            'max': float(data.max()),
-            'range': float(data.max() - data.min()),
-            'q1': float(data.quantile(0.25)),
-            'q3': float(data.quantile(0.75)),
-            'iqr': float(data.quantile(0.75) - data.quantile(0.25)),
-            'skewness': round(float(data.skew()), 3),
-            'kurtosis': round(float(data.kurtosis()), 3),
-            'cv': round(float(data.std() / data.mean() * 100), 2) if data.mean() != 0 else 0
-        }
-        return stats_dict
+        return self.backend.basic_stats(data)
+    
+    @traced('overall_stats', rows=_clean_rows)
+    def _overall_stats(self) -> Dict:
+        """Basic statistics over all clean tweets"""
+        if 'word_count' not in self.df_clean.columns:
+            return {}
+        return self.calculate_basic_stats(self.df_clean['word_count'])
     
+    @traced('yearly_summary_stats', rows=_clean_rows)
     def yearly_summary_stats(self) -> pd.DataFrame:
         """Calculate summary statistics grouped by year"""
         if 'year' not in self.df_clean.columns or 'word_count' not in self.df_clean.columns:
             return pd.DataFrame()
         
-        yearly_stats = []
-        
-        for year in sorted(self.df_clean['year'].unique()):
-            year_data = self.df_clean[self.df_clean['year'] == year]['word_count']
-            
-            if len(year_data) > 0:
-                stats_dict = self.calculate_basic_stats(year_data)
-                stats_dict['year'] = year
-                stats_dict['tweet_count'] = len(year_data)
-                yearly_stats.append(stats_dict)
-        
-        return pd.DataFrame(yearly_stats)
+        yearly_stats = self.backend.grouped_stats(self.df_clean['word_count'], self.df_clean['year'])
+        yearly_stats['year'] = yearly_stats.index
+        yearly_stats['tweet_count'] = yearly_stats['count']
+        return yearly_stats.reset_index(drop=True)
     
+    @traced('monthly_summary_stats', rows=_clean_rows)
     def monthly_summary_stats(self) -> pd.DataFrame:
         """Calculate monthly summary statistics"""
         if 'year' not in self.df_clean.columns or 'month' not in self.df_clean.columns:
             return pd.DataFrame()
         
-        self.df_clean['year_month'] = self.df_clean['date'].dt.to_period('M')
-        monthly_stats = []
-        
-        for period, group in self.df_clean.groupby('year_month'):
-            if len(group) >= 5:
-                word_counts = group['word_count']
-                stats_dict = self.calculate_basic_stats(word_counts)
-                stats_dict['year_month'] = str(period)
-                stats_dict['tweet_count'] = len(group)
-                monthly_stats.append(stats_dict)
-        
-        return pd.DataFrame(monthly_stats)
+        # year * 100 + month sorts like the 'YYYY-MM' period labels
+        periods = (self.df_clean['year'] * 100 + self.df_clean['month']).rename('year_month')
+        monthly_stats = self.backend.grouped_stats(self.df_clean['word_count'], periods)
+        monthly_stats = monthly_stats[monthly_stats['count'] >= 5]
+        keys = monthly_stats.index.to_numpy().astype(np.int64)
+        monthly_stats['year_month'] = [f"{key // 100:04d}-{key % 100:02d}" for key in keys]
+        monthly_stats['tweet_count'] = monthly_stats['count']
+        return monthly_stats.reset_index(drop=True)
     
+    @traced('user_comparison_stats', rows=_clean_rows)
     def user_comparison_stats(self) -> pd.DataFrame:
         """Compare statistics across different users"""
         if 'username' not in self.df_clean.columns:
             return pd.DataFrame()
         
-        user_stats = []
-        
-        for username, group in self.df_clean.groupby('username'):
-            word_counts = group['word_count']
-            
-            stats_dict = {
-                'username': username,
-                'displayname': group['displayname'].iloc[0] if 'displayname' in group.columns else username,
-                'tweet_count': len(group),
-                'mean_words': round(word_counts.mean(), 2),
-                'median_words': word_counts.median(),
-                'std_words': round(word_counts.std(), 2),
-                'min_words': word_counts.min(),
-                'max_words': word_counts.max(),
-                'total_engagement': group['like_count'].sum() + group['retweet_count'].sum() if 'like_count' in group.columns else 0
-            }
-            
-            if 'industry' in group.columns:
-                stats_dict['industry'] = group['industry'].iloc[0]
-            
-            user_stats.append(stats_dict)
+        columns = self.df_clean.columns
+        first = [column for column in ('displayname', 'industry') if column in columns]
+        sums = ['like_count', 'retweet_count'] if 'like_count' in columns else []
+        summary = self.backend.grouped_summary(self.df_clean, 'username', 'word_count', first, sums)
         
-        return pd.DataFrame(user_stats)
+        user_stats = pd.DataFrame({
+            'username': summary['username'],
+            'displayname': summary['displayname'] if 'displayname' in columns else summary['username'],
+            'tweet_count': summary['count'],
+            'mean_words': summary['mean'].round(2),
+            'median_words': summary['median'],
+            'std_words': summary['std'].round(2),
+            'min_words': summary['min'],
+            'max_words': summary['max'],
+            'total_engagement': summary['like_count'] + summary['retweet_count'] if sums else 0
+        })
+        if 'industry' in columns:
+            user_stats['industry'] = summary['industry']
+        return user_stats
+    
+    @traced('stats_cube', rows=_clean_rows)
+    def stats_cube(self) -> StatsCube:
+        """Build the (industry, username, year, month) aggregate cube for drill-downs"""
+        if self._cube is None:
+            self._cube = StatsCube.from_frame(self.df_clean)
+        return self._cube.materialize()
     
+    @traced('posting_cadence', rows=lambda calc: len(calc.df))
+    def posting_cadence(self) -> PostingCadence:
+        """Inter-tweet gaps, burstiness, active hours and weekday x hour heatmaps per user"""
+        if self._cadence is None:
+            self._cadence = PostingCadence.from_frame(self.df)
+        return self._cadence
+    
+    @traced('vocabulary', rows=lambda calc: len(calc.df))
+    def vocabulary(self) -> Vocabulary:
+        """Bounded-memory top terms and hashtags overall, per year and per user"""
+        if self._vocabulary is None:
+            self._vocabulary = Vocabulary.from_frame(self.df)
+        return self._vocabulary
+    
+    @traced('change_points', rows=_clean_rows)
+    def change_points(self, by: Optional[str] = None, penalty: float = 3.0) -> pd.DataFrame:
+        """PELT change points in mean tweet length on the monthly series, overall or per `by` (e.g. 'username')"""
+        if 'year' not in self.df_clean.columns or 'month' not in self.df_clean.columns:
+            return pd.DataFrame()
+        if self._cube is None:
+            self._cube = StatsCube.from_frame(self.df_clean)
+        return monthly_changepoints(self._cube, by, penalty)
+    
+    def _change_point_section(self, by: Optional[str] = None) -> pd.DataFrame:
+        """change_points() for the report; a failure leaves an empty section with the error in attrs"""
+        try:
+            return self.change_points(by)
+        except Exception as e:
+            points = pd.DataFrame()
+            points.attrs['error'] = f"Change point detection failed: {e}"
+            return points
+    
+    @traced('detect_trends', rows=_clean_rows)
     def detect_trends(self) -> Dict:
         """Detect significant trends in tweet length over time"""
         yearly_df = self.yearly_summary_stats()
@@ -150,7 +231,7 @@ class TweetStatisticsCalculator:
         last_data = self.df_clean[self.df_clean['year'] == last_year['year']]['word_count']
         
         if len(first_data) > 10 and len(last_data) > 10:
-            t_stat, p_value = stats.ttest_ind(first_data, last_data)
+            t_stat, p_value = pooled_t_test(first_data.to_numpy(), last_data.to_numpy())
             trends['significant_change'] = p_value < 0.05
             trends['p_value'] = round(p_value, 4)
         
@@ -168,6 +249,7 @@ class TweetStatisticsCalculator:
         
         return trends
     
+    @traced('distribution_quantiles', rows=_clean_rows)
     def get_distribution_stats(self) -> Dict:
         """Get distribution characteristics"""
         if 'word_count' not in self.df_clean.columns:
@@ -175,22 +257,13 @@ class TweetStatisticsCalculator:
         
         all_words = self.df_clean['word_count']
         
-        skewness = all_words.skew()
-        kurtosis = all_words.kurtosis()
+        skewness, kurtosis = self.backend.shape(all_words)
         
         distribution_type = "Normal" if abs(skewness) < 0.5 and abs(kurtosis) < 1 else "Skewed"
         
-        percentiles = {
-            'p1': float(all_words.quantile(0.01)),
-            'p5': float(all_words.quantile(0.05)),
-            'p10': float(all_words.quantile(0.10)),
-            'p25': float(all_words.quantile(0.25)),
-            'p50': float(all_words.quantile(0.50)),
-            'p75': float(all_words.quantile(0.75)),
-            'p90': float(all_words.quantile(0.90)),
-            'p95': float(all_words.quantile(0.95)),
-            'p99': float(all_words.quantile(0.99))
-        }
+        levels = [1, 5, 10, 25, 50, 75, 90, 95, 99]
+        values = self.backend.quantiles(all_words, [level / 100 for level in levels])
+        percentiles = {f"p{level}": value for level, value in zip(levels, values)}
         
         return {
             'distribution_type': distribution_type,
@@ -199,6 +272,14 @@ class TweetStatisticsCalculator:
             'percentiles': percentiles
         }
     
+    @traced('distribution_summary', rows=lambda calc: len(calc.df))
+    def distribution_summary(self, nbins: int = 30) -> DistributionSummary:
+        """Histogram bins and binned KDE of word counts for charting"""
+        if 'word_count' not in self.df.columns:
+            return DistributionSummary.from_values([])
+        return DistributionSummary.from_values(self.df['word_count'], nbins=nbins)
+    
+    @traced('engagement_correlation', rows=_clean_rows)
     def get_engagement_correlation(self) -> Dict:
         """Calculate correlation between word count and engagement"""
         if all(col in self.df_clean.columns for col in ['word_count', 'like_count', 'retweet_count']):
@@ -213,25 +294,123 @@ class TweetStatisticsCalculator:
         
         return {}
     
-    def generate_full_report(self) -> Dict:
-        """Generate a complete statistical report"""
-        report = {
-            'dataset_info': {
-                'total_tweets': len(self.df),
-                'clean_tweets': len(self.df_clean),
-                'date_range': {
-                    'start': str(self.df['date'].min()) if 'date' in self.df.columns else None,
-                    'end': str(self.df['date'].max()) if 'date' in self.df.columns else None
-                },
-                'unique_users': self.df['username'].nunique() if 'username' in self.df.columns else 1
-            },
-            'overall_stats': self.calculate_basic_stats(self.df_clean['word_count']) if 'word_count' in self.df_clean.columns else {},
-            'yearly_stats': self.yearly_summary_stats().to_dict('records') if not self.yearly_summary_stats().empty else [],
+    @traced('generate_report', rows=_clean_rows)
+    def generate_report_sections(self) -> Dict:
+        """Generate the report with tabular sections kept as DataFrames"""
+        return {
+            'dataset_info': self._dataset_info(),
+            'overall_stats': self._overall_stats(),
+            'yearly_stats': self.yearly_summary_stats(),
+            'monthly_stats': self.monthly_summary_stats(),
+            'change_points': self._change_point_section(),
+            'user_change_points': self._change_point_section('username'),
             'trends': self.detect_trends(),
+            'vocabulary': self.vocabulary().summary(),
+            'top_terms': self.vocabulary().top('terms'),
+            'top_hashtags': self.vocabulary().top('hashtags'),
             'distribution': self.get_distribution_stats(),
             'engagement': self.get_engagement_correlation(),
-            'user_comparison': self.user_comparison_stats().to_dict('records') if not self.user_comparison_stats().empty else []
+            'user_comparison': self.user_comparison_stats()
         }
+    
+    def _dataset_info(self) -> Dict:
+        info = {
+            'total_tweets': len(self.df),
+            'clean_tweets': len(self.df_clean),
+            'date_range': {
+                'start': str(self.df['date'].min()) if 'date' in self.df.columns else None,
+                'end': str(self.df['date'].max()) if 'date' in self.df.columns else None
+            },
+            'unique_users': self.df['username'].nunique() if 'username' in self.df.columns else 1
+        }
+        if self.near_duplicates is not None:
+            info['near_duplicates'] = self.near_duplicates.to_dict()
+        return info
+    
+    def approximate_report_sections(self, sample_rows: int = 50_000, confidence: float = 0.95,
+                                    seed: int = 0) -> Dict:
+        """
+        Report sections computed on a stratified (username, year) sample of at
+        most `sample_rows` rows. Mean word counts and engagement totals are
+        stratified estimates with confidence intervals (mean_ci / *_ci_low /
+        *_ci_high); tweet counts and dataset info are exact. Term and hashtag
+        counts are sample counts scaled by the inverse sampling fraction. Users
+        without a sampled tweet are missing from user_comparison. Falls back to
+        the exact report when the data fits in the sample.
+        """
+        if len(self.df_clean) <= sample_rows or 'word_count' not in self.df_clean.columns:
+            return self.generate_report_sections()
+        
+        with self.trace.stage('stratified_sample', len(self.df_clean)):
+            sample = StratifiedSample.draw(self.df_clean, STRATA, sample_rows, seed=seed)
+        with self.trace.stage('approximate_report', len(sample)):
+            report = TweetStatisticsCalculator(sample.frame, backend=self.backend).generate_report_sections()
+        report['dataset_info'] = self._dataset_info()
+        
+        overall = sample.estimate_mean('word_count', confidence=confidence).iloc[0]
+        report['overall_stats'].update(
+            count=len(self.df_clean),
+            mean=round(float(overall['estimate']), 2),
+            mean_ci=[round(float(overall['ci_low']), 2), round(float(overall['ci_high']), 2)]
+        )
+        
+        yearly = report['yearly_stats']
+        if not yearly.empty:
+            estimates = sample.estimate_mean('word_count', ['year'], confidence).set_index('year')
+            yearly['mean'] = yearly['year'].map(estimates['estimate']).round(2)
+            yearly['mean_ci_low'] = yearly['year'].map(estimates['ci_low']).round(2)
+            yearly['mean_ci_high'] = yearly['year'].map(estimates['ci_high']).round(2)
+            yearly['count'] = yearly['tweet_count'] = yearly['year'].map(self.df_clean['year'].value_counts())
+        
+        users = report['user_comparison']
+        if not users.empty:
+            estimates = sample.estimate_mean('word_count', ['username'], confidence).set_index('username')
+            users['mean_words'] = users['username'].map(estimates['estimate']).round(2)
+            users['mean_words_ci_low'] = users['username'].map(estimates['ci_low']).round(2)
+            users['mean_words_ci_high'] = users['username'].map(estimates['ci_high']).round(2)
+            users['tweet_count'] = users['username'].map(self.df_clean['username'].value_counts())
+            if 'like_count' in sample.frame.columns and 'retweet_count' in sample.frame.columns:
+                likes = sample.estimate_total('like_count', ['username'], confidence).set_index('username')
+                retweets = sample.estimate_total('retweet_count', ['username'], confidence).set_index('username')
+                users['total_engagement'] = users['username'].map(likes['estimate'] + retweets['estimate']).round()
+        
+        monthly = report['monthly_stats']
+        if not monthly.empty:
+            periods = sample.frame['date'].dt.to_period('M').astype(str).to_numpy()
+            estimated = pd.Series(sample.weights).groupby(periods).sum()
+            monthly['tweet_count'] = monthly['year_month'].map(estimated).round().astype('int64')
+        
+        scale = len(self.df_clean) / len(sample)
+        for section in ('top_terms', 'top_hashtags'):
+            top = report[section]
+            top[['count', 'max_count']] = (top[['count', 'max_count']] * scale).round().astype('int64')
+        for info in report['vocabulary'].values():
+            info['total'] = int(round(info['total'] * scale))
+            info['max_error'] = {by: int(round(error * scale)) for by, error in info['max_error'].items()}
+        
+        report['approximate'] = {
+            'sample_rows': len(sample),
+            'population_rows': len(self.df_clean),
+            'strata': len(sample.keys),
+            'strata_columns': list(sample.keys.columns),
+            'count_scale': round(scale, 4),
+            'confidence': confidence
+        }
+        return report
+    
+    def progressive_report(self, sample_rows: int = 50_000, confidence: float = 0.95,
+                           executor: Optional[Executor] = None) -> ProgressiveReport:
+        """Approximate report sections now, exact ones computed in the background"""
+        approximate = self.approximate_report_sections(sample_rows, confidence)
+        return ProgressiveReport.start(approximate, self.generate_report_sections, executor)
+    
+    def generate_full_report(self) -> Dict:
+        """Generate a complete statistical report"""
+        report = self.generate_report_sections()
+        
+        for key, value in report.items():
+            if isinstance(value, pd.DataFrame):
+                report[key] = value.to_dict('records') if not value.empty else []
         
         return report
 
@@ -270,5 +449,7 @@ if __name__ == "__main__":
             print(f"  - {desc}")
     if 'p_value' in trends:
         print(f"  - Statistical significance: p={trends['p_value']} (p<0.05: {trends['significant_change']})")
+    for point in report['change_points']:
+        print(f"  - Change point {point['year_month']}: {point['mean_before']} -> {point['mean_after']} words")
     
     print("\n" + "=" * 60)
\ No newline at end of file
@@ -0,0 +1,140 @@
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .stats_cube import StatsCube
+except ImportError:
+    from stats_cube import StatsCube
+
+CHANGEPOINT_COLUMNS = ['year_month', 'mean_before', 'mean_after', 'shift', 'tweets_before', 'tweets_after']
+
+
+def pelt(count: np.ndarray, total: np.ndarray, sumsq: np.ndarray, penalty: np.ndarray,
+         min_size: int = 3, min_tweets: int = 10) -> List[List[int]]:
+    """
+    PELT (Killick et al., 2012) for changes in mean, run on many series at once.
+
+    Inputs are (series, periods) arrays of per-period tweet counts, word-count
+    sums and sums of squares. A segment's cost is the squared deviation of its
+    tweets from the segment mean, read off cumulative sums in O(1); `penalty`
+    (one value per series) is added per segment. Segments span at least
+    `min_size` periods and `min_tweets` tweets. Candidates are pruned per
+    series (a dominated one is kept until its dominator can start a valid
+    segment, which keeps the result exact under the size constraints) and each
+    step only evaluates positions still alive in some series.
+
+    Returns, for each series, the sorted period indices where a new segment starts.
+    """
+    n_series, n_periods = count.shape
+    zero = np.zeros((n_series, 1))
+    cum_n = np.hstack([zero, np.cumsum(count, axis=1)])
+    cum_s = np.hstack([zero, np.cumsum(total, axis=1)])
+    cum_q = np.hstack([zero, np.cumsum(sumsq, axis=1)])
+
+    best = np.full((n_series, n_periods + 1), np.inf)
+    best[:, 0] = -penalty
+    last = np.zeros((n_series, n_periods + 1), dtype=np.int64)
+    alive = np.zeros((n_series, n_periods + 1), dtype=bool)
+    alive[:, 0] = True
+    dominated_by = np.full((n_series, n_periods + 1), -1, dtype=np.int64)
+    rows = np.arange(n_series)
+
+    for t in range(1, n_periods + 1):
+        cand = np.flatnonzero(alive[:, :t].any(axis=0))
+        # A dominated candidate is dropped once a valid segment can start at its dominator
+        by = dominated_by[:, cand]
+        reach = cum_n[:, t, None] - np.take_along_axis(cum_n, np.maximum(by, 0), axis=1)
+        live = alive[:, cand] & ~((by >= 0) & (t - by >= min_size) & (reach >= min_tweets))
+
+        n = cum_n[:, t, None] - cum_n[:, cand]
+        s = cum_s[:, t, None] - cum_s[:, cand]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cost = cum_q[:, t, None] - cum_q[:, cand] - np.where(n > 0, s * s / n, 0.0)
+        prior = best[:, cand]
+        valid = live & (t - cand >= min_size) & (n >= min_tweets)
+        scores = np.where(valid, prior + cost + penalty[:, None], np.inf)
+        choice = scores.argmin(axis=1)
+        best[:, t] = scores[rows, choice]
+        last[:, t] = cand[choice]
+
+        # PELT pruning: F(s) + C(s, t) > F(t) means t beats s for every later end point,
+        # but only once (t, end] is long enough to be a segment itself
+        newly = live & (by < 0) & (prior + cost > best[:, t, None])
+        dominated_by[:, cand] = np.where(newly, t, by)
+        alive[:, cand] = live
+        alive[:, t] = True
+
+    breakpoints = []
+    for i in range(n_series):
+        points, t = [], n_periods
+        while t > 0 and np.isfinite(best[i, t]):
+            t = last[i, t]
+            if t > 0:
+                points.append(int(t))
+        breakpoints.append(sorted(points))
+    return breakpoints
+
+
+def _monthly_arrays(cube: StatsCube, by: Optional[str]) -> tuple:
+    """(series labels, month labels, count / sum / sumsq arrays of shape (series, months))"""
+    cells = cube.cells().dropna(subset=['year', 'month'] + ([by] if by else []))
+    months = cells['year'].astype(np.int64) * 12 + cells['month'].astype(np.int64) - 1
+    first, n_months = int(months.min()), int(months.max() - months.min() + 1)
+    if by:
+        series_codes, labels = pd.factorize(cells[by], sort=True)
+    else:
+        series_codes, labels = np.zeros(len(cells), dtype=np.int64), np.array([None], dtype=object)
+
+    flat = series_codes * n_months + (months.to_numpy() - first)
+    size = len(labels) * n_months
+    shape = (len(labels), n_months)
+    count = np.bincount(flat, cells['tweet_count'], minlength=size).reshape(shape)
+    total = np.bincount(flat, cells['sum'], minlength=size).reshape(shape)
+    sumsq = np.bincount(flat, cells['sumsq'], minlength=size).reshape(shape)
+    month_labels = [f"{(first + m) // 12:04d}-{(first + m) % 12 + 1:02d}" for m in range(n_months)]
+    return np.asarray(labels), month_labels, count, total, sumsq
+
+
+def monthly_changepoints(cube: StatsCube, by: Optional[str] = None, penalty: float = 3.0,
+                         min_size: int = 3, min_tweets: int = 10, chunk: int = 10_000) -> pd.DataFrame:
+    """
+    Change points in mean words per tweet on the monthly series of the whole
+    cube (`by=None`) or of every value of `by` (e.g. 'username'), all series in
+    one vectorized PELT pass per `chunk` series. The penalty per series is
+    `penalty * sigma^2 * log(tweets)`, with sigma^2 the pooled within-month
+    variance. One row per change point: the first month of the new segment and
+    the mean words per tweet in the segments before and after it.
+    """
+    columns = ([by] if by else []) + CHANGEPOINT_COLUMNS
+    if len(cube) == 0:
+        return pd.DataFrame(columns=columns)
+
+    labels, month_labels, count, total, sumsq = _monthly_arrays(cube, by)
+    tweets = count.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        within = sumsq.sum(axis=1) - np.where(count > 0, total ** 2 / count, 0).sum(axis=1)
+        sigma2 = within / np.maximum(tweets - (count > 0).sum(axis=1), 1)
+    beta = penalty * np.maximum(sigma2, 1e-9) * np.log(np.maximum(tweets, 2))
+
+    rows = []
+    eligible = np.flatnonzero(tweets >= 2 * min_tweets)
+    for start in range(0, len(eligible), chunk):
+        idx = eligible[start:start + chunk]
+        found = pelt(count[idx], total[idx], sumsq[idx], beta[idx], min_size, min_tweets)
+        for i, points in zip(idx, found):
+            if not points:
+                continue
+            bounds = [0] + points + [count.shape[1]]
+            seg_n = np.add.reduceat(count[i], bounds[:-1])
+            seg_s = np.add.reduceat(total[i], bounds[:-1])
+            active = np.flatnonzero(count[i])
+            for j, point in enumerate(points):
+                # Report the first month of the new segment that actually has tweets
+                month = active[np.searchsorted(active, point)]
+                before, after = seg_s[j] / seg_n[j], seg_s[j + 1] / seg_n[j + 1]
+                row = [month_labels[month], round(before, 2), round(after, 2), round(after - before, 2),
+                       int(seg_n[j]), int(seg_n[j + 1])]
+                rows.append(([labels[i]] if by else []) + row)
+    return pd.DataFrame(rows, columns=columns)
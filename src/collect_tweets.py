@@ -2,23 +2,50 @@ import os
 import pandas as pd
 import numpy as np
 from datetime import datetime
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional
 import warnings
 
+try:
+    from .profiling import NULL_TRACE, ReportTrace, traced
+except ImportError:
+    from profiling import NULL_TRACE, ReportTrace, traced
+
 warnings.filterwarnings('ignore')
 
+# Bump SAMPLE_VERSION whenever the generated sample changes, so stored copies are not reused
+SAMPLE_VERSION = 2
+SAMPLE_YEARS = range(2018, 2025)
+SAMPLE_SEED = 42
+
 class TwitterDataCollector:
     """Collect tweets for free - Python 3.12 compatible"""
     
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data", trace: Optional[ReportTrace] = None):
+        self.trace = trace if trace is not None else NULL_TRACE
         self.data_dir = data_dir
         os.makedirs(data_dir, exist_ok=True)
     
+    @traced('load_sample_data')
     def load_sample_data(self) -> pd.DataFrame:
         """Generate sample tweet data with realistic patterns"""
         
         print("Generating sample tweet dataset...")
-        np.random.seed(42)
+        df = self._generate_sample_data()
+        
+        with self.trace.stage('write_csv', len(df)):
+            filename = f"{self.data_dir}/sample_tweets.csv"
+            df.to_csv(filename, index=False, encoding='utf-8')
+        
+        print(f"Generated {len(df):,} sample tweets")
+        return df
+    
+    @traced('generate_tweets')
+    def _generate_sample_data(self, years: Iterable[int] = SAMPLE_YEARS) -> pd.DataFrame:
+        """
+        Sample tweets of every user in `years`, sorted by date. Each year
+        draws from its own seeded generator, so a year comes out the same
+        whether it is generated alone or with the others.
+        """
         
         users = [
             {
@@ -70,53 +97,54 @@ class TwitterDataCollector:
         
         all_tweets = []
         
-        for year in range(2018, 2025):
+        for year in years:
+            rng = np.random.default_rng([SAMPLE_SEED, year])
             for user in users:
-                n_tweets = np.random.poisson(180)
+                n_tweets = rng.poisson(180)
                 n_tweets = max(50, min(400, n_tweets))
                 
                 for i in range(n_tweets):
                     if user['style'] == 'erratic':
-                        word_count = int(np.random.lognormal(
+                        word_count = int(rng.lognormal(
                             mean=np.log(user['avg_words']),
                             sigma=0.7
                         ))
                     elif user['style'] == 'consistent':
-                        word_count = int(np.random.normal(
+                        word_count = int(rng.normal(
                             user['avg_words'],
                             user['std_words'] * 0.5
                         ))
                     else:
-                        word_count = int(np.random.poisson(user['avg_words']))
+                        word_count = int(rng.poisson(user['avg_words']))
                     
                     word_count = max(1, min(50, word_count))
                     
-                    month = np.random.randint(1, 13)
-                    day = np.random.randint(1, 28)
-                    hour = np.random.randint(0, 24)
-                    minute = np.random.randint(0, 60)
+                    month = rng.integers(1, 13)
+                    day = rng.integers(1, 28)
+                    hour = rng.integers(0, 24)
+                    minute = rng.integers(0, 60)
                     date = datetime(year, month, day, hour, minute)
                     
                     tweet_id = abs(hash(f"{user['username']}{year}{i}{month}{day}")) % 1000000000
                     
-                    like_count = int(word_count * np.random.lognormal(5, 0.5))
+                    like_count = int(word_count * rng.lognormal(5, 0.5))
                     like_count = min(like_count, 999999)
                     
-                    retweet_count = int(like_count * np.random.uniform(0.1, 0.3))
+                    retweet_count = int(like_count * rng.uniform(0.1, 0.3))
                     retweet_count = min(retweet_count, 99999)
                     
-                    reply_count = int(like_count * np.random.uniform(0.02, 0.08))
+                    reply_count = int(like_count * rng.uniform(0.02, 0.08))
                     reply_count = min(reply_count, 49999)
                     
                     if word_count < 5:
-                        content = np.random.choice([
+                        content = rng.choice([
                             "Great day!",
                             "Exciting news!",
                             "Thank you all!",
                             "Working hard!"
                         ])
                     elif word_count < 15:
-                        content = np.random.choice([
+                        content = rng.choice([
                             f"Excited to share our latest project in {user['industry']}. More soon!",
                             f"Great conversation today about innovation and the future.",
                             f"Proud of what we're building. Stay tuned for updates."
@@ -141,12 +169,12 @@ class TwitterDataCollector:
                         'hour': hour,
                         'minute': minute,
                         'word_count': word_count,
-                        'is_retweet': np.random.random() < 0.05,
-                        'has_media': np.random.random() < 0.20,
+                        'is_retweet': rng.random() < 0.05,
+                        'has_media': rng.random() < 0.20,
                         'industry': user['industry'],
                         'tweet_style': user['style'],
-                        'hashtag_count': np.random.poisson(0.5),
-                        'url_count': np.random.poisson(0.2)
+                        'hashtag_count': rng.poisson(0.5),
+                        'url_count': rng.poisson(0.2)
                     }
                     
                     all_tweets.append(tweet)
@@ -157,12 +185,30 @@ class TwitterDataCollector:
         for col in df.select_dtypes(include=['int']).columns:
             df[col] = df[col].astype('int64')
         
-        filename = f"{self.data_dir}/sample_tweets.csv"
-        df.to_csv(filename, index=False, encoding='utf-8')
-        
-        print(f"Generated {len(df):,} sample tweets")
         return df
     
+    def collection_years(self, years: List[int] = None) -> List[int]:
+        """Years iter_celebrity_tweets yields, in order: each requested year once, or every sample year"""
+        if not years:
+            return list(SAMPLE_YEARS)
+        return [year for year in dict.fromkeys(years) if year in SAMPLE_YEARS]
+    
+    def iter_celebrity_tweets(self, username: str = None, years: List[int] = None) -> Iterator[pd.DataFrame]:
+        """
+        Yield a celebrity's tweets one year at a time so callers can show
+        partial results (and stop) while collection is still running.
+        Each year is generated only when it is reached, and nothing is
+        written to disk, so concurrent collections don't interfere.
+        """
+        for year in self.collection_years(years):
+            df = self._generate_sample_data([year])
+            
+            with self.trace.stage('filter_user', len(df)):
+                if username:
+                    df = df[df['username'].str.lower() == username.lower()]
+            
+            yield df.reset_index(drop=True)
+    
     def collect_celebrity_tweets(self, username: str = None, years: List[int] = None, **kwargs) -> pd.DataFrame:
         """
         Collect tweets for a specific celebrity.
@@ -170,13 +216,10 @@ class TwitterDataCollector:
         """
         print(f"Collecting tweets for @{username}...")
         
-        df = self.load_sample_data()
-        
-        if username and 'username' in df.columns:
-            df = df[df['username'].str.lower() == username.lower()]
-            
-        if years and 'year' in df.columns:
-            df = df[df['year'].isin(years)]
+        chunks = list(self.iter_celebrity_tweets(username, years))
+        df = pd.concat(chunks) if chunks else pd.DataFrame()
+        if len(df) > 0:
+            df = df.sort_values('date', kind='stable').reset_index(drop=True)
         
         if len(df) > 0:
             print(f"✅ Found {len(df):,} tweets for @{username}")
@@ -0,0 +1,151 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+try:
+    from .collect_tweets import TwitterDataCollector
+    from .stats_cube import StatsCube
+    from .text_index import TextIndex
+except ImportError:
+    from collect_tweets import TwitterDataCollector
+    from stats_cube import StatsCube
+    from text_index import TextIndex
+
+
+class CollectionJob:
+    """
+    One live collection running in the background. Chunks are appended and
+    folded into a StatsCube and a TextIndex as they arrive, so partial
+    statistics and content search are available at any time without
+    rescanning what was already collected.
+    """
+
+    def __init__(self, username: str, years: Optional[List[int]] = None):
+        self.job_id = uuid.uuid4().hex[:12]
+        self.username = username
+        self.years = list(dict.fromkeys(years)) if years else None
+        self.status = 'pending'
+        self.error: Optional[str] = None
+        self.chunks_done = 0
+        self.chunks_total = len(self.years) if self.years else 1
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._chunks: List[pd.DataFrame] = []
+        self._cube = StatsCube.empty()
+        self._text = TextIndex()
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def done(self) -> bool:
+        return self.status in ('done', 'failed', 'cancelled')
+
+    @property
+    def progress(self) -> float:
+        return self.chunks_done / max(self.chunks_total, 1)
+
+    @property
+    def rows(self) -> int:
+        with self._lock:
+            return sum(len(chunk) for chunk in self._chunks)
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def run(self, collector: TwitterDataCollector) -> None:
+        self.status = 'running'
+        try:
+            self.chunks_total = len(collector.collection_years(self.years))
+            for chunk in collector.iter_celebrity_tweets(self.username, self.years):
+                if self._cancel.is_set():
+                    self.status = 'cancelled'
+                    return
+                cube = StatsCube.from_frame(chunk)
+                contents = chunk['content'] if 'content' in chunk.columns else pd.Series('', index=chunk.index)
+                text = self._text.append(contents.reset_index(drop=True))
+                with self._lock:
+                    self._chunks.append(chunk)
+                    self._cube = self._cube.merge(cube)
+                    self._text = text
+                    self.chunks_done += 1
+            self.status = 'done'
+        except Exception as e:
+            self.error = str(e)
+            self.status = 'failed'
+        finally:
+            self.finished_at = time.time()
+
+    def frame(self) -> pd.DataFrame:
+        """Every tweet collected so far"""
+        with self._lock:
+            chunks = list(self._chunks)
+        if not chunks:
+            return pd.DataFrame()
+        return pd.concat(chunks, ignore_index=True)
+
+    def cube(self) -> StatsCube:
+        """Aggregates over every tweet collected so far"""
+        with self._lock:
+            return self._cube
+
+    def text_index(self) -> TextIndex:
+        """Content search index over every tweet collected so far, in frame() row order"""
+        with self._lock:
+            return self._text
+
+    def to_dict(self) -> Dict:
+        return {
+            'job_id': self.job_id,
+            'username': self.username,
+            'years': self.years,
+            'status': self.status,
+            'progress': self.progress,
+            'rows': self.rows,
+            'error': self.error,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+
+
+class CollectionJobManager:
+    """
+    Process-wide registry of background collection jobs. Jobs are looked up by
+    id, so a session keeps following its job across reruns; finished jobs are
+    dropped once they are older than `ttl` seconds.
+    """
+
+    def __init__(self, max_workers: int = 2, ttl: float = 3600, data_dir: str = "data"):
+        self.ttl = ttl
+        self.data_dir = data_dir
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="collect")
+        self._jobs: Dict[str, CollectionJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, username: str, years: Optional[List[int]] = None) -> str:
+        """Start collecting in the background and return the job id"""
+        self._evict()
+        job = CollectionJob(username, years)
+        with self._lock:
+            self._jobs[job.job_id] = job
+        self._pool.submit(job.run, TwitterDataCollector(self.data_dir))
+        return job.job_id
+
+    def get(self, job_id: Optional[str]) -> Optional[CollectionJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> None:
+        job = self.get(job_id)
+        if job is not None:
+            job.cancel()
+
+    def _evict(self) -> None:
+        now = time.time()
+        with self._lock:
+            for job_id in [job_id for job_id, job in self._jobs.items()
+                           if job.finished_at is not None and now - job.finished_at > self.ttl]:
+                del self._jobs[job_id]
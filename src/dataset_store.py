@@ -0,0 +1,173 @@
+import hashlib
+import os
+import tempfile
+import uuid
+import weakref
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+DEFAULT_STORE_DIR = os.path.join(tempfile.gettempdir(), "tweet_analyzer_store")
+STORE_DIR_ENV = "TWEET_ANALYZER_STORE"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class DatasetHandle:
+    """
+    A read-only attachment to a stored dataset. `frame` is backed by the
+    memory-mapped file, so every handle on the same dataset shares one copy of
+    the data in the OS page cache. The reference is released explicitly, on
+    context exit, or when the handle is garbage collected.
+    """
+
+    def __init__(self, key: str, path: str, ref_path: str, frame: pd.DataFrame):
+        self.key = key
+        self.path = path
+        self.frame = frame
+        self._finalizer = weakref.finalize(self, DatasetHandle._remove_ref, ref_path)
+
+    @staticmethod
+    def _remove_ref(ref_path: str) -> None:
+        try:
+            os.remove(ref_path)
+        except FileNotFoundError:
+            pass
+
+    @property
+    def released(self) -> bool:
+        return not self._finalizer.alive
+
+    def release(self) -> None:
+        self._finalizer()
+
+    def __enter__(self) -> 'DatasetHandle':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
+class DatasetStore:
+    """
+    Dataset store shared by every session and process on a machine.
+    Each dataset is written once as an uncompressed Arrow IPC file and attached
+    by memory-mapping it, so readers never copy or unpickle the data. Every
+    attachment leaves a reference file named after its process; datasets with
+    no live references are evicted least-recently-attached first once the
+    store grows past `max_bytes`.
+    """
+
+    def __init__(self, root: Optional[str] = None, max_bytes: Optional[int] = 2 << 30):
+        self.root = root or os.environ.get(STORE_DIR_ENV) or DEFAULT_STORE_DIR
+        self.max_bytes = max_bytes
+        os.makedirs(self.root, exist_ok=True)
+
+    def _paths(self, key: str) -> tuple:
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+        return os.path.join(self.root, f"{digest}.arrow"), os.path.join(self.root, f"{digest}.refs")
+
+    def contains(self, key: str) -> bool:
+        return os.path.exists(self._paths(key)[0])
+
+    def put(self, key: str, df: pd.DataFrame) -> str:
+        """Write `df` under `key` unless it is already stored; returns the file path"""
+        import pyarrow as pa
+
+        path, _ = self._paths(key)
+        if os.path.exists(path):
+            return path
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        tmp = f"{path}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            with pa.OSFile(tmp, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+        if self.max_bytes is not None:
+            self.evict(self.max_bytes, keep=[key])
+        return path
+
+    def attach(self, key: str) -> DatasetHandle:
+        """Memory-map a stored dataset read-only and register a reference to it"""
+        import pyarrow as pa
+
+        path, ref_dir = self._paths(key)
+        os.makedirs(ref_dir, exist_ok=True)
+        ref_path = os.path.join(ref_dir, f"{os.getpid()}-{uuid.uuid4().hex[:8]}")
+        open(ref_path, 'w').close()
+
+        try:
+            source = pa.memory_map(path, 'r')
+            table = pa.ipc.open_file(source).read_all()
+        except Exception:
+            DatasetHandle._remove_ref(ref_path)
+            raise
+        os.utime(path)
+
+        frame = table.to_pandas(split_blocks=True)
+        return DatasetHandle(key, path, ref_path, frame)
+
+    def put_and_attach(self, key: str, df: pd.DataFrame) -> DatasetHandle:
+        self.put(key, df)
+        return self.attach(key)
+
+    def live_refs(self, key: str) -> int:
+        """Number of attachments held by running processes (stale references are pruned)"""
+        return self._live_refs(self._paths(key)[1])
+
+    def _live_refs(self, ref_dir: str) -> int:
+        if not os.path.isdir(ref_dir):
+            return 0
+        live = 0
+        for name in os.listdir(ref_dir):
+            pid = name.split('-', 1)[0]
+            if pid.isdigit() and _pid_alive(int(pid)):
+                live += 1
+            else:
+                DatasetHandle._remove_ref(os.path.join(ref_dir, name))
+        return live
+
+    def usage(self) -> Dict[str, int]:
+        """Bytes used by each stored dataset file"""
+        return {name: os.path.getsize(os.path.join(self.root, name))
+                for name in os.listdir(self.root) if name.endswith('.arrow')}
+
+    def evict(self, max_bytes: int = 0, keep: Optional[List[str]] = None) -> List[str]:
+        """
+        Delete unreferenced datasets, least recently attached first, until the
+        store fits in `max_bytes`. Returns the removed file names.
+        """
+        keep_files = {os.path.basename(self._paths(key)[0]) for key in keep or []}
+        entries = []
+        for name, size in self.usage().items():
+            path = os.path.join(self.root, name)
+            entries.append((os.path.getmtime(path), name, size))
+        total = sum(size for _, _, size in entries)
+
+        removed = []
+        for _, name, size in sorted(entries):
+            if total <= max_bytes:
+                break
+            ref_dir = os.path.join(self.root, name[:-len('.arrow')] + '.refs')
+            if name in keep_files or self._live_refs(ref_dir):
+                continue
+            os.remove(os.path.join(self.root, name))
+            if os.path.isdir(ref_dir) and not os.listdir(ref_dir):
+                os.rmdir(ref_dir)
+            total -= size
+            removed.append(name)
+        return removed
@@ -0,0 +1,159 @@
+from statistics import NormalDist
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+_STANDARD_NORMAL = NormalDist()
+
+
+def _weighted_points(values: np.ndarray) -> tuple:
+    """Collapse integer-valued data to (unique values, counts); keep floats as unit weights"""
+    values = values[np.isfinite(values)]
+    if len(values) and np.all(values == np.round(values)):
+        low, span = values.min(), values.max() - values.min()
+        if span > 4 * len(values) + 1024:
+            # bincount would allocate the whole value range; sorting is cheaper for sparse values
+            points, counts = np.unique(values, return_counts=True)
+            return points.astype(np.float64), counts.astype(np.float64)
+        counts = np.bincount((values - low).astype(np.int64))
+        points = np.flatnonzero(counts)
+        return points + float(low), counts[points].astype(np.float64)
+    return values.astype(np.float64), np.ones(len(values))
+
+
+def binned_kde(points: np.ndarray, weights: np.ndarray, x: np.ndarray,
+               bandwidth: Optional[float] = None, grid_size: int = 1024) -> np.ndarray:
+    """
+    Gaussian KDE evaluated at `x` by linear binning onto a regular grid and
+    direct convolution (np.convolve) with the kernel truncated at 4 bandwidths.
+    Bandwidth defaults to Scott's rule, matching scipy.stats.gaussian_kde.
+    """
+    n = weights.sum()
+    if n <= 1 or len(points) == 0:
+        return np.zeros_like(x, dtype=np.float64)
+
+    mean = np.average(points, weights=weights)
+    std = np.sqrt(np.sum(weights * (points - mean) ** 2) / (n - 1))
+    if bandwidth is None:
+        bandwidth = std * n ** (-1 / 5)
+    if bandwidth <= 0:
+        return np.zeros_like(x, dtype=np.float64)
+
+    lo = min(points.min(), x.min()) - 4 * bandwidth
+    hi = max(points.max(), x.max()) + 4 * bandwidth
+    grid = np.linspace(lo, hi, grid_size)
+    delta = grid[1] - grid[0]
+
+    pos = (points - lo) / delta
+    left = np.clip(np.floor(pos).astype(np.int64), 0, grid_size - 2)
+    frac = pos - left
+    binned = (np.bincount(left, weights=weights * (1 - frac), minlength=grid_size) +
+              np.bincount(left + 1, weights=weights * frac, minlength=grid_size))
+
+    half = int(np.ceil(4 * bandwidth / delta))
+    offsets = np.arange(-half, half + 1) * delta
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (np.sqrt(2 * np.pi) * bandwidth)
+
+    # The kernel spans at most the grid, so direct convolution is cheap and avoids importing scipy.signal
+    start = (len(kernel) - 1) // 2
+    density = np.convolve(binned, kernel)[start:start + grid_size] / n
+    return np.interp(x, grid, np.maximum(density, 0))
+
+
+def qq_points(points: np.ndarray, weights: np.ndarray, n_quantiles: int = 200) -> Dict:
+    """
+    Normal Q-Q points from a fixed number of quantiles of weighted data.
+    Sample quantiles are exact order statistics read off the cumulative weights,
+    so integer data summarized as a histogram gives the same points as sorting.
+    """
+    n = weights.sum()
+    if n == 0:
+        empty = np.zeros(0)
+        return {'theoretical': empty, 'sample': empty, 'slope': 0.0, 'intercept': 0.0, 'r': 0.0}
+
+    order = np.argsort(points, kind='stable')
+    points, weights = points[order], weights[order]
+    cum = np.cumsum(weights)
+
+    m = int(min(n_quantiles, n))
+    probs = (np.arange(1, m + 1) - 0.5) / m
+    ranks = np.floor(probs * n)
+    sample = points[np.minimum(np.searchsorted(cum, ranks, side='right'), len(points) - 1)]
+    theoretical = np.array([_STANDARD_NORMAL.inv_cdf(p) for p in probs])
+
+    if m > 1 and np.ptp(sample) > 0:
+        slope, intercept = np.polyfit(theoretical, sample, 1)
+        r = np.corrcoef(theoretical, sample)[0, 1]
+    else:
+        slope, intercept, r = 0.0, float(sample.mean()), 0.0
+    return {'theoretical': theoretical, 'sample': sample.astype(np.float64),
+            'slope': float(slope), 'intercept': float(intercept), 'r': float(r)}
+
+
+class DistributionSummary:
+    """
+    Fixed-size summary of a numeric column for charting: histogram bins, a
+    binned KDE curve and normal Q-Q points. Chart payload and render cost do
+    not depend on row count.
+    """
+
+    def __init__(self, bin_edges: np.ndarray, counts: np.ndarray, kde_x: np.ndarray,
+                 kde_y: np.ndarray, n: int, qq: Optional[Dict] = None):
+        self.bin_edges = bin_edges
+        self.counts = counts
+        self.kde_x = kde_x
+        self.kde_y = kde_y
+        self.n = n
+        self.qq = qq if qq is not None else qq_points(np.zeros(0), np.zeros(0))
+
+    @classmethod
+    def from_values(cls, values, nbins: int = 30, kde_points: int = 200,
+                    qq_quantiles: int = 200) -> 'DistributionSummary':
+        values = np.asarray(pd.Series(values).dropna(), dtype=np.float64)
+        if len(values) == 0:
+            empty = np.zeros(0)
+            return cls(empty, empty, empty, empty, 0)
+
+        points, weights = _weighted_points(values)
+        lo, hi = points.min(), points.max()
+        if hi == lo:
+            hi = lo + 1
+
+        counts, edges = np.histogram(points, bins=nbins, range=(lo, hi), weights=weights)
+        kde_x = np.linspace(lo, hi, kde_points)
+        kde_y = binned_kde(points, weights, kde_x)
+        qq = qq_points(points, weights, qq_quantiles)
+        return cls(edges, counts, kde_x, kde_y, int(weights.sum()), qq)
+
+    @property
+    def bin_centers(self) -> np.ndarray:
+        return (self.bin_edges[:-1] + self.bin_edges[1:]) / 2
+
+    @property
+    def bin_widths(self) -> np.ndarray:
+        return np.diff(self.bin_edges)
+
+    @property
+    def density(self) -> np.ndarray:
+        """Histogram normalized to a probability density"""
+        if self.n == 0:
+            return self.counts
+        return self.counts / (self.n * self.bin_widths)
+
+    def to_dict(self) -> Dict:
+        return {
+            'n': self.n,
+            'bin_edges': self.bin_edges.tolist(),
+            'counts': self.counts.tolist(),
+            'kde_x': self.kde_x.tolist(),
+            'kde_y': self.kde_y.tolist(),
+            'qq': {
+                'theoretical': self.qq['theoretical'].tolist(),
+                'sample': self.qq['sample'].tolist(),
+                'slope': self.qq['slope'],
+                'intercept': self.qq['intercept'],
+                'r': self.qq['r']
+            }
+        }
@@ -0,0 +1,135 @@
+import gzip
+import hashlib
+import os
+import tempfile
+import time
+from typing import Callable, Iterator, List, Optional
+
+import pandas as pd
+
+EXPORT_FORMATS = {
+    'csv': {'extension': 'csv', 'mime': 'text/csv'},
+    'csv.gz': {'extension': 'csv.gz', 'mime': 'application/gzip'},
+    'parquet': {'extension': 'parquet', 'mime': 'application/vnd.apache.parquet'},
+}
+
+DEFAULT_EXPORT_DIR = os.path.join(tempfile.gettempdir(), "tweet_analyzer_exports")
+# Cached exports are removed once older than a day, or least recently used first past 1 GiB
+MAX_EXPORT_BYTES = 1 << 30
+MAX_EXPORT_AGE = 24 * 3600
+
+
+def iter_frame_chunks(rows: Callable[[int, int], pd.DataFrame], total: int,
+                      chunk_rows: int = 50_000) -> Iterator[pd.DataFrame]:
+    """Yield successive slices produced by `rows(start, stop)` without building the full frame"""
+    for start in range(0, total, chunk_rows):
+        yield rows(start, min(start + chunk_rows, total))
+
+
+def write_export(chunks: Iterator[pd.DataFrame], fmt: str, path: str,
+                 columns: Optional[List[str]] = None) -> str:
+    """
+    Write chunks to `path` as CSV, gzip-compressed CSV or Parquet, one chunk
+    at a time. The file is written under a temporary name and moved into place.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        if fmt == 'parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            writer = None
+            try:
+                for chunk in chunks:
+                    table = pa.Table.from_pandas(chunk[columns] if columns else chunk, preserve_index=False)
+                    if writer is None:
+                        writer = pq.ParquetWriter(tmp, table.schema, compression='zstd')
+                    writer.write_table(table)
+            finally:
+                if writer is not None:
+                    writer.close()
+            if writer is None:
+                pd.DataFrame(columns=columns or []).to_parquet(tmp, index=False)
+        else:
+            if fmt == 'csv.gz':
+                f = gzip.open(tmp, 'wt', compresslevel=6, encoding='utf-8', newline='')
+            else:
+                f = open(tmp, 'w', encoding='utf-8', newline='')
+            with f:
+                header = True
+                for chunk in chunks:
+                    (chunk[columns] if columns else chunk).to_csv(f, index=False, header=header)
+                    header = False
+                if header and columns:
+                    f.write(",".join(columns) + "\n")
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return path
+
+
+def export_cache_path(key: str, fmt: str, directory: str = DEFAULT_EXPORT_DIR) -> str:
+    """Deterministic on-disk location for an export identified by `key`"""
+    os.makedirs(directory, exist_ok=True)
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+    return os.path.join(directory, f"export_{digest}.{EXPORT_FORMATS[fmt]['extension']}")
+
+
+def evict_exports(directory: str = DEFAULT_EXPORT_DIR, max_bytes: Optional[int] = MAX_EXPORT_BYTES,
+                  max_age: Optional[float] = MAX_EXPORT_AGE, keep: Optional[List[str]] = None) -> List[str]:
+    """
+    Delete cached exports not used for `max_age` seconds, then the least
+    recently used ones until the rest fit in `max_bytes`. Files in `keep` are
+    never removed. Returns the removed file names.
+    """
+    if not os.path.isdir(directory):
+        return []
+    keep_files = {os.path.basename(path) for path in keep or []}
+    now = time.time()
+    entries = []
+    for name in os.listdir(directory):
+        if not name.startswith('export_') or name in keep_files:
+            continue
+        try:
+            stat = os.stat(os.path.join(directory, name))
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, name, stat.st_size))
+    total = sum(size for _, _, size in entries) + sum(
+        os.path.getsize(os.path.join(directory, name)) for name in keep_files
+        if os.path.exists(os.path.join(directory, name)))
+
+    removed = []
+    for mtime, name, size in sorted(entries):
+        expired = max_age is not None and now - mtime > max_age
+        if not expired and (max_bytes is None or total <= max_bytes):
+            continue
+        try:
+            os.remove(os.path.join(directory, name))
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed.append(name)
+    return removed
+
+
+def cached_export(key: str, fmt: str, chunks: Callable[[], Iterator[pd.DataFrame]],
+                  columns: Optional[List[str]] = None, directory: str = DEFAULT_EXPORT_DIR,
+                  max_bytes: Optional[int] = MAX_EXPORT_BYTES, max_age: Optional[float] = MAX_EXPORT_AGE) -> str:
+    """
+    Return the path of the export for `key`, writing it from `chunks()` only if
+    it is not already on disk. Repeated downloads of the same filter state reuse
+    the file instead of re-serializing; every call refreshes the file's last use
+    and evicts stale or excess exports (see evict_exports).
+    """
+    path = export_cache_path(key, fmt, directory)
+    if os.path.exists(path):
+        os.utime(path)
+    else:
+        write_export(chunks(), fmt, path, columns)
+    evict_exports(directory, max_bytes, max_age, keep=[path])
+    return path
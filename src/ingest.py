@@ -0,0 +1,191 @@
+import gzip
+import io
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    from .stats_cube import StatsCube
+except ImportError:
+    from stats_cube import StatsCube
+
+# Only the columns the report and dashboard actually read
+REPORT_COLUMNS = [
+    'date', 'username', 'displayname', 'content', 'word_count',
+    'like_count', 'retweet_count', 'reply_count', 'industry'
+]
+STRING_COLUMNS = ['username', 'displayname', 'content', 'industry']
+COUNT_COLUMNS = ['word_count', 'like_count', 'retweet_count', 'reply_count']
+
+CSV_DTYPES = {**{col: 'str' for col in STRING_COLUMNS}, **{col: 'float64' for col in COUNT_COLUMNS}}
+
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+PARQUET_MAGIC = b'PAR1'
+
+ProgressCallback = Callable[[float, int], None]
+
+
+class _CountingReader(io.RawIOBase):
+    """Read-only wrapper that tracks how many raw (compressed) bytes were consumed"""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.bytes_read = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.raw.read(len(buffer))
+        n = len(data)
+        buffer[:n] = data
+        self.bytes_read += n
+        return n
+
+
+def _total_size(raw) -> int:
+    position = raw.tell()
+    raw.seek(0, io.SEEK_END)
+    size = raw.tell()
+    raw.seek(position)
+    return size
+
+
+def detect_format(raw, name: str = "") -> str:
+    """Return 'parquet', 'csv.gz', 'csv.zst' or 'csv' from magic bytes (falling back to the name)"""
+    position = raw.tell()
+    head = raw.read(4)
+    raw.seek(position)
+
+    if head.startswith(PARQUET_MAGIC) or name.lower().endswith(('.parquet', '.pq')):
+        return 'parquet'
+    if head.startswith(GZIP_MAGIC):
+        return 'csv.gz'
+    if head.startswith(ZSTD_MAGIC):
+        return 'csv.zst'
+    return 'csv'
+
+
+def prepare_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Parse dates, derive word counts and date parts for one chunk; blank or bad dates become NaT"""
+    if 'date' in chunk.columns and not pd.api.types.is_datetime64_any_dtype(chunk['date']):
+        chunk['date'] = pd.to_datetime(chunk['date'], errors='coerce')
+
+    if 'word_count' not in chunk.columns and 'content' in chunk.columns:
+        chunk['word_count'] = chunk['content'].str.split().str.len().fillna(0).astype('int64')
+
+    for col in COUNT_COLUMNS:
+        if col in chunk.columns and chunk[col].dtype.kind == 'f' and not chunk[col].isna().any():
+            chunk[col] = chunk[col].astype('int64')
+
+    if 'date' in chunk.columns:
+        chunk['year'] = chunk['date'].dt.year
+        chunk['month'] = chunk['date'].dt.month
+
+    return chunk
+
+
+def _iter_csv(raw, compression: str, chunksize: int, progress: Optional[ProgressCallback]) -> Iterator[pd.DataFrame]:
+    total = max(_total_size(raw) - raw.tell(), 1)
+    counter = _CountingReader(raw)
+    buffered = io.BufferedReader(counter, buffer_size=1 << 20)
+
+    if compression == 'csv.gz':
+        stream = gzip.GzipFile(fileobj=buffered)
+    elif compression == 'csv.zst':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("Reading .zst uploads requires the 'zstandard' package")
+        stream = zstandard.ZstdDecompressor().stream_reader(buffered)
+    else:
+        stream = buffered
+
+    rows = 0
+    reader = pd.read_csv(
+        stream,
+        usecols=lambda col: col in REPORT_COLUMNS,
+        dtype=CSV_DTYPES,
+        chunksize=chunksize
+    )
+    for chunk in reader:
+        rows += len(chunk)
+        yield prepare_chunk(chunk)
+        if progress is not None:
+            progress(min(counter.bytes_read / total, 1.0), rows)
+
+
+def _iter_parquet(raw, chunksize: int, progress: Optional[ProgressCallback]) -> Iterator[pd.DataFrame]:
+    import pyarrow.parquet as pq
+
+    parquet = pq.ParquetFile(raw)
+    columns = [col for col in REPORT_COLUMNS if col in parquet.schema_arrow.names]
+    total = max(parquet.metadata.num_rows, 1)
+
+    rows = 0
+    for batch in parquet.iter_batches(batch_size=chunksize, columns=columns):
+        chunk = batch.to_pandas()
+        rows += len(chunk)
+        yield prepare_chunk(chunk)
+        if progress is not None:
+            progress(min(rows / total, 1.0), rows)
+
+
+def iter_tweet_chunks(source, name: str = "", chunksize: int = 200_000,
+                      progress: Optional[ProgressCallback] = None) -> Iterator[pd.DataFrame]:
+    """
+    Stream prepared chunks from a CSV, gzip/zstd-compressed CSV or Parquet
+    source (a path or a binary file-like object such as a Streamlit upload).
+    """
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            yield from iter_tweet_chunks(f, name or source, chunksize, progress)
+        return
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+
+    fmt = detect_format(source, name)
+    if fmt == 'parquet':
+        yield from _iter_parquet(source, chunksize, progress)
+    else:
+        yield from _iter_csv(source, fmt, chunksize, progress)
+
+
+def _finalize_counts(df: pd.DataFrame) -> pd.DataFrame:
+    """Chunks without nulls came back as int64; restore int64 where the whole column allows it"""
+    for col in COUNT_COLUMNS:
+        if col in df.columns and df[col].dtype.kind == 'f' and not df[col].isna().any():
+            df[col] = df[col].astype('int64')
+    return df
+
+
+def ingest_tweets(source, name: str = "", chunksize: int = 200_000,
+                  progress: Optional[ProgressCallback] = None) -> Tuple[pd.DataFrame, StatsCube]:
+    """
+    Read a tweet file chunk by chunk, folding each chunk into a StatsCube as it
+    arrives. Returns the concatenated frame and the merged cube. Rows whose
+    date is blank or unparseable stay in the frame but are left out of the
+    cube; their number is in df.attrs['missing_dates'].
+    """
+    chunks: List[pd.DataFrame] = []
+    cube = StatsCube.empty()
+
+    missing_dates = 0
+
+    for chunk in iter_tweet_chunks(source, name, chunksize, progress):
+        if 'date' in chunk.columns:
+            dated = chunk['date'].notna()
+            missing_dates += int(len(chunk) - dated.sum())
+            cube = cube.merge(StatsCube.from_frame(chunk[dated] if not dated.all() else chunk))
+        else:
+            cube = cube.merge(StatsCube.from_frame(chunk))
+        chunks.append(chunk)
+
+    if not chunks:
+        return pd.DataFrame(columns=REPORT_COLUMNS), cube
+
+    df = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+    df = _finalize_counts(df)
+    df.attrs['missing_dates'] = missing_dates
+    return df, cube
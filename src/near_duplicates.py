@@ -0,0 +1,175 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+WORD_PATTERN = r"\w+"
+
+NUM_PERM = 64
+BANDS = 16
+THRESHOLD = 0.7
+
+_MASK32 = np.uint64(0xFFFFFFFF)
+
+
+def _hash_params(num_perm: int, seed: int) -> tuple:
+    """Odd 64-bit multipliers and offsets of the multiply-shift hash family"""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+    return a, b
+
+
+def minhash_signatures(texts: pd.Series, num_perm: int = NUM_PERM, seed: int = 1) -> np.ndarray:
+    """
+    MinHash signatures (len(texts), num_perm) of each text's word-bigram
+    shingles (the single word for one-word texts). Texts without words get
+    the all-max signature and should not be compared.
+    """
+    words = texts.str.lower().str.findall(WORD_PATTERN).explode().dropna()
+    owners = words.index.to_numpy(np.int64)
+    hashes = pd.util.hash_array(words.to_numpy(object)) if len(words) else np.zeros(0, dtype=np.uint64)
+
+    # Bigram hashes within each text; texts with a single word keep that word
+    same = owners[1:] == owners[:-1]
+    bigrams = hashes[:-1][same] * np.uint64(0x9E3779B97F4A7C15) ^ hashes[1:][same]
+    single = np.bincount(owners, minlength=len(texts)) == 1
+    shingles = np.concatenate([bigrams, hashes[single[owners]]])
+    shingle_owners = np.concatenate([owners[1:][same], owners[single[owners]]])
+    order = np.argsort(shingle_owners, kind='stable')
+    shingles, shingle_owners = (shingles[order] & _MASK32), shingle_owners[order]
+
+    signatures = np.full((len(texts), num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+    if len(shingles):
+        a, b = _hash_params(num_perm, seed)
+        starts = np.flatnonzero(np.r_[True, shingle_owners[1:] != shingle_owners[:-1]])
+        with np.errstate(over='ignore'):
+            values = ((a[:, None] * shingles[None, :] + b[:, None]) >> np.uint64(32)).astype(np.uint32)
+        signatures[shingle_owners[starts]] = np.minimum.reduceat(values, starts, axis=1).T
+    return signatures
+
+
+def _connected_labels(n: int, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Smallest node id of each node's connected component, by min-label propagation"""
+    labels = np.arange(n)
+    while True:
+        previous = labels
+        labels = labels.copy()
+        np.minimum.at(labels, left, labels[right])
+        np.minimum.at(labels, right, labels[left])
+        labels = labels[labels]
+        if np.array_equal(labels, previous):
+            return labels
+
+
+class NearDuplicates:
+    """
+    Near-duplicate clusters of a text column. `labels` gives, for every row,
+    the position of the first row of its cluster; rows that are their own
+    label are the representatives kept by `keep_mask`.
+    """
+
+    def __init__(self, labels: np.ndarray, stats: Dict):
+        self.labels = labels
+        self.stats = stats
+
+    @property
+    def keep_mask(self) -> np.ndarray:
+        return self.labels == np.arange(len(self.labels))
+
+    @property
+    def duplicate_rows(self) -> int:
+        return int(len(self.labels) - self.keep_mask.sum())
+
+    def clusters(self, min_size: int = 2) -> pd.DataFrame:
+        """Representative row position and size of each cluster with at least `min_size` rows"""
+        sizes = np.bincount(self.labels, minlength=len(self.labels))
+        representatives = np.flatnonzero(sizes >= min_size)
+        return (pd.DataFrame({'representative': representatives, 'size': sizes[representatives]})
+                .sort_values('size', ascending=False, kind='stable').reset_index(drop=True))
+
+    def to_dict(self) -> Dict:
+        return {**self.stats, 'duplicate_rows': self.duplicate_rows,
+                'clusters': int((np.bincount(self.labels, minlength=len(self.labels)) >= 2).sum())}
+
+
+def find_near_duplicates(contents: pd.Series, threshold: float = THRESHOLD, num_perm: int = NUM_PERM,
+                         bands: int = BANDS, chunk_rows: int = 10_000, workers: int = 1,
+                         seed: int = 1) -> NearDuplicates:
+    """
+    Cluster rows whose texts have an estimated word-bigram Jaccard similarity
+    of at least `threshold`, without comparing all pairs.
+
+    Identical texts are collapsed first, so each distinct text is signed once.
+    MinHash signatures are computed in chunks of `chunk_rows` distinct texts
+    (across `workers` processes when > 1) and split into `bands` LSH bands;
+    texts sharing a band bucket become candidates, each candidate is checked
+    against its bucket's first text, and confirmed pairs are merged into
+    connected components. With r = num_perm / bands rows per band, a pair of
+    similarity s is a candidate with probability 1 - (1 - s^r)^bands.
+    """
+    if num_perm % bands:
+        raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+    started = time.perf_counter()
+    codes, texts = pd.factorize(contents.fillna('').astype(str))
+    texts = pd.Series(texts, dtype=object)
+
+    chunks = [texts.iloc[i:i + chunk_rows].reset_index(drop=True) for i in range(0, len(texts), chunk_rows)]
+    if workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(minhash_signatures, chunks, [num_perm] * len(chunks), [seed] * len(chunks)))
+    else:
+        parts = [minhash_signatures(chunk, num_perm, seed) for chunk in chunks]
+    signatures = np.vstack(parts) if parts else np.zeros((0, num_perm), dtype=np.uint32)
+
+    # Texts without words never match anything (their signatures are all equal)
+    has_words = (signatures != np.iinfo(np.uint32).max).any(axis=1)
+    candidates = np.flatnonzero(has_words)
+    rows = num_perm // bands
+    left, right = [], []
+    for band in range(bands):
+        block = np.ascontiguousarray(signatures[candidates, band * rows:(band + 1) * rows])
+        buckets = block.view(np.dtype((np.void, block.dtype.itemsize * rows))).ravel()
+        _, bucket, counts = np.unique(buckets, return_inverse=True, return_counts=True)
+        shared = counts[bucket] > 1
+        if not shared.any():
+            continue
+        members = candidates[shared]
+        first = np.full(len(counts), len(texts), dtype=np.int64)
+        np.minimum.at(first, bucket[shared], members)
+        heads = first[bucket[shared]]
+        pair = heads != members
+        left.append(heads[pair])
+        right.append(members[pair])
+
+    if left:
+        left, right = np.concatenate(left), np.concatenate(right)
+        pairs = np.unique(np.stack([left, right], axis=1), axis=0)
+        similarity = (signatures[pairs[:, 0]] == signatures[pairs[:, 1]]).mean(axis=1)
+        confirmed = pairs[similarity >= threshold]
+        text_labels = _connected_labels(len(texts), confirmed[:, 0], confirmed[:, 1])
+    else:
+        text_labels = np.arange(len(texts))
+
+    # Map text clusters back to rows: every row points at the first row of its cluster
+    row_cluster = text_labels[codes] if len(codes) else np.zeros(0, dtype=np.int64)
+    first_row = np.full(len(texts), len(codes), dtype=np.int64)
+    np.minimum.at(first_row, row_cluster, np.arange(len(codes)))
+    labels = first_row[row_cluster]
+    # Missing, empty and punctuation-only texts say nothing about each other: keep every such row
+    wordless = ~has_words[codes] if len(codes) else np.zeros(0, dtype=bool)
+    labels[wordless] = np.flatnonzero(wordless)
+
+    seconds = time.perf_counter() - started
+    stats = {
+        'rows': int(len(codes)),
+        'distinct_texts': int(len(texts)),
+        'threshold': threshold,
+        'num_perm': num_perm,
+        'bands': bands,
+        'seconds': round(seconds, 4),
+        'rows_per_second': round(len(codes) / seconds, 1) if seconds > 0 else None
+    }
+    return NearDuplicates(labels, stats)
@@ -0,0 +1,180 @@
+import json
+import threading
+import time
+import tracemalloc
+from functools import wraps
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+
+class _NullStage:
+    """No-op context manager handed out when tracing is disabled"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set_rows(self, rows: int):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """Context manager recording one named stage into a ReportTrace"""
+
+    def __init__(self, trace: 'ReportTrace', name: str, rows: Optional[int]):
+        self.trace = trace
+        self.name = name
+        self.rows = rows
+
+    def set_rows(self, rows: int):
+        """Update the row count once it is known inside the stage"""
+        self.rows = int(rows)
+
+    def __enter__(self):
+        self.trace._enter(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.trace._exit(self, failed=exc_type is not None)
+        return False
+
+
+class ReportTrace:
+    """
+    Structured per-stage trace of wall time, rows processed and peak allocations.
+    Pass an instance to TweetStatisticsCalculator / TwitterDataCollector to collect
+    stages; leave it out (or use NULL_TRACE) and instrumentation is a no-op.
+    Stages may be recorded from several threads (e.g. the background exact
+    report); each thread nests its own stages.
+    """
+
+    enabled = True
+
+    def __init__(self, track_memory: bool = True):
+        self.track_memory = track_memory
+        self.stages: List[Dict] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._owns_tracemalloc = False
+
+    @property
+    def _stack(self) -> List[Dict]:
+        """Open stages of the calling thread"""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def stage(self, name: str, rows: Optional[int] = None) -> _Stage:
+        """Open a named stage; use as a context manager"""
+        return _Stage(self, name, rows)
+
+    def _enter(self, stage: _Stage):
+        frame = {'stage': stage, 'start': time.perf_counter(), 'mem_start': 0, 'peak_seen': 0}
+
+        if self.track_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_tracemalloc = True
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                parent = self._stack[-1]
+                parent['peak_seen'] = max(parent['peak_seen'], peak)
+            tracemalloc.reset_peak()
+            frame['mem_start'] = current
+
+        self._stack.append(frame)
+
+    def _exit(self, stage: _Stage, failed: bool = False):
+        frame = self._stack.pop()
+        elapsed = time.perf_counter() - frame['start']
+
+        peak_bytes = None
+        if self.track_memory and tracemalloc.is_tracing():
+            _, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, frame['peak_seen'])
+            peak_bytes = max(0, peak - frame['mem_start'])
+            if self._stack:
+                parent = self._stack[-1]
+                parent['peak_seen'] = max(parent['peak_seen'], peak)
+            elif self._owns_tracemalloc:
+                tracemalloc.stop()
+                self._owns_tracemalloc = False
+
+        record = {
+            'stage': stage.name,
+            'depth': len(self._stack),
+            'seconds': round(elapsed, 6),
+            'rows': stage.rows,
+            'rows_per_second': round(stage.rows / elapsed, 1) if stage.rows and elapsed > 0 else None,
+            'peak_mb': round(peak_bytes / 1024 ** 2, 3) if peak_bytes is not None else None,
+            'failed': failed
+        }
+        with self._lock:
+            self.stages.append(record)
+
+    def clear(self):
+        """Drop recorded stages"""
+        with self._lock:
+            self.stages = []
+
+    def _snapshot(self) -> List[Dict]:
+        with self._lock:
+            return list(self.stages)
+
+    def total_seconds(self) -> float:
+        """Wall time of all top-level stages"""
+        return round(sum(s['seconds'] for s in self._snapshot() if s['depth'] == 0), 6)
+
+    def to_dict(self) -> Dict:
+        return {
+            'total_seconds': self.total_seconds(),
+            'track_memory': self.track_memory,
+            'stages': self._snapshot()
+        }
+
+    def to_json(self, indent: Optional[int] = None) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Stages as a DataFrame, in completion order"""
+        frame = pd.DataFrame(self._snapshot(), columns=['stage', 'depth', 'seconds', 'rows',
+                                                   'rows_per_second', 'peak_mb', 'failed'])
+        frame['rows'] = frame['rows'].astype('Int64')
+        return frame
+
+
+class _NullTrace:
+    """Disabled trace: every stage is the same shared no-op context manager"""
+
+    enabled = False
+    stages: List[Dict] = []
+
+    def stage(self, name: str, rows: Optional[int] = None) -> _NullStage:
+        return _NULL_STAGE
+
+
+NULL_TRACE = _NullTrace()
+
+
+def traced(name: str, rows: Optional[Callable] = None) -> Callable:
+    """
+    Decorate a method so its call is recorded as a stage on `self.trace`.
+    `rows` is an optional callable taking `self` and returning the row count.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            trace = self.trace
+            if not trace.enabled:
+                return fn(self, *args, **kwargs)
+            with trace.stage(name, rows(self) if rows is not None else None):
+                return fn(self, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,219 @@
+import io
+import json
+import math
+from datetime import date, datetime
+from typing import Any, Dict, Union
+
+import numpy as np
+import pandas as pd
+
+REPORT_FORMAT = "tweet-report"
+REPORT_VERSION = 1
+
+_META_KEY = "__meta__"
+
+
+def _to_native(value: Any) -> Any:
+    """Convert a scalar or nested container into plain JSON-safe Python values"""
+    if isinstance(value, dict):
+        return {str(k): _to_native(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_native(v) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float):
+        return None if math.isnan(value) or math.isinf(value) else value
+    if isinstance(value, (pd.Timestamp, datetime, date)):
+        return value.isoformat()
+    if isinstance(value, pd.Period):
+        return str(value)
+    if value is pd.NaT or value is pd.NA:
+        return None
+    return value
+
+
+def _column_values(series: pd.Series) -> list:
+    """Convert a column to a list of JSON-safe values in one vectorized pass"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        values = series.dt.strftime('%Y-%m-%dT%H:%M:%S')
+    elif isinstance(series.dtype, pd.PeriodDtype):
+        values = series.astype(str)
+    else:
+        values = series
+
+    if values.isna().any():
+        return values.astype(object).where(values.notna(), None).tolist()
+    return values.tolist()
+
+
+def _split_sections(report: Dict) -> tuple:
+    """Separate DataFrame sections from scalar/nested sections"""
+    tables = {}
+    scalars = {}
+    for key, value in report.items():
+        if isinstance(value, pd.DataFrame):
+            tables[key] = value
+        else:
+            scalars[key] = _to_native(value)
+    return scalars, tables
+
+
+def _restore_column(values: Any, dtype: str) -> pd.Series:
+    """Rebuild a column from stored values and its original dtype name"""
+    series = pd.Series(values)
+    if dtype.startswith('datetime64'):
+        return pd.to_datetime(series)
+    if dtype in ('object', 'str', 'string'):
+        return series.astype(object) if len(series) else series
+    try:
+        return series.astype(dtype)
+    except (TypeError, ValueError):
+        return series
+
+
+def dumps_report(report: Dict) -> str:
+    """
+    Serialize a report to compact JSON.
+    DataFrame sections are written column by column instead of as row records.
+    """
+    scalars, tables = _split_sections(report)
+
+    table_docs = {}
+    for name, frame in tables.items():
+        table_docs[name] = {
+            'columns': [str(c) for c in frame.columns],
+            'dtypes': [str(t) for t in frame.dtypes],
+            'data': [_column_values(frame[c]) for c in frame.columns]
+        }
+
+    doc = {
+        'format': REPORT_FORMAT,
+        'version': REPORT_VERSION,
+        'sections': scalars,
+        'tables': table_docs
+    }
+    return json.dumps(doc, separators=(',', ':'), ensure_ascii=False, allow_nan=False)
+
+
+def loads_report(text: Union[str, bytes]) -> Dict:
+    """Load a JSON report written by dumps_report, restoring tables as DataFrames"""
+    doc = json.loads(text)
+    if doc.get('format') != REPORT_FORMAT:
+        raise ValueError("Not a tweet statistics report")
+
+    report = dict(doc.get('sections', {}))
+    for name, table in doc.get('tables', {}).items():
+        report[name] = pd.DataFrame({
+            col: _restore_column(values, dtype)
+            for col, dtype, values in zip(table['columns'], table['dtypes'], table['data'])
+        }, columns=table['columns'])
+    return report
+
+
+def write_report_json(report: Dict, path: str) -> None:
+    """Write a report to a compact JSON file"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(dumps_report(report))
+
+
+def read_report_json(path: str) -> Dict:
+    """Read a report from a JSON file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return loads_report(f.read())
+
+
+def _column_array(series: pd.Series) -> tuple:
+    """Convert a column to a numpy array that can be stored without pickling"""
+    mask = series.isna().to_numpy()
+    has_nulls = bool(mask.any())
+
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.to_numpy(dtype='datetime64[ns]'), None
+    if pd.api.types.is_bool_dtype(series) and not has_nulls:
+        return series.to_numpy(dtype=bool), None
+    if pd.api.types.is_numeric_dtype(series):
+        if has_nulls and not pd.api.types.is_float_dtype(series):
+            return series.to_numpy(dtype='float64', na_value=np.nan), None
+        return series.to_numpy(), None
+
+    values = series.astype(object).where(~mask, '').astype(str).to_numpy(dtype=str)
+    return values, mask if has_nulls else None
+
+
+def dump_report_binary(report: Dict) -> bytes:
+    """
+    Serialize a report to a binary columnar container (numpy .npz).
+    Each table column is stored as its own typed array; scalar sections
+    travel as a small JSON header.
+    """
+    scalars, tables = _split_sections(report)
+
+    arrays = {}
+    schema = {}
+    for t_idx, (name, frame) in enumerate(tables.items()):
+        columns = []
+        for c_idx, col in enumerate(frame.columns):
+            key = f"t{t_idx}_c{c_idx}"
+            values, mask = _column_array(frame[col])
+            arrays[key] = values
+            if mask is not None:
+                arrays[key + "_null"] = mask
+            columns.append({
+                'name': str(col),
+                'key': key,
+                'dtype': str(frame[col].dtype),
+                'nullable': mask is not None
+            })
+        schema[name] = {'rows': int(len(frame)), 'columns': columns}
+
+    meta = {
+        'format': REPORT_FORMAT,
+        'version': REPORT_VERSION,
+        'sections': scalars,
+        'tables': schema
+    }
+    arrays[_META_KEY] = np.frombuffer(
+        json.dumps(meta, separators=(',', ':'), allow_nan=False).encode('utf-8'),
+        dtype=np.uint8
+    )
+
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+    return buffer.getvalue()
+
+
+def load_report_binary(data: Union[bytes, str]) -> Dict:
+    """Load a report written by dump_report_binary from bytes or a file path"""
+    source = io.BytesIO(data) if isinstance(data, (bytes, bytearray)) else data
+
+    with np.load(source, allow_pickle=False) as archive:
+        meta = json.loads(archive[_META_KEY].tobytes().decode('utf-8'))
+        if meta.get('format') != REPORT_FORMAT:
+            raise ValueError("Not a tweet statistics report")
+
+        report = dict(meta.get('sections', {}))
+        for name, table in meta.get('tables', {}).items():
+            columns = {}
+            for col in table['columns']:
+                values = archive[col['key']]
+                if values.dtype.kind == 'U':
+                    series = pd.Series(values, dtype=object)
+                    if col['nullable']:
+                        series = series.where(~archive[col['key'] + "_null"], None)
+                else:
+                    series = _restore_column(values, col['dtype'])
+                columns[col['name']] = series
+            report[name] = pd.DataFrame(columns, columns=[c['name'] for c in table['columns']])
+
+    return report
+
+
+def write_report_binary(report: Dict, path: str) -> None:
+    """Write a report to a binary columnar file"""
+    with open(path, 'wb') as f:
+        f.write(dump_report_binary(report))
+
+
+def read_report_binary(path: str) -> Dict:
+    """Read a report from a binary columnar file"""
+    return load_report_binary(path)
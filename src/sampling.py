@@ -0,0 +1,212 @@
+import threading
+from concurrent.futures import CancelledError, Executor, Future
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+STRATA = ['username', 'year']
+
+
+def _stratify(df: pd.DataFrame, columns: List[str]) -> tuple:
+    """Stratum code of every row and the keys of each stratum"""
+    if not columns or not len(df):
+        return np.zeros(len(df), dtype=np.int64), pd.DataFrame(index=range(1))
+    grouped = df.groupby(columns, sort=True, dropna=False, observed=True)
+    return grouped.ngroup().to_numpy(np.int64), grouped.size().index.to_frame(index=False)
+
+
+class StratifiedSample:
+    """
+    Stratified random sample drawn without replacement, never larger than
+    `sample_rows`. Every stratum keeps at least `min_per_stratum` rows and the
+    rest of the budget is allocated in proportion to stratum size; when the
+    minimums alone would exceed the budget, the last strata column is dropped
+    ((username, year) -> username -> a simple random sample) until they fit.
+
+    Means and totals over any grouping of the sampled columns (overall, per
+    user, per year) use the stratified domain estimator with its finite-
+    population-corrected, linearized variance, and t intervals with (sampled
+    rows - strata) degrees of freedom per domain. Domains that are not unions
+    of strata (per-user estimates after falling back to a simple random
+    sample, say) have estimated sizes, are missing when no row was sampled and
+    have no interval when sampled with a single row per stratum.
+    """
+
+    def __init__(self, frame: pd.DataFrame, codes: np.ndarray, keys: pd.DataFrame,
+                 population: np.ndarray, sampled: np.ndarray):
+        self.frame = frame
+        self.codes = codes
+        self.keys = keys
+        self.population = population
+        self.sampled = sampled
+
+    @classmethod
+    def draw(cls, df: pd.DataFrame, strata: Sequence[str] = STRATA, sample_rows: int = 50_000,
+             min_per_stratum: int = 2, seed: int = 0) -> 'StratifiedSample':
+        strata = [column for column in strata if column in df.columns]
+        total = len(df)
+        codes, keys = _stratify(df, strata)
+        while strata and sample_rows < total and len(keys) * min_per_stratum > sample_rows:
+            strata = strata[:-1]
+            codes, keys = _stratify(df, strata)
+        population = np.bincount(codes, minlength=len(keys))
+
+        if sample_rows >= total:
+            allocation = population
+        else:
+            base = np.minimum(population, min(min_per_stratum, sample_rows // len(keys)))
+            spare = population - base
+            share = spare * (max(sample_rows - int(base.sum()), 0) / max(int(spare.sum()), 1))
+            extra = np.floor(share).astype(np.int64)
+            # Rows lost to rounding go to the strata with the largest remainders
+            left = min(max(sample_rows - int(base.sum()) - int(extra.sum()), 0), int((spare > extra).sum()))
+            if left:
+                remainders = np.where(spare > extra, share - extra, -1.0)
+                extra[np.argpartition(-remainders, left - 1)[:left]] += 1
+            allocation = base + extra
+
+        # Shuffle within strata by sorting on (stratum, random key), then keep each stratum's head
+        rng = np.random.default_rng(seed)
+        order = np.lexsort((rng.random(total), codes))
+        starts = np.concatenate([[0], np.cumsum(population)[:-1]])
+        rank = np.arange(total) - np.repeat(starts, population)
+        keep = np.sort(order[rank < allocation[codes[order]]])
+
+        return cls(df.iloc[keep], codes[keep], keys, population, allocation)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @property
+    def exact(self) -> bool:
+        return bool(np.array_equal(self.population, self.sampled))
+
+    @property
+    def weights(self) -> np.ndarray:
+        """Population rows represented by each sampled row"""
+        return (self.population / np.maximum(self.sampled, 1))[self.codes]
+
+    def _domains(self, by: Optional[List[str]]) -> tuple:
+        if not by:
+            return np.zeros(len(self.frame), dtype=np.int64), pd.DataFrame(index=range(1))
+        missing = [column for column in by if column not in self.frame.columns]
+        if missing:
+            raise ValueError(f"Estimates can only be grouped by sampled columns, not {missing}")
+        return _stratify(self.frame, list(by))
+
+    def _domain_totals(self, values: np.ndarray, domain: np.ndarray, n_domains: int) -> tuple:
+        """
+        Estimated domain totals of `values` and their variances, plus the
+        (stratum, domain) cells each domain was sampled in
+        """
+        n = self.sampled.astype(np.float64)
+        big_n = self.population.astype(np.float64)
+        cells, cell = np.unique(self.codes * n_domains + domain, return_inverse=True)
+        stratum, cell_domain = cells // n_domains, cells % n_domains
+
+        # Per stratum, values are zero outside the domain: only the sums over the cell are needed
+        sums = np.bincount(cell, values, minlength=len(cells))
+        sumsq = np.bincount(cell, values ** 2, minlength=len(cells))
+        n_h, big_n_h = n[stratum], big_n[stratum]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variances = np.where(n_h > 1, (sumsq - sums ** 2 / n_h) / (n_h - 1), 0.0).clip(min=0)
+            cell_var = big_n_h ** 2 * (1 - n_h / big_n_h) * variances / n_h
+        total = np.bincount(cell_domain, big_n_h / n_h * sums, minlength=n_domains)
+        var = np.bincount(cell_domain, cell_var, minlength=n_domains)
+        return total, var, cell_domain
+
+    @staticmethod
+    def _frame(keys: pd.DataFrame, estimate: np.ndarray, se: np.ndarray, size: np.ndarray,
+               dof: np.ndarray, confidence: float) -> pd.DataFrame:
+        from scipy.special import stdtrit
+
+        # A domain sampled with no more rows than strata has no variance estimate
+        t = np.where(dof > 0, stdtrit(np.maximum(dof, 1), 0.5 + confidence / 2), np.nan)
+        out = keys.copy()
+        out['estimate'] = estimate
+        out['se'] = se
+        out['ci_low'] = estimate - t * se
+        out['ci_high'] = estimate + t * se
+        out['population'] = np.round(size).astype(np.int64)
+        return out
+
+    def _estimate(self, column: str, by: Optional[List[str]], confidence: float, mean: bool) -> pd.DataFrame:
+        values = self.frame[column].to_numpy(np.float64)
+        domain, keys = self._domains(by)
+        k = len(keys)
+        size, _, cells = self._domain_totals(np.ones(len(values)), domain, k)
+        total, var, _ = self._domain_totals(values, domain, k)
+        dof = np.bincount(domain, minlength=k) - np.bincount(cells, minlength=k)
+        if mean:
+            # Ratio estimator; its variance is that of the total of residuals from the domain mean
+            with np.errstate(divide='ignore', invalid='ignore'):
+                estimate = total / size
+                _, var, _ = self._domain_totals(values - estimate[domain], domain, k)
+                se = np.sqrt(var) / size
+        else:
+            estimate, se = total, np.sqrt(var)
+        return self._frame(keys, estimate, se, size, dof, confidence)
+
+    def estimate_mean(self, column: str, by: Optional[List[str]] = None,
+                      confidence: float = 0.95) -> pd.DataFrame:
+        """Mean of `column` per domain (all rows when `by` is None) with a t interval"""
+        return self._estimate(column, by, confidence, mean=True)
+
+    def estimate_total(self, column: str, by: Optional[List[str]] = None,
+                       confidence: float = 0.95) -> pd.DataFrame:
+        """Sum of `column` per domain with a t interval"""
+        return self._estimate(column, by, confidence, mean=False)
+
+
+class ProgressiveReport:
+    """
+    An approximate report available immediately and the exact report being
+    computed in the background. `current()` switches to the exact report as
+    soon as it is ready (or stays approximate if computing it failed).
+    """
+
+    def __init__(self, approximate: Dict, exact: Future):
+        self.approximate = approximate
+        self.exact = exact
+
+    @classmethod
+    def start(cls, approximate: Dict, compute_exact: Callable[[], Dict],
+              executor: Optional[Executor] = None) -> 'ProgressiveReport':
+        if 'approximate' not in approximate:
+            exact: Future = Future()
+            exact.set_result(approximate)
+        elif executor is not None:
+            exact = executor.submit(compute_exact)
+        else:
+            exact = Future()
+
+            def run():
+                if not exact.set_running_or_notify_cancel():
+                    return
+                try:
+                    exact.set_result(compute_exact())
+                except BaseException as e:
+                    exact.set_exception(e)
+
+            threading.Thread(target=run, name="exact-report", daemon=True).start()
+        return cls(approximate, exact)
+
+    def done(self) -> bool:
+        return self.exact.done()
+
+    def error(self) -> Optional[BaseException]:
+        """Why the exact report is unavailable once computing it failed or was cancelled, else None"""
+        if not self.exact.done():
+            return None
+        if self.exact.cancelled():
+            return CancelledError()
+        return self.exact.exception()
+
+    def current(self) -> Dict:
+        if self.exact.done() and not self.exact.cancelled() and self.exact.exception() is None:
+            return self.exact.result()
+        return self.approximate
+
+    def result(self, timeout: Optional[float] = None) -> Dict:
+        return self.exact.result(timeout)
@@ -0,0 +1,367 @@
+"""
+Local HTTP/JSON service for report sections.
+
+    python -m src.stats_api --sample --dataset archive=data/archive.parquet --port 8765 --data-dir data
+
+    GET  /health
+    GET  /datasets
+    POST /datasets                      {"name": "archive", "path": "data/archive.csv.gz"}
+    GET  /datasets/<name>/<section>?username=NASA&year=2022&industry=Tech
+    GET  /metrics
+
+Sections: report, overall, yearly, monthly, users, trends, change_points,
+user_change_points, vocabulary, top_terms, top_hashtags, distribution, histogram,
+engagement, cadence. Responses use the columnar report JSON from report_io,
+so clients can decode them with loads_report. POST /datasets only accepts
+files inside the service's data directory (--data-dir).
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+try:
+    from .calculate_stats import TweetStatisticsCalculator
+    from .collect_tweets import get_sample_data
+    from .ingest import ingest_tweets
+    from .report_io import dumps_report
+except ImportError:
+    from calculate_stats import TweetStatisticsCalculator
+    from collect_tweets import get_sample_data
+    from ingest import ingest_tweets
+    from report_io import dumps_report
+
+SECTIONS: Dict[str, Callable[[TweetStatisticsCalculator], object]] = {
+    'report': lambda calc: calc.generate_report_sections(),
+    'overall': lambda calc: calc._overall_stats(),
+    'yearly': lambda calc: calc.yearly_summary_stats(),
+    'monthly': lambda calc: calc.monthly_summary_stats(),
+    'users': lambda calc: calc.user_comparison_stats(),
+    'trends': lambda calc: calc.detect_trends(),
+    'change_points': lambda calc: calc.change_points(),
+    'user_change_points': lambda calc: calc.change_points('username'),
+    'distribution': lambda calc: calc.get_distribution_stats(),
+    'histogram': lambda calc: calc.distribution_summary().to_dict(),
+    'engagement': lambda calc: calc.get_engagement_correlation(),
+    'cadence': lambda calc: calc.posting_cadence().to_dict(),
+    'vocabulary': lambda calc: calc.vocabulary().summary(),
+    'top_terms': lambda calc: calc.vocabulary().top('terms', k=100),
+    'top_hashtags': lambda calc: calc.vocabulary().top('hashtags', k=100)
+}
+
+FILTERS = ('username', 'year', 'industry')
+
+
+class NotFound(KeyError):
+    pass
+
+
+class Forbidden(PermissionError):
+    pass
+
+
+class _LRU:
+    """Small thread-safe LRU map"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._items: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._items:
+                return None
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def discard(self, predicate: Callable) -> None:
+        with self._lock:
+            for key in [key for key in self._items if predicate(key)]:
+                del self._items[key]
+
+
+class StatsService:
+    """
+    Computes report sections for registered datasets. Calculators stay warm
+    per (dataset, filters) and section payloads are cached; computation runs
+    on a worker pool and identical requests that arrive while one is being
+    computed wait for that result instead of starting their own.
+    """
+
+    def __init__(self, workers: int = 4, max_calculators: int = 32, max_results: int = 512,
+                 data_dir: str = "data"):
+        self.data_dir = data_dir
+        self._sources: Dict[str, object] = {}
+        self._datasets: Dict[str, Tuple[pd.DataFrame, object]] = {}
+        self._dataset_locks: Dict[str, threading.Lock] = {}
+        self._calculators = _LRU(max_calculators)
+        self._results = _LRU(max_results)
+        self._inflight: Dict[tuple, Future] = {}
+        self._build_locks: Dict[tuple, threading.Lock] = {}
+        self._lock = threading.RLock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stats")
+        self.counters = {'requests': 0, 'cache_hits': 0, 'coalesced': 0, 'computed': 0, 'errors': 0}
+
+    def register(self, name: str, source) -> None:
+        """Register a dataset from a file path, a DataFrame or a zero-argument loader"""
+        with self._lock:
+            self._sources[name] = source
+            self._datasets.pop(name, None)
+            self._dataset_locks.setdefault(name, threading.Lock())
+        self._calculators.discard(lambda key: key[0] == name)
+        self._results.discard(lambda key: key[0] == name)
+
+    def register_path(self, name: str, path: str) -> None:
+        """Register a client-supplied file path, which must resolve to a file inside data_dir"""
+        root = os.path.realpath(self.data_dir)
+        resolved = os.path.realpath(path)
+        if os.path.commonpath([root, resolved]) != root:
+            raise Forbidden(f"Datasets must be inside the data directory: {path}")
+        if not os.path.isfile(resolved):
+            raise NotFound(f"No such dataset file: {path}")
+        self.register(name, resolved)
+
+    def datasets(self) -> List[Dict]:
+        with self._lock:
+            return [{'name': name, 'loaded': name in self._datasets,
+                     'rows': len(self._datasets[name][0]) if name in self._datasets else None}
+                    for name in sorted(self._sources)]
+
+    def _dataset(self, name: str) -> Tuple[pd.DataFrame, object]:
+        if name not in self._sources:
+            raise NotFound(f"Unknown dataset: {name}")
+        with self._dataset_locks[name]:
+            if name not in self._datasets:
+                source = self._sources[name]
+                if isinstance(source, pd.DataFrame):
+                    loaded = (source, None)
+                elif callable(source):
+                    loaded = (source(), None)
+                else:
+                    loaded = ingest_tweets(source)
+                with self._lock:
+                    self._datasets[name] = loaded
+            return self._datasets[name]
+
+    def _calculator(self, name: str, filters: tuple) -> TweetStatisticsCalculator:
+        key = (name, filters)
+        calculator = self._calculators.get(key)
+        if calculator is not None:
+            return calculator
+
+        # Different sections over the same filters share one calculator build
+        with self._lock:
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+        with build_lock:
+            calculator = self._calculators.get(key)
+            if calculator is None:
+                df, cube = self._dataset(name)
+                for column, value in filters:
+                    if column == 'year' and column not in df.columns and 'date' in df.columns:
+                        values = pd.to_datetime(df['date']).dt.year
+                    elif column in df.columns:
+                        values = df[column]
+                    else:
+                        raise ValueError(f"Dataset {name} has no '{column}' column")
+                    if column == 'year':
+                        # Years are floats ('2022.0' as text) when any date is missing
+                        try:
+                            wanted = float(value)
+                        except ValueError:
+                            raise ValueError(f"Invalid year: {value!r}")
+                        df = df[(pd.to_numeric(values, errors='coerce') == wanted).to_numpy()]
+                    else:
+                        df = df[values.astype(str) == value]
+                calculator = TweetStatisticsCalculator(df, cube=None if filters else cube)
+                self._calculators.put(key, calculator)
+        with self._lock:
+            self._build_locks.pop(key, None)
+        return calculator
+
+    def _compute(self, key: tuple) -> str:
+        name, filters, section = key
+        result = SECTIONS[section](self._calculator(name, filters))
+        # The full report is already a dict of sections; nesting it would hide its tables from dumps_report
+        payload = dumps_report(result if section == 'report' else {section: result})
+        self._results.put(key, payload)
+        with self._lock:
+            self.counters['computed'] += 1
+        return payload
+
+    def section(self, name: str, section: str, filters: Optional[Dict] = None, timeout: float = 300) -> str:
+        """JSON for one report section of a dataset under the given filters"""
+        if section not in SECTIONS:
+            raise NotFound(f"Unknown section: {section}")
+        if name not in self._sources:
+            raise NotFound(f"Unknown dataset: {name}")
+        filters = tuple(sorted((k, str(v)) for k, v in (filters or {}).items() if k in FILTERS and v not in (None, '')))
+        key = (name, filters, section)
+
+        with self._lock:
+            self.counters['requests'] += 1
+        cached = self._results.get(key)
+        if cached is not None:
+            with self._lock:
+                self.counters['cache_hits'] += 1
+            return cached
+
+        with self._lock:
+            future = self._inflight.get(key)
+            cached = self._results.get(key) if future is None else None
+            if cached is not None:
+                self.counters['cache_hits'] += 1
+                return cached
+            if future is None:
+                future = self._pool.submit(self._compute, key)
+                self._inflight[key] = future
+                future.add_done_callback(lambda _, key=key: self._forget(key))
+            else:
+                self.counters['coalesced'] += 1
+        return future.result(timeout=timeout)
+
+    def _forget(self, key: tuple) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            return dict(self.counters, inflight=len(self._inflight))
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class StatsRequestHandler(BaseHTTPRequestHandler):
+    service: StatsService = None
+    quiet = True
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    def _send(self, status: int, body: str) -> None:
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status: int, message: str) -> None:
+        with self.service._lock:
+            self.service.counters['errors'] += 1
+        self._send(status, json.dumps({'error': message}))
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        try:
+            if parts == ['health']:
+                self._send(200, json.dumps({'status': 'ok'}))
+            elif parts == ['metrics']:
+                self._send(200, json.dumps(self.service.metrics()))
+            elif parts == ['datasets']:
+                self._send(200, json.dumps({'datasets': self.service.datasets()}))
+            elif len(parts) == 3 and parts[0] == 'datasets':
+                query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                self._send(200, self.service.section(parts[1], parts[2], query))
+            else:
+                self._error(404, f"Unknown path: {url.path}")
+        except NotFound as e:
+            self._error(404, e.args[0])
+        except ValueError as e:
+            self._error(400, str(e))
+        except Exception as e:
+            self._error(500, str(e))
+
+    def do_POST(self):
+        if urlparse(self.path).path.strip('/') != 'datasets':
+            self._error(404, f"Unknown path: {self.path}")
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(length) or b'{}')
+            name, path = body['name'], body['path']
+        except (ValueError, KeyError):
+            self._error(400, "Expected JSON body with 'name' and 'path'")
+            return
+        if not isinstance(name, str) or not isinstance(path, str):
+            self._error(400, "'name' and 'path' must be strings")
+            return
+        try:
+            self.service.register_path(name, path)
+        except Forbidden as e:
+            self._error(403, e.args[0])
+            return
+        except NotFound as e:
+            self._error(404, e.args[0])
+            return
+        self._send(201, json.dumps({'registered': name}))
+
+
+class _StatsHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops connections under concurrent load
+    request_queue_size = 256
+
+
+def make_server(service: StatsService, host: str = '127.0.0.1', port: int = 8765,
+                quiet: bool = True) -> ThreadingHTTPServer:
+    """HTTP server bound to `service`; call serve_forever() (or run it in a thread)"""
+    handler = type('BoundStatsRequestHandler', (StatsRequestHandler,), {'service': service, 'quiet': quiet})
+    return _StatsHTTPServer((host, port), handler)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve tweet statistics report sections over HTTP/JSON")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', '-w', type=int, default=4, help="Computation worker threads")
+    parser.add_argument('--dataset', action='append', default=[], metavar='NAME=PATH',
+                        help="Register a CSV/Parquet dataset (repeatable)")
+    parser.add_argument('--sample', action='store_true', help="Register the generated sample data as 'sample'")
+    parser.add_argument('--data-dir', default='data',
+                        help="Directory that POST /datasets may register files from (default: data)")
+    parser.add_argument('--verbose', '-v', action='store_true', help="Log every request")
+    args = parser.parse_args(argv)
+
+    service = StatsService(workers=args.workers, data_dir=args.data_dir)
+    if args.sample:
+        service.register('sample', get_sample_data)
+    for item in args.dataset:
+        name, _, path = item.partition('=')
+        if not path:
+            parser.error(f"--dataset expects NAME=PATH, got {item!r}")
+        service.register(name, path)
+
+    server = make_server(service, args.host, args.port, quiet=not args.verbose)
+    print(f"Serving statistics on http://{args.host}:{server.server_address[1]} "
+          f"({len(service.datasets())} dataset(s), {args.workers} workers)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
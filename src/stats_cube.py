@@ -0,0 +1,379 @@
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+DIMENSIONS = ['industry', 'username', 'year', 'month']
+MAX_WORDS = 100
+N_BINS = MAX_WORDS + 1
+
+PRECOMPUTED_LEVELS = [
+    [],
+    ['industry'],
+    ['username'],
+    ['year'],
+    ['industry', 'year'],
+    ['username', 'year'],
+    ['year', 'month'],
+    ['username', 'year', 'month'],
+]
+
+
+def hist_quantiles(hist: np.ndarray, qs: Sequence[float]) -> np.ndarray:
+    """
+    Exact quantiles (pandas 'linear' interpolation) from integer-valued
+    histograms, one row per group. Returns an array of shape (groups, len(qs)).
+    """
+    hist = np.atleast_2d(hist)
+    counts = hist.sum(axis=1)
+    cum = np.cumsum(hist, axis=1)
+    out = np.full((hist.shape[0], len(qs)), np.nan)
+
+    valid = counts > 0
+    if not valid.any():
+        return out
+
+    cum = cum[valid]
+    n = counts[valid]
+    for j, q in enumerate(qs):
+        pos = q * (n - 1)
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.ceil(pos).astype(np.int64)
+        lo_val = (cum <= lo[:, None]).sum(axis=1)
+        hi_val = (cum <= hi[:, None]).sum(axis=1)
+        out[valid, j] = lo_val + (hi_val - lo_val) * (pos - lo)
+    return out
+
+
+def _cell_index(codes: List[np.ndarray], shape: tuple) -> np.ndarray:
+    """Flat cell id of per-dimension codes, where code -1 (a missing key) is a value of its own"""
+    if not len(codes) or not len(codes[0]):
+        return np.zeros(0, dtype=np.int64)
+    return np.ravel_multi_index([c + 1 for c in codes], tuple(n + 1 for n in shape)).astype(np.int64)
+
+
+def _cell_keys(cell_ids: np.ndarray, shape: tuple) -> List[np.ndarray]:
+    """Per-dimension codes of flat cell ids from _cell_index, -1 for missing keys"""
+    return [c.astype(np.int64) - 1 for c in np.unravel_index(cell_ids, tuple(n + 1 for n in shape))]
+
+
+def _flat_index(codes: List[np.ndarray], shape: tuple) -> tuple:
+    """
+    Flat cell index of per-dimension codes, and the mask of entries that have
+    one; entries with a negative (missing) code in any dimension are dropped.
+    """
+    if not len(codes) or not len(codes[0]):
+        return np.zeros(0, dtype=np.int64), np.zeros(len(codes[0]) if codes else 0, dtype=bool)
+    valid = np.logical_and.reduce([c >= 0 for c in codes])
+    if not valid.all():
+        codes = [c[valid] for c in codes]
+    return np.ravel_multi_index(codes, shape).astype(np.int64), valid
+
+
+class StatsCube:
+    """
+    Pre-aggregated, mergeable word-count cube over (industry, username, year, month).
+    Each cell holds count, sum, sum of squares, min, max and an exact word-count
+    histogram, so pooled roll-ups and slices are answered without touching raw rows.
+    """
+
+    def __init__(self, keys: Dict[str, np.ndarray], categories: Dict[str, np.ndarray],
+                 count: np.ndarray, total: np.ndarray, sumsq: np.ndarray,
+                 minimum: np.ndarray, maximum: np.ndarray, hist: np.ndarray):
+        self.keys = keys
+        self.categories = categories
+        self.count = count
+        self.total = total
+        self.sumsq = sumsq
+        self.minimum = minimum
+        self.maximum = maximum
+        self.hist = hist
+        self._rollups: Dict[tuple, pd.DataFrame] = {}
+        self._user_offsets: Optional[Dict] = None
+        self._user_level: Optional[pd.DataFrame] = None
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, value_col: str = 'word_count') -> 'StatsCube':
+        """Aggregate tweet rows (with year/month columns) into cube cells"""
+        if value_col not in df.columns or df.empty:
+            return cls.empty()
+
+        values = df[value_col].to_numpy(dtype=np.float64, na_value=np.nan)
+        keep = (values >= 0) & (values <= MAX_WORDS)
+
+        # A missing key (no user / industry, or no date and so no year / month) keeps code -1:
+        # the row counts in every roll-up except those grouped by that dimension
+        dim_codes = []
+        categories = {}
+        for dim in DIMENSIONS:
+            if dim in df.columns:
+                codes, uniques = pd.factorize(df[dim].to_numpy(), sort=True)
+                uniques = np.asarray(uniques)
+                # Years / months of a column with missing dates come back as floats
+                if uniques.dtype.kind == 'f' and np.all(uniques == np.round(uniques)):
+                    uniques = uniques.astype(np.int64)
+            else:
+                codes, uniques = np.zeros(len(values), dtype=np.int64), np.array([''], dtype=object)
+            dim_codes.append(codes.astype(np.int64))
+            categories[dim] = uniques
+        values = values[keep].astype(np.int64)
+        dim_codes = [codes[keep] for codes in dim_codes]
+
+        shape = tuple(len(categories[d]) for d in DIMENSIONS)
+        flat = _cell_index(dim_codes, shape)
+        cell_ids, cell = np.unique(flat, return_inverse=True)
+        n_cells = len(cell_ids)
+
+        count = np.bincount(cell, minlength=n_cells).astype(np.int64)
+        total = np.bincount(cell, weights=values, minlength=n_cells)
+        sumsq = np.bincount(cell, weights=values.astype(np.float64) ** 2, minlength=n_cells)
+        hist = np.bincount(cell * N_BINS + values, minlength=n_cells * N_BINS)
+        hist = hist.reshape(n_cells, N_BINS).astype(np.int32)
+        minimum, maximum = cls._hist_extremes(hist)
+
+        unravelled = _cell_keys(cell_ids, shape)
+        keys = {dim: unravelled[i] for i, dim in enumerate(DIMENSIONS)}
+        return cls(keys, categories, count, total, sumsq, minimum, maximum, hist)
+
+    @classmethod
+    def empty(cls) -> 'StatsCube':
+        zeros = np.zeros(0, dtype=np.int64)
+        return cls({d: zeros for d in DIMENSIONS}, {d: np.array([], dtype=object) for d in DIMENSIONS},
+                   zeros, zeros.astype(float), zeros.astype(float), zeros, zeros,
+                   np.zeros((0, N_BINS), dtype=np.int32))
+
+    @staticmethod
+    def _hist_extremes(hist: np.ndarray) -> tuple:
+        nonzero = hist > 0
+        minimum = np.argmax(nonzero, axis=1)
+        maximum = hist.shape[1] - 1 - np.argmax(nonzero[:, ::-1], axis=1)
+        return minimum.astype(np.int64), maximum.astype(np.int64)
+
+    def __len__(self) -> int:
+        return len(self.count)
+
+    @staticmethod
+    def _recode(keys: np.ndarray, indexer: np.ndarray) -> np.ndarray:
+        """Map category codes through `indexer`, keeping -1 for missing keys"""
+        return np.where(keys >= 0, indexer[np.maximum(keys, 0)], -1) if len(indexer) else keys
+
+    def _decode(self, dim: str, codes: np.ndarray) -> np.ndarray:
+        """Category values of codes, None where the key is missing"""
+        categories = self.categories[dim]
+        if not len(categories):
+            return np.full(len(codes), None, dtype=object)
+        values = categories[np.maximum(codes, 0)]
+        if (codes < 0).any():
+            values = values.astype(object)
+            values[codes < 0] = None
+        return values
+
+    def cells(self) -> pd.DataFrame:
+        """All cells with decoded keys (None where missing) and their additive measures"""
+        frame = {dim: self._decode(dim, self.keys[dim]) for dim in DIMENSIONS}
+        frame.update({'tweet_count': self.count, 'sum': self.total, 'sumsq': self.sumsq,
+                      'min': self.minimum, 'max': self.maximum})
+        return pd.DataFrame(frame)
+
+    def merge(self, other: 'StatsCube') -> 'StatsCube':
+        """Combine two cubes (e.g. built from separate chunks or shards)"""
+        if len(self) == 0:
+            return other
+        if len(other) == 0:
+            return self
+
+        categories = {}
+        codes = {}
+        for dim in DIMENSIONS:
+            merged = pd.Index(self.categories[dim]).union(pd.Index(other.categories[dim]))
+            categories[dim] = np.asarray(merged)
+            codes[dim] = np.concatenate([
+                self._recode(self.keys[dim], merged.get_indexer(self.categories[dim])),
+                self._recode(other.keys[dim], merged.get_indexer(other.categories[dim]))
+            ])
+
+        shape = tuple(len(categories[d]) for d in DIMENSIONS)
+        flat = _cell_index([codes[d] for d in DIMENSIONS], shape)
+        cell_ids, cell = np.unique(flat, return_inverse=True)
+        n_cells = len(cell_ids)
+
+        def stack(a, b):
+            return np.concatenate([a, b])
+
+        stacked = np.vstack([self.hist, other.hist])
+        order = np.argsort(cell, kind='stable')
+        starts = np.flatnonzero(np.r_[True, np.diff(cell[order]) != 0])
+        hist = np.add.reduceat(stacked[order], starts, axis=0)
+        minimum, maximum = self._hist_extremes(hist)
+
+        unravelled = _cell_keys(cell_ids, shape)
+        return StatsCube(
+            {dim: unravelled[i] for i, dim in enumerate(DIMENSIONS)},
+            categories,
+            np.bincount(cell, weights=stack(self.count, other.count), minlength=n_cells).astype(np.int64),
+            np.bincount(cell, weights=stack(self.total, other.total), minlength=n_cells),
+            np.bincount(cell, weights=stack(self.sumsq, other.sumsq), minlength=n_cells),
+            minimum, maximum, hist
+        )
+
+    @staticmethod
+    def _where_key(where: Optional[Dict]) -> tuple:
+        if not where:
+            return ()
+        items = []
+        for dim, wanted in sorted(where.items()):
+            if isinstance(wanted, (list, tuple, set, np.ndarray)):
+                wanted = tuple(sorted(wanted, key=str))
+            items.append((dim, wanted))
+        return tuple(items)
+
+    def _mask(self, where: Optional[Dict]) -> Optional[np.ndarray]:
+        if not where:
+            return None
+        mask = np.ones(len(self), dtype=bool)
+        for dim, wanted in where.items():
+            if dim not in DIMENSIONS:
+                raise KeyError(f"Unknown cube dimension: {dim}")
+            wanted = wanted if isinstance(wanted, (list, tuple, set, np.ndarray)) else [wanted]
+            lookup = pd.Index(self.categories[dim]).get_indexer(list(wanted))
+            mask &= np.isin(self.keys[dim], lookup[lookup >= 0])
+        return mask
+
+    def rollup(self, by: Optional[List[str]] = None, where: Optional[Dict] = None,
+               quantiles: Sequence[float] = (0.25, 0.5, 0.75)) -> pd.DataFrame:
+        """
+        Pooled statistics grouped by any subset of dimensions, optionally sliced
+        with `where` (dimension -> value or list of values).
+        """
+        by = list(by or [])
+        cache_key = (tuple(by), self._where_key(where), tuple(quantiles))
+        cached = self._rollups.get(cache_key)
+        if cached is not None:
+            return cached.copy()
+
+        mask = self._mask(where)
+        idx = np.flatnonzero(mask) if mask is not None else slice(None)
+
+        count = self.count[idx]
+        total = self.total[idx]
+        sumsq = self.sumsq[idx]
+        hist = self.hist[idx]
+
+        if by:
+            key_codes = [self.keys[d][idx] for d in by]
+            shape = tuple(max(len(self.categories[d]), 1) for d in by)
+            flat, valid = _flat_index(key_codes, shape)
+            if not valid.all():
+                count, total, sumsq, hist = count[valid], total[valid], sumsq[valid], hist[valid]
+        else:
+            shape = ()
+            flat = np.zeros(len(count), dtype=np.int64)
+
+        # Cells are stored sorted by (industry, username, year, month), so
+        # roll-ups along a prefix of the dimensions are already contiguous.
+        if len(flat) > 1 and not np.all(flat[1:] >= flat[:-1]):
+            order = np.argsort(flat, kind='stable')
+            flat, count, total, sumsq, hist = flat[order], count[order], total[order], sumsq[order], hist[order]
+
+        if len(flat):
+            starts = np.flatnonzero(np.r_[True, flat[1:] != flat[:-1]])
+            group_ids = flat[starts]
+            g_count = np.add.reduceat(count, starts).astype(float)
+            g_total = np.add.reduceat(total, starts)
+            g_sumsq = np.add.reduceat(sumsq, starts)
+            g_hist = np.add.reduceat(hist, starts, axis=0, dtype=np.int64)
+        else:
+            n_groups = 0 if by else 1
+            group_ids = np.zeros(n_groups, dtype=np.int64)
+            g_count, g_total, g_sumsq = np.zeros(n_groups), np.zeros(n_groups), np.zeros(n_groups)
+            g_hist = np.zeros((n_groups, N_BINS), dtype=np.int64)
+
+        result = {}
+        if by:
+            unravelled = np.unravel_index(group_ids, shape)
+            result = {d: self.categories[d][unravelled[i]] for i, d in enumerate(by)}
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = g_total / g_count
+            var = (g_sumsq - g_total * mean) / (g_count - 1)
+        var = np.where(g_count > 1, np.maximum(var, 0.0), np.nan)
+
+        minimum, maximum = self._hist_extremes(g_hist)
+        empty = g_count == 0
+        result['tweet_count'] = g_count.astype(np.int64)
+        result['mean'] = mean
+        result['std'] = np.sqrt(var)
+        result['var'] = var
+        result['min'] = np.where(empty, np.nan, minimum)
+        result['max'] = np.where(empty, np.nan, maximum)
+
+        qvals = hist_quantiles(g_hist, quantiles)
+        for j, q in enumerate(quantiles):
+            name = 'median' if q == 0.5 else f"q{int(round(q * 100))}"
+            result[name] = qvals[:, j]
+
+        frame = pd.DataFrame(result)
+        self._rollups[cache_key] = frame
+        return frame.copy()
+
+    def box_summary(self, by: str = 'year', where: Optional[Dict] = None,
+                    max_outliers: int = 30) -> pd.DataFrame:
+        """
+        Per-group five-number summaries with Tukey fences (1.5 × IQR) and a
+        capped, evenly spaced set of distinct outlier values, for box plots.
+        """
+        groups = self.rollup([by], where=where)
+        if groups.empty:
+            return groups
+
+        mask = self._mask(where)
+        idx = np.flatnonzero(mask) if mask is not None else np.arange(len(self))
+        codes = self.keys[by][idx]
+        lookup = pd.Index(self.categories[by]).get_indexer(groups[by].to_numpy())
+
+        values = np.arange(N_BINS)
+        lower, upper, outliers = [], [], []
+        for code, q1, q3 in zip(lookup, groups['q25'], groups['q75']):
+            hist = self.hist[idx[codes == code]].sum(axis=0)
+            iqr = q3 - q1
+            inside = (hist > 0) & (values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)
+            lower.append(values[inside].min())
+            upper.append(values[inside].max())
+
+            distinct = values[(hist > 0) & ~inside]
+            if len(distinct) > max_outliers:
+                distinct = distinct[np.linspace(0, len(distinct) - 1, max_outliers).round().astype(int)]
+            outliers.append(distinct.tolist())
+
+        groups['lowerfence'] = lower
+        groups['upperfence'] = upper
+        groups['outliers'] = outliers
+        return groups
+
+    def histogram(self, where: Optional[Dict] = None) -> np.ndarray:
+        """Word-count histogram (index = words) for a slice of the cube"""
+        mask = self._mask(where)
+        hist = self.hist if mask is None else self.hist[mask]
+        return hist.sum(axis=0)
+
+    def materialize(self, levels: Sequence[Sequence[str]] = PRECOMPUTED_LEVELS) -> 'StatsCube':
+        """Precompute common roll-ups so later queries are cache hits"""
+        for level in levels:
+            self.rollup(list(level))
+        self.user_monthly_series('')
+        return self
+
+    def user_monthly_series(self, username: str) -> pd.DataFrame:
+        """A user's monthly series, sliced from the precomputed user/month level"""
+        if self._user_offsets is None:
+            level = self.rollup(['username', 'year', 'month'])
+            level['year_month'] = (level['year'].astype(str) + '-' +
+                                   level['month'].astype(int).astype(str).str.zfill(2))
+            users = level['username'].to_numpy()
+            starts = np.flatnonzero(np.r_[True, users[1:] != users[:-1]]) if len(users) else np.zeros(0, dtype=int)
+            stops = np.r_[starts[1:], len(users)]
+            self._user_level = level
+            self._user_offsets = {users[a]: (a, b) for a, b in zip(starts, stops)}
+
+        start, stop = self._user_offsets.get(username, (0, 0))
+        return self._user_level.iloc[start:stop].reset_index(drop=True)
@@ -0,0 +1,159 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+WORD_PATTERN = r"\w+"
+PHRASE_PATTERN = r'"([^"]*)"'
+
+# Appends add segments; past this many they are compacted into one
+MAX_SEGMENTS = 8
+
+
+def parse_query(query: str) -> Tuple[List[str], List[List[str]]]:
+    """Split a query into bare terms and "quoted phrases", lower-cased and tokenized like the index"""
+    phrases = [re.findall(WORD_PATTERN, phrase.lower()) for phrase in re.findall(PHRASE_PATTERN, query)]
+    terms = re.findall(WORD_PATTERN, re.sub(PHRASE_PATTERN, ' ', query).lower())
+    return terms, [phrase for phrase in phrases if phrase]
+
+
+class _Segment:
+    """Postings of a contiguous block of rows, starting at row position `base`"""
+
+    def __init__(self, base: int, vocabulary: Dict[str, int], pair_ids: Dict[int, int], offsets: np.ndarray,
+                 postings: np.ndarray, text_codes: np.ndarray, texts: np.ndarray):
+        self.base = base
+        self.vocabulary = vocabulary
+        self.pair_ids = pair_ids
+        self.offsets = offsets
+        self.postings = postings
+        self.text_codes = text_codes
+        self.texts = texts
+
+    @classmethod
+    def build(cls, contents: pd.Series, base: int) -> '_Segment':
+        codes, uniques = pd.factorize(contents.fillna('').astype(str))
+        texts = pd.Series(uniques, dtype=object).str.lower()
+
+        # Distinct (text, term) pairs over words and adjacent word pairs ("biwords", for phrases);
+        # each text is tokenized once however often it repeats
+        tokens = texts.str.findall(WORD_PATTERN).explode().dropna()
+        owners = tokens.index.to_numpy(np.int64)
+        word_codes, words = pd.factorize(tokens.to_numpy(object))
+        same = owners[1:] == owners[:-1]
+        # A word pair is keyed by its two word ids; pair terms are numbered after the words
+        pair_codes, pairs = pd.factorize(word_codes[:-1][same].astype(np.int64) * len(words) + word_codes[1:][same])
+        n_terms = len(words) + len(pairs)
+        term_codes = np.concatenate([word_codes, pair_codes + len(words)]).astype(np.int64)
+        keys = pd.unique(np.concatenate([owners, owners[1:][same]]) * max(n_terms, 1) + term_codes)
+        pair_texts, pair_terms = keys // max(n_terms, 1), keys % max(n_terms, 1)
+
+        # Rows of every text, then one posting per (term, row) of each pair
+        rows_by_text = np.argsort(codes, kind='stable')
+        per_text = np.bincount(codes, minlength=len(texts))
+        text_offsets = np.r_[0, np.cumsum(per_text)]
+        lengths = per_text[pair_texts]
+        entries = np.repeat(text_offsets[pair_texts] - np.r_[0, np.cumsum(lengths)[:-1]], lengths)
+        entries += np.arange(len(entries))
+        entry_terms = np.repeat(pair_terms, lengths)
+        entry_rows = rows_by_text[entries]
+
+        # Sort by (term, row) through one combined integer key
+        postings = np.sort(entry_terms * max(len(codes), 1) + entry_rows) % max(len(codes), 1) + base
+        offsets = np.r_[0, np.cumsum(np.bincount(entry_terms, minlength=n_terms))]
+        vocabulary = {word: i for i, word in enumerate(words)}
+        pair_ids = {int(key): len(words) + i for i, key in enumerate(pairs)}
+        return cls(base, vocabulary, pair_ids, offsets, postings, codes.astype(np.int64), texts.to_numpy(object))
+
+    def __len__(self) -> int:
+        return len(self.text_codes)
+
+    def term(self, term: str) -> np.ndarray:
+        """Postings of a word, or of two adjacent words given as 'first second'"""
+        if ' ' in term:
+            first, second = (self.vocabulary.get(word) for word in term.split(' '))
+            i = None if first is None or second is None else self.pair_ids.get(first * len(self.vocabulary) + second)
+        else:
+            i = self.vocabulary.get(term)
+        if i is None:
+            return np.zeros(0, dtype=np.int64)
+        return self.postings[self.offsets[i]:self.offsets[i + 1]]
+
+    def contains_phrase(self, positions: np.ndarray, pattern: str) -> np.ndarray:
+        """Which of the given row positions (of this segment) contain the phrase pattern"""
+        codes = self.text_codes[positions - self.base]
+        distinct, inverse = np.unique(codes, return_inverse=True)
+        matches = pd.Series(self.texts[distinct], dtype=object).str.contains(pattern, regex=True).to_numpy(bool)
+        return matches[inverse]
+
+
+class TextIndex:
+    """
+    Inverted index over tweet text for content search. Each word and each pair
+    of adjacent words maps to the sorted row positions containing it; a query
+    intersects the postings of its terms and of its phrases' word pairs, and
+    phrases of three or more words are then confirmed on the distinct texts of
+    the remaining rows only. Appended rows are indexed as a new
+    segment (positions continue after the existing rows) and segments are
+    compacted once there are more than MAX_SEGMENTS.
+    """
+
+    def __init__(self, segments: Optional[List[_Segment]] = None):
+        self.segments = segments or []
+
+    @classmethod
+    def from_contents(cls, contents: pd.Series) -> 'TextIndex':
+        return cls().append(contents)
+
+    def __len__(self) -> int:
+        return sum(len(segment) for segment in self.segments)
+
+    def append(self, contents: pd.Series) -> 'TextIndex':
+        """Index of the existing rows followed by `contents`"""
+        if len(contents) == 0:
+            return self
+        segments = self.segments + [_Segment.build(contents, len(self))]
+        if len(segments) > MAX_SEGMENTS:
+            texts = pd.concat([pd.Series(s.texts[s.text_codes], dtype=object) for s in segments], ignore_index=True)
+            segments = [_Segment.build(texts, 0)]
+        return TextIndex(segments)
+
+    def term(self, term: str) -> np.ndarray:
+        """Sorted row positions containing a (lower-case) term"""
+        parts = [segment.term(term) for segment in self.segments]
+        return np.concatenate(parts) if len(parts) > 1 else (parts[0] if parts else np.zeros(0, dtype=np.int64))
+
+    def search(self, query: str) -> Optional[np.ndarray]:
+        """
+        Sorted row positions matching every term and "quoted phrase" of the
+        query; None when the query has no words
+        """
+        terms, phrases = parse_query(query)
+        # A phrase's adjacent word pairs are indexed, so two-word phrases need no further check
+        keys = set(terms)
+        for phrase in phrases:
+            keys.update([' '.join(pair) for pair in zip(phrase, phrase[1:])] if len(phrase) > 1 else phrase)
+        if not keys:
+            return None
+
+        # Rarest term first keeps every intersection small
+        postings = sorted((self.term(key) for key in keys), key=len)
+        result = postings[0]
+        for other in postings[1:]:
+            if not len(result):
+                break
+            result = np.intersect1d(result, other, assume_unique=True)
+
+        for phrase in phrases:
+            if len(phrase) < 3 or not len(result):
+                continue
+            pattern = r'\b' + r'\W+'.join(map(re.escape, phrase)) + r'\b'
+            bases = np.array([segment.base for segment in self.segments])
+            owner = np.searchsorted(bases, result, side='right') - 1
+            keep = np.zeros(len(result), dtype=bool)
+            for i in np.unique(owner):
+                mask = owner == i
+                keep[mask] = self.segments[i].contains_phrase(result[mask], pattern)
+            result = result[keep]
+        return result
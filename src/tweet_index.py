@@ -0,0 +1,129 @@
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .text_index import TextIndex
+except ImportError:
+    from text_index import TextIndex
+
+
+def _offset_map(codes: np.ndarray, uniques) -> Dict:
+    """Map each key to the ascending array of ranks where it occurs"""
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+    return {key: order[bounds[i]:bounds[i + 1]] for i, key in enumerate(uniques)}
+
+
+class TweetIndex:
+    """
+    Read-only index over a tweet frame for the Raw Data tab.
+    Rows are ranked newest-first by date; per-year and per-user maps hold the
+    ranks of matching rows and word counts are bucketed by value, so filters
+    are answered by intersecting small sorted arrays and the first page of a
+    result is simply its first ranks. Content search goes through a TextIndex
+    over row positions, built on the first search unless one is passed in.
+    """
+
+    def __init__(self, df: pd.DataFrame, text: Optional[TextIndex] = None):
+        self.df = df
+        n = len(df)
+
+        if 'date' in df.columns:
+            dates = pd.to_datetime(df['date']).to_numpy()
+            self.order = np.argsort(dates, kind='stable')[::-1].copy()
+        else:
+            self.order = np.arange(n)
+        self.rank_of = np.empty(n, dtype=np.int64)
+        self.rank_of[self.order] = np.arange(n)
+
+        # A text index built elsewhere (e.g. grown while collecting) must cover exactly these rows
+        self._text = text if text is not None and len(text) == n else None
+        self._text_lock = threading.Lock()
+
+        self.year_ranks: Dict = {}
+        self.user_ranks: Dict = {}
+        self.bucket_ranks: Dict = {}
+
+        if 'year' in df.columns:
+            codes, uniques = pd.factorize(df['year'].to_numpy()[self.order], sort=True)
+            self.year_ranks = _offset_map(codes, uniques.tolist())
+        if 'username' in df.columns:
+            codes, uniques = pd.factorize(df['username'].to_numpy()[self.order], sort=True)
+            self.user_ranks = _offset_map(codes, list(uniques))
+
+        if 'word_count' in df.columns:
+            self.word_counts = df['word_count'].to_numpy()[self.order]
+            wc = np.nan_to_num(self.word_counts.astype(np.float64), nan=-1).astype(np.int64)
+            self.wc_min = int(wc[wc >= 0].min()) if (wc >= 0).any() else 0
+            codes = np.clip(wc - self.wc_min + 1, 0, None)
+            uniques = np.arange(codes.max() + 1 if len(codes) else 1)
+            self.bucket_ranks = _offset_map(codes, uniques.tolist())
+        else:
+            self.word_counts = None
+            self.wc_min = 0
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    @property
+    def text_index(self) -> TextIndex:
+        """Inverted index over `content`, built once on first use"""
+        with self._text_lock:
+            if self._text is None:
+                contents = self.df['content'] if 'content' in self.df.columns else pd.Series('', index=self.df.index)
+                self._text = TextIndex.from_contents(contents)
+            return self._text
+
+    def _search(self, text: str) -> Optional[np.ndarray]:
+        """Ranks (ascending) of rows matching a content query; None when the query has no words"""
+        positions = self.text_index.search(text)
+        if positions is None:
+            return None
+        if len(positions) > len(self) // 32:
+            # Large results: scatter into a mask instead of sorting
+            mask = np.zeros(len(self), dtype=bool)
+            mask[self.rank_of[positions]] = True
+            return np.flatnonzero(mask)
+        return np.sort(self.rank_of[positions])
+
+    def _buckets(self, low: int, high: int) -> list:
+        first = max(int(low) - self.wc_min + 1, 1)
+        last = int(high) - self.wc_min + 1
+        return [self.bucket_ranks[b] for b in range(first, last + 1) if b in self.bucket_ranks]
+
+    def query(self, year=None, username=None,
+              word_range: Optional[Tuple[int, int]] = None, text: Optional[str] = None) -> np.ndarray:
+        """Ranks (newest first) of rows matching every given filter; `text` takes words and "quoted phrases" """
+        candidates = self._search(text) if text and text.strip() else None
+        for key, mapping in ((year, self.year_ranks), (username, self.user_ranks)):
+            if key is None:
+                continue
+            ranks = mapping.get(key, np.zeros(0, dtype=np.int64))
+            candidates = ranks if candidates is None else np.intersect1d(candidates, ranks, assume_unique=True)
+
+        if word_range is None or self.word_counts is None:
+            return candidates if candidates is not None else np.arange(len(self))
+
+        low, high = word_range
+        if candidates is None:
+            # Narrow ranges: merge the matching buckets; wide ranges: one vectorized scan
+            buckets = self._buckets(low, high)
+            if sum(len(b) for b in buckets) < len(self) // 2:
+                return np.sort(np.concatenate(buckets)) if buckets else np.zeros(0, dtype=np.int64)
+            wc = self.word_counts
+            return np.flatnonzero((wc >= low) & (wc <= high))
+
+        wc = self.word_counts[candidates]
+        return candidates[(wc >= low) & (wc <= high)]
+
+    def rows(self, ranks: np.ndarray) -> pd.DataFrame:
+        """Materialize the given ranks as rows of the original frame, in rank order"""
+        return self.df.iloc[self.order[ranks]]
+
+    def page(self, ranks: np.ndarray, page: int = 1, page_size: int = 100) -> pd.DataFrame:
+        """The requested page of a query result (newest first)"""
+        start = max(page - 1, 0) * page_size
+        return self.rows(ranks[start:start + page_size])
@@ -0,0 +1,228 @@
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# Words outside hashtags / mentions; URLs are stripped before tokenizing
+TERM_PATTERN = r"(?<![#@\w])[a-z][a-z0-9']+"
+URL_PATTERN = r"https?://\S+"
+HASHTAG_PATTERN = r"#\w+"
+TOKEN_PATTERN = f"{HASHTAG_PATTERN}|{TERM_PATTERN}"
+KINDS = ['terms', 'hashtags']
+
+STOP_WORDS = frozenset("""
+a about after all also am an and any are as at be because been but by can could did do does
+for from had has have he her his how i if in into is it its just me more my no not of on or
+our out so than that the their them then there these they this to up us was we were what when
+which who will with would you your
+""".split())
+
+# Counters kept per group: overall, per year and per user
+CAPACITY = {None: 1000, 'year': 200, 'username': 20}
+
+
+def _count_frame(groups: np.ndarray, items: np.ndarray, counts: np.ndarray) -> pd.DataFrame:
+    return pd.DataFrame({'group': pd.Series(groups, dtype=object), 'item': pd.Series(items, dtype=object),
+                         'count': pd.Series(counts, dtype=np.int64)})
+
+
+class HeavyHitters:
+    """
+    Mergeable Misra-Gries / Space-Saving summary of item frequencies per group
+    (Agarwal et al., "Mergeable Summaries", 2012). At most `capacity` counters
+    are kept per group; after each update or merge the (capacity + 1)-th
+    largest count is subtracted from every counter of the group and added to
+    its `error`. For any item with true frequency f in a group with N items:
+
+        count <= f <= count + error,   error <= N / (capacity + 1)
+
+    so every item with f > N / (capacity + 1) is guaranteed to be kept, and
+    the bound holds however the stream was split into chunks and shards.
+    """
+
+    def __init__(self, capacity: int, counts: Optional[pd.DataFrame] = None,
+                 errors: Optional[pd.Series] = None, totals: Optional[pd.Series] = None):
+        self.capacity = capacity
+        self.counts = counts if counts is not None else _count_frame(
+            np.array([], dtype=object), np.array([], dtype=object), np.array([], dtype=np.int64))
+        self.errors = errors if errors is not None else pd.Series(dtype=np.int64)
+        self.totals = totals if totals is not None else pd.Series(dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def _combine(self, groups: np.ndarray, items: np.ndarray, counts: np.ndarray,
+                 errors: pd.Series, totals: pd.Series) -> 'HeavyHitters':
+        group_codes, group_labels = pd.factorize(np.concatenate([self.counts['group'].to_numpy(object), groups]))
+        item_codes, item_labels = pd.factorize(np.concatenate([self.counts['item'].to_numpy(object), items]))
+        keys, inverse = np.unique(group_codes.astype(np.int64) * len(item_labels) + item_codes,
+                                  return_inverse=True)
+        summed = np.bincount(inverse, np.concatenate([self.counts['count'].to_numpy(np.int64), counts]))
+        summed = summed.astype(np.int64)
+        group_codes, item_codes = keys // max(len(item_labels), 1), keys % max(len(item_labels), 1)
+
+        # Rank counters within each group, largest first
+        order = np.lexsort((-summed, group_codes))
+        group_codes, item_codes, summed = group_codes[order], item_codes[order], summed[order]
+        starts = np.flatnonzero(np.r_[True, group_codes[1:] != group_codes[:-1]]) if len(order) else order
+        rank = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+
+        # Subtract each group's (capacity + 1)-th largest count and drop what falls to zero
+        threshold = np.zeros(len(group_labels), dtype=np.int64)
+        over = rank == self.capacity
+        threshold[group_codes[over]] = summed[over]
+        summed = summed - threshold[group_codes]
+        keep = (rank < self.capacity) & (summed > 0)
+
+        cut = pd.Series(threshold[group_codes[over]], index=group_labels[group_codes[over]], dtype=np.int64)
+        errors = self.errors.add(errors, fill_value=0).add(cut, fill_value=0).astype(np.int64)
+        totals = self.totals.add(totals, fill_value=0).astype(np.int64)
+        counts = _count_frame(np.asarray(group_labels, dtype=object)[group_codes[keep]],
+                              np.asarray(item_labels, dtype=object)[item_codes[keep]], summed[keep])
+        return HeavyHitters(self.capacity, counts, errors, totals)
+
+    def update(self, items: pd.Series, groups: Optional[pd.Series] = None,
+               weights: Optional[np.ndarray] = None) -> 'HeavyHitters':
+        """Add a chunk of items (one per row, optionally weighted) with their group keys"""
+        groups = groups.to_numpy(object) if groups is not None else np.full(len(items), '', dtype=object)
+        weights = np.asarray(weights, dtype=np.int64) if weights is not None else np.ones(len(items), dtype=np.int64)
+        totals = pd.Series(weights).groupby(groups, sort=False).sum().astype(np.int64)
+        return self._combine(groups, items.to_numpy(object), weights,
+                             pd.Series(0, index=totals.index, dtype=np.int64), totals)
+
+    def merge(self, other: 'HeavyHitters') -> 'HeavyHitters':
+        """Summary of both streams; capacities must match for the error bound to hold"""
+        if other.capacity != self.capacity:
+            raise ValueError(f"Cannot merge summaries with capacities {self.capacity} and {other.capacity}")
+        return self._combine(other.counts['group'].to_numpy(object), other.counts['item'].to_numpy(object),
+                             other.counts['count'].to_numpy(np.int64), other.errors, other.totals)
+
+    def top(self, k: int = 20, group=None) -> pd.DataFrame:
+        """
+        The k most frequent items of a group: `count` (lower bound), `max_count`
+        (upper bound) and `share` of the group's items (lower bound)
+        """
+        group = '' if group is None else group
+        rows = self.counts.loc[self.counts['group'] == group].nlargest(k, 'count', keep='first')
+        error = int(self.errors.get(group, 0))
+        total = int(self.totals.get(group, 0))
+        return pd.DataFrame({
+            'item': rows['item'].to_numpy(),
+            'count': rows['count'].to_numpy(),
+            'max_count': rows['count'].to_numpy() + error,
+            'share': np.round(rows['count'].to_numpy() / max(total, 1), 4)
+        })
+
+    def error_bound(self, group=None) -> int:
+        """Largest possible undercount of any item in a group"""
+        return int(self.errors.get('' if group is None else group, 0))
+
+
+def _labels(values) -> np.ndarray:
+    """Group keys as strings; integral floats (years of a column with missing dates) lose their '.0'"""
+    values = np.asarray(values)
+    if values.dtype.kind == 'f' and np.all(values == np.round(values)):
+        values = values.astype(np.int64)
+    return values.astype(str).astype(object)
+
+
+def _tokens(text: pd.Series) -> Dict[str, pd.DataFrame]:
+    """(code, item) rows of terms and of hashtags for each distinct (lower-cased) content string"""
+    tokens = text.str.findall(TOKEN_PATTERN).explode().dropna()
+    hashtag = tokens.str.startswith('#').to_numpy(bool)
+    terms = tokens[~hashtag]
+    terms = terms[~terms.isin(STOP_WORDS)]
+    return {kind: pd.DataFrame({'code': rows.index.to_numpy(np.int64), 'item': rows.to_numpy(object)})
+            for kind, rows in (('terms', terms), ('hashtags', tokens[hashtag]))}
+
+
+class Vocabulary:
+    """
+    Streaming top-k terms and hashtags of the `content` column, overall, per
+    year and per user, as HeavyHitters summaries. Each chunk is tokenized once
+    per distinct content string, so archives full of repeated text tokenize
+    only the distinct texts. Memory is bounded by the counters kept per group
+    (CAPACITY) plus one chunk; vocabularies of chunks or shards merge exactly
+    like their summaries.
+    """
+
+    def __init__(self, sketches: Dict[tuple, HeavyHitters]):
+        self.sketches = sketches
+
+    @classmethod
+    def empty(cls, capacity: Optional[Dict] = None) -> 'Vocabulary':
+        capacity = {**CAPACITY, **(capacity or {})}
+        return cls({(kind, by): HeavyHitters(size) for kind in KINDS for by, size in capacity.items()})
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, chunk_rows: int = 100_000,
+                   capacity: Optional[Dict] = None) -> 'Vocabulary':
+        vocabulary = cls.empty(capacity)
+        for start in range(0, len(df), chunk_rows):
+            vocabulary = vocabulary.update(df.iloc[start:start + chunk_rows])
+        return vocabulary
+
+    def update(self, chunk: pd.DataFrame) -> 'Vocabulary':
+        """Add a chunk of tweets; groupings whose column is missing are skipped"""
+        if chunk.empty or 'content' not in chunk.columns:
+            return self
+        codes, contents = pd.factorize(chunk['content'].fillna('').astype(str))
+        text = pd.Series(contents).str.lower().str.replace(URL_PATTERN, ' ', regex=True)
+
+        # Tweets per (group, distinct content) for every grouping present in the chunk
+        pairs = {}
+        for by in {by for _, by in self.sketches}:
+            if by is not None and by not in chunk.columns:
+                continue
+            group_codes, labels = pd.factorize(chunk[by]) if by else (np.zeros(len(chunk), dtype=np.int64), [''])
+            # Tweets without a key (no user, or no date and so no year) are left out of that grouping
+            present = group_codes >= 0
+            keys, weights = np.unique(group_codes[present].astype(np.int64) * len(contents) + codes[present],
+                                      return_counts=True)
+            pairs[by] = (_labels(labels), keys // len(contents), keys % len(contents), weights)
+
+        sketches = dict(self.sketches)
+        for kind, tokens in _tokens(text).items():
+            item_codes, items = pd.factorize(tokens['item'])
+            # Token rows of each distinct content, as [start, stop) ranges
+            per_content = np.bincount(tokens['code'], minlength=len(contents))
+            offsets = np.r_[0, np.cumsum(per_content)]
+            for by, (labels, groups, content_codes, weights) in pairs.items():
+                # Tokens of every (group, content) pair weighted by its tweets, then summed per (group, item)
+                lengths = per_content[content_codes]
+                rows = np.repeat(offsets[content_codes] - np.r_[0, np.cumsum(lengths)[:-1]], lengths)
+                rows += np.arange(len(rows))
+                keys, inverse = np.unique(np.repeat(groups, lengths) * max(len(items), 1) + item_codes[rows],
+                                          return_inverse=True)
+                counts = np.bincount(inverse, np.repeat(weights, lengths)).astype(np.int64)
+                group_items = np.asarray(items, dtype=object)[keys % max(len(items), 1)]
+                sketch = sketches[(kind, by)]
+                sketches[(kind, by)] = sketch.update(pd.Series(group_items, dtype=object),
+                                                     pd.Series(labels[keys // max(len(items), 1)], dtype=object),
+                                                     counts)
+        return Vocabulary(sketches)
+
+    def merge(self, other: 'Vocabulary') -> 'Vocabulary':
+        return Vocabulary({key: sketch.merge(other.sketches[key]) for key, sketch in self.sketches.items()})
+
+    def top(self, kind: str = 'terms', by: Optional[str] = None, key=None, k: int = 20) -> pd.DataFrame:
+        """Top-k terms or hashtags overall, or of one year / user (`by` + `key`)"""
+        sketch = self.sketches[(kind, by)]
+        return sketch.top(k, None if by is None else _labels([key])[0]).rename(columns={'item': kind[:-1]})
+
+    def summary(self, k: int = 10) -> Dict:
+        """Totals, capacities and error bounds per grouping, and the top items of every year"""
+        info = {}
+        for kind in KINDS:
+            overall = self.sketches[(kind, None)]
+            by_year = self.sketches[(kind, 'year')]
+            info[kind] = {
+                'total': int(overall.totals.get('', 0)),
+                'capacity': {str(by or 'overall'): self.sketches[(kind, by)].capacity
+                             for (sketch_kind, by) in self.sketches if sketch_kind == kind},
+                'max_error': {str(by or 'overall'): int(self.sketches[(kind, by)].errors.max())
+                              if len(self.sketches[(kind, by)].errors) else 0
+                              for (sketch_kind, by) in self.sketches if sketch_kind == kind},
+                'by_year': {year: by_year.top(k, year)['item'].tolist() for year in sorted(by_year.totals.index)}
+            }
+        return info
@@ -0,0 +1,69 @@
+"""Report parity between the pandas and Arrow compute backends, on the sample data and edge cases"""
+import os
+import sys
+from contextlib import redirect_stdout
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backends import ArrowBackend, PandasBackend, compare_reports
+from src.calculate_stats import TweetStatisticsCalculator
+from src.collect_tweets import TwitterDataCollector
+
+
+def _reports(df: pd.DataFrame) -> tuple:
+    return tuple(TweetStatisticsCalculator(df, backend=backend()).generate_report_sections()
+                 for backend in (PandasBackend, ArrowBackend))
+
+
+def _tweets(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'username': rng.choice(['alice', 'bob', 'carol'], rows).astype(object),
+        'industry': rng.choice(['Tech', 'Music'], rows).astype(object),
+        'date': pd.Timestamp('2021-01-01') + pd.to_timedelta(rng.integers(0, 3 * 365, rows), unit='D'),
+        'content': [' '.join(['word'] * int(n)) for n in rng.integers(1, 30, rows)],
+        'like_count': rng.integers(0, 1000, rows),
+        'retweet_count': rng.integers(0, 300, rows),
+        'reply_count': rng.integers(0, 50, rows),
+    })
+
+
+def _nan_keys() -> pd.DataFrame:
+    df = _tweets(300, seed=1)
+    df.loc[::7, 'username'] = None
+    df.loc[::5, 'industry'] = None
+    df.loc[::11, 'date'] = pd.NaT
+    return df
+
+
+def _all_nan_columns() -> pd.DataFrame:
+    df = _tweets(200, seed=2)
+    df['industry'] = None
+    df[['like_count', 'retweet_count', 'reply_count']] = np.nan
+    return df
+
+
+EDGE_CASES = {
+    'empty': lambda: _tweets(0),
+    'all_nan_columns': _all_nan_columns,
+    'single_user': lambda: _tweets(200, seed=3).assign(username='alice'),
+    'nan_keys': _nan_keys,
+}
+
+
+def test_sample_data_parity(tmp_path):
+    with redirect_stdout(StringIO()):
+        df = TwitterDataCollector(str(tmp_path)).load_sample_data().drop(columns=['word_count'])
+    expected, actual = _reports(df)
+    assert compare_reports(expected, actual, atol=0.01) == []
+
+
+@pytest.mark.parametrize('case', sorted(EDGE_CASES))
+def test_edge_case_parity(case):
+    expected, actual = _reports(EDGE_CASES[case]())
+    assert compare_reports(expected, actual, atol=0.01) == []
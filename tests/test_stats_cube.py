@@ -0,0 +1,41 @@
+"""Parity of StatsCube roll-ups with a plain pandas groupby, including rows with missing keys"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.bench_stats import synthesize_tweets
+from src.calculate_stats import TweetStatisticsCalculator
+from src.stats_cube import StatsCube
+
+
+@pytest.fixture(scope='module')
+def clean():
+    df = synthesize_tweets(2_000, 20, 3, seed=7)
+    df.loc[df.index[::5], 'industry'] = None
+    df.loc[df.index[1::7], 'username'] = None
+    return TweetStatisticsCalculator(df).df_clean
+
+
+@pytest.mark.parametrize('by', [[], ['year'], ['industry'], ['username', 'year'], ['industry', 'month']])
+def test_rollup_matches_groupby(clean, by):
+    result = StatsCube.from_frame(clean).rollup(by)
+    if by:
+        expected = clean.groupby(by)['word_count'].agg(['size', 'sum'])
+        result = result.astype({d: expected.index.get_level_values(d).dtype for d in by}).set_index(by)
+        result = result.reindex(expected.index)
+    else:
+        expected = pd.DataFrame({'size': [len(clean)], 'sum': [clean['word_count'].sum()]})
+    np.testing.assert_array_equal(result['tweet_count'].to_numpy(), expected['size'].to_numpy())
+    np.testing.assert_allclose((result['mean'] * result['tweet_count']).to_numpy(), expected['sum'].to_numpy())
+
+
+def test_merge_matches_single_cube(clean):
+    whole = StatsCube.from_frame(clean)
+    merged = StatsCube.from_frame(clean.iloc[::2]).merge(StatsCube.from_frame(clean.iloc[1::2]))
+    for by in ([], ['year'], ['industry'], ['username']):
+        pd.testing.assert_frame_equal(merged.rollup(by), whole.rollup(by))